@@ -0,0 +1,180 @@
+# admission.py
+# Admission control in front of the API: request body caps enforced while the
+# body streams in, plus per-client token-bucket rate limits and concurrency
+# caps. Everything runs before FastAPI spools a multipart upload, so an
+# oversized or over-quota request costs a header parse and a tiny 413/429.
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from starlette.exceptions import HTTPException
+
+Scope = Dict[str, Any]
+
+
+class _Client:
+    __slots__ = ("tokens", "stamp", "in_flight")
+
+    def __init__(self, tokens: float, stamp: float):
+        self.tokens = tokens
+        self.stamp = stamp
+        self.in_flight = 0
+
+
+class Admission:
+    """Per-client token buckets (`rate` requests/sec, up to `burst`) and in-flight caps.
+
+    0 disables the rate limit or the concurrency cap. At most `max_clients`
+    clients are tracked; the least recently seen idle ones are forgotten
+    first, so a flood of made-up client ids cannot grow memory.
+    """
+
+    def __init__(self, rate: float = 20.0, burst: int = 40, concurrency: int = 8, max_clients: int = 10_000):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.concurrency = concurrency
+        self.max_clients = max_clients
+        self._clients: "OrderedDict[str, _Client]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"admitted": 0, "rate_limited": 0, "concurrency_limited": 0, "too_large": 0}
+
+    @classmethod
+    def from_env(cls) -> "Admission":
+        return cls(
+            rate=float(os.getenv("RESUME_RATE_LIMIT", "20")),
+            burst=int(os.getenv("RESUME_RATE_BURST", "40")),
+            concurrency=int(os.getenv("RESUME_KEY_CONCURRENCY", "8")),
+            max_clients=int(os.getenv("RESUME_ADMISSION_CLIENTS", "10000")),
+        )
+
+    def admit(self, client: str) -> Optional[Tuple[str, int]]:
+        """None if `client` may proceed (call release() when done), else (reason, retry-after seconds)."""
+        now = time.monotonic()
+        with self._lock:
+            c = self._clients.get(client)
+            if c is None:
+                c = self._clients[client] = _Client(float(self.burst), now)
+                self._evict()
+            else:
+                self._clients.move_to_end(client)
+            if self.concurrency and c.in_flight >= self.concurrency:
+                self._counters["concurrency_limited"] += 1
+                return "concurrency", 1
+            if self.rate:
+                c.tokens = min(self.burst, c.tokens + (now - c.stamp) * self.rate)
+                c.stamp = now
+                if c.tokens < 1.0:
+                    self._counters["rate_limited"] += 1
+                    return "rate", max(1, math.ceil((1.0 - c.tokens) / self.rate))
+                c.tokens -= 1.0
+            c.in_flight += 1
+            self._counters["admitted"] += 1
+            return None
+
+    def release(self, client: str) -> None:
+        with self._lock:
+            c = self._clients.get(client)
+            if c is not None and c.in_flight:
+                c.in_flight -= 1
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._counters)
+            out.update({
+                "clients": len(self._clients),
+                "in_flight": sum(c.in_flight for c in self._clients.values()),
+                "rate": self.rate,
+                "burst": self.burst,
+                "concurrency": self.concurrency,
+            })
+            return out
+
+    def _evict(self) -> None:
+        # Busy clients are skipped: forgetting one would reset its in-flight count
+        excess = len(self._clients) - self.max_clients
+        if excess <= 0:
+            return
+        for key in [k for k, c in self._clients.items() if not c.in_flight][:excess]:
+            del self._clients[key]
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers") or ():
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def _reject(send: Callable[[Dict[str, Any]], Awaitable[None]], status: int, detail: str,
+                  retry_after: Optional[int] = None) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+               (b"connection", b"close")]
+    if retry_after is not None:
+        headers.append((b"retry-after", str(retry_after).encode()))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying `admission` and request body caps.
+
+    identify(scope) names the client a request is charged to, or None to
+    exempt it; body_limit(path) is the largest body accepted there (0 = no
+    cap). A declared Content-Length over the cap is refused before reading;
+    otherwise the body is counted as it streams and reading stops with a 413
+    as soon as it passes the cap.
+    """
+
+    def __init__(self, app, admission: Admission, identify: Callable[[Scope], Optional[str]],
+                 body_limit: Callable[[str], int]):
+        self.app = app
+        self.admission = admission
+        self.identify = identify
+        self.body_limit = body_limit
+
+    async def __call__(self, scope: Scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limit = self.body_limit(scope["path"])
+        too_large = f"Request body exceeds {limit} bytes."
+        declared = _header(scope, b"content-length")
+        if limit and declared is not None and declared.isdigit() and int(declared) > limit:
+            self.admission.count("too_large")
+            await _reject(send, 413, too_large)
+            return
+        client = self.identify(scope)
+        if client is not None:
+            refused = self.admission.admit(client)
+            if refused is not None:
+                reason, retry_after = refused
+                detail = "Too many concurrent requests." if reason == "concurrency" else "Rate limit exceeded."
+                await _reject(send, 429, detail, retry_after)
+                return
+        received = 0
+
+        async def counted_receive() -> Dict[str, Any]:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    self.admission.count("too_large")
+                    # FastAPI re-raises HTTPExceptions from body parsing, so this becomes the response
+                    raise HTTPException(status_code=413, detail=too_large)
+            return message
+
+        try:
+            await self.app(scope, counted_receive if limit else receive, send)
+        finally:
+            if client is not None:
+                self.admission.release(client)
@@ -1,18 +1,79 @@
 # app.py
+import asyncio
+import hashlib
 import io
 import os
 import re
-import uvicorn
-from typing import List, Optional, Dict, Any
+import shutil
+import tempfile
+import time
+import zipfile
+from urllib.parse import parse_qs
+from typing import IO, List, Optional, Dict, Any, AsyncIterator, Iterator, Tuple
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Header, Depends, Query
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
-from parser_core import extract_text_from_file, parse_resume
+from parse_cache import ParseCache
+from parse_jobs import JobFailed, JobQueue, JobRunner, QueueFull, callback_allowed
+from parse_pool import EXTRACT_LIMITS, PARSE_LIMITS, ParsePool, PoolSaturated, iter_run_parse, run_parse
+from parser_core import blank_result
+from candidate_store import MAX_QUERY_LENGTH, CandidateStore, QuerySyntaxError
+from dedup import DedupIndex
+from admission import Admission, AdmissionMiddleware
+import columnar
+import serialize
+import skill_taxonomy
+from matching import CandidateIndex, JobSpec
+from metrics import METRICS_ENABLED, observe_parse, register_stats, render as render_metrics, server_timing
 from starlette.middleware.cors import CORSMiddleware
 
 API_KEY_ENV = "RESUME_API_KEY"
 EXPECTED_KEY = os.getenv(API_KEY_ENV, "dev")
+# Further keys, one per integration, so each gets its own rate and concurrency allowance
+API_KEYS = {k.strip() for k in [EXPECTED_KEY] + os.getenv("RESUME_API_KEYS", "").split(",") if k.strip()}
+
+# Repeat uploads (re-applications, duplicate files in uploads/) skip extraction entirely
+PARSE_CACHE = ParseCache.from_env(salt=repr((EXTRACT_LIMITS, PARSE_LIMITS)))
+# Extraction/parsing runs here so a slow PDF can't stall the event loop (RESUME_EXEC_MODE)
+PARSE_POOL = ParsePool.from_env()
+register_stats("cache", PARSE_CACHE.stats)
+register_stats("pool", PARSE_POOL.stats)
+# Skill matrix of stored candidates for /match (RESUME_MATCH_CORPUS preloads ingest.py output)
+MATCH_INDEX = CandidateIndex.from_env()
+register_stats("match", MATCH_INDEX.stats)
+# Searchable store of parse results (RESUME_STORE_PATH); None keeps nothing
+CANDIDATE_STORE = CandidateStore.from_env()
+if CANDIDATE_STORE is not None:
+    MATCH_INDEX.add_many(CANDIDATE_STORE.iter_skills())
+    register_stats("store", CANDIDATE_STORE.stats)
+# MinHash/LSH index of extracted text; flags re-uploads and trivially edited copies.
+# Bounded by RESUME_DEDUP_MAX_DOCS (LRU); RESUME_DEDUP_PATH keeps it across restarts
+DEDUP_INDEX = DedupIndex.from_env()
+if DEDUP_INDEX is not None:
+    register_stats("dedup", DEDUP_INDEX.stats)
+
+# Durable queue behind /parse/jobs (RESUME_JOBS_PATH), drained by RESUME_JOB_WORKERS tasks
+JOB_QUEUE = JobQueue.from_env()
+JOB_WORKERS = int(os.getenv("RESUME_JOB_WORKERS", "2"))
+JOB_CALLBACK_HOSTS = [h.strip().lower() for h in os.getenv("RESUME_JOB_CALLBACK_HOSTS", "localhost,127.0.0.1,::1").split(",") if h.strip()]
+register_stats("jobs", JOB_QUEUE.stats)
+
+# ingest.py JSONL output offered as Parquet/Arrow downloads at /export/{table}
+EXPORT_SOURCES = [p.strip() for p in os.getenv("RESUME_EXPORT_SOURCE", "").split(",") if p.strip()]
+EXPORT_MEDIA_TYPES = {"parquet": "application/vnd.apache.parquet", "arrow": "application/vnd.apache.arrow.stream"}
+
+BATCH_MAX_ITEMS = int(os.getenv("RESUME_BATCH_MAX_ITEMS", "1000"))
+BATCH_MAX_FILE_BYTES = int(os.getenv("RESUME_BATCH_MAX_FILE_MB", "10")) * 1024 * 1024
+BATCH_BUSY_RETRIES = 40
+
+# Admission control (admission.py): body caps, per-key token buckets and in-flight caps
+ADMISSION = Admission.from_env()
+register_stats("admission", ADMISSION.stats)
+MAX_UPLOAD_BYTES = int(os.getenv("RESUME_MAX_UPLOAD_MB", "10")) * 1024 * 1024
+BATCH_MAX_BYTES = int(os.getenv("RESUME_BATCH_MAX_MB", "200")) * 1024 * 1024
+FORM_OVERHEAD_BYTES = 64 * 1024  # multipart boundaries and the small form fields
+ADMISSION_EXEMPT = ("/web", "/health", "/metrics", "/docs", "/redoc", "/openapi.json", "/favicon.ico")
 
 app = FastAPI(
     title="Resume Parsing API",
@@ -20,6 +81,33 @@ app = FastAPI(
     description="Parses resumes (PDF/DOCX/TXT) into structured JSON.",
 )
 
+def _request_body_limit(path: str) -> int:
+    if path == "/parse/batch":
+        return BATCH_MAX_BYTES
+    return MAX_UPLOAD_BYTES + FORM_OVERHEAD_BYTES
+
+def _admission_client(scope: Dict[str, Any]) -> Optional[str]:
+    """Valid API keys are limited per key; anything else per client address."""
+    path = scope["path"]
+    if path == "/" or path.startswith(ADMISSION_EXEMPT):
+        return None
+    key = None
+    for name, value in scope.get("headers") or ():
+        if name == b"x-api-key":
+            key = value.decode("latin-1")
+            break
+    if key is None:
+        key = (parse_qs(scope.get("query_string", b"").decode("latin-1")).get("api_key") or [None])[0]
+    if key in API_KEYS:
+        return "key:" + key
+    client = scope.get("client")
+    return "addr:" + (client[0] if client else "?")
+
+# Outside the routes (and inside CORS, so browsers can read a 429) to reject before uploads are spooled
+app.add_middleware(
+    AdmissionMiddleware, admission=ADMISSION, identify=_admission_client, body_limit=_request_body_limit,
+)
+
 # Serve static files from the "web" directory at /web
 app.mount("/web", StaticFiles(directory="web", html=True), name="web")
 
@@ -42,7 +130,7 @@ def require_api_key(
         # If no expected key is configured, skip authentication
         return True
     
-    if not provided_key or provided_key != EXPECTED_KEY:
+    if not provided_key or provided_key not in API_KEYS:
         raise HTTPException(status_code=401, detail="Invalid or missing API key.")
     
     return True
@@ -104,8 +192,102 @@ class ParseResponse(BaseModel):
     experience: List[Experience] = []
     projects: List[Project] = []
     certifications: List[Certification] = []
+    truncated: bool = Field(False, description="True if extraction or parsing stopped at a page/time/size budget")
+    truncation_reason: Optional[str] = None
+    duplicate_of: Optional[str] = Field(None, description="Id of an earlier upload with the same or nearly the same text")
+    duplicate_similarity: Optional[float] = Field(None, description="Estimated Jaccard similarity to duplicate_of")
     raw_text: Optional[str] = Field(None, description="Use only for debugging")
 
+# Parse results are laid out from the schema once per response instead of being validated
+shape_parse_response = serialize.shaper(ParseResponse)
+
+class MatchRequest(BaseModel):
+    required: List[str] = Field(default_factory=list, description="Must-have skills (CANONICAL_SKILLS names)")
+    preferred: List[str] = Field(default_factory=list, description="Nice-to-have skills")
+    group_weights: Dict[str, float] = Field(default_factory=dict, description="Per SKILL_GROUPS group multiplier, default 1.0")
+    preferred_weight: float = Field(0.5, ge=0)
+    related_credit: float = Field(0.25, ge=0, le=1, description="Credit for a missing skill when another from its group is present")
+    require_all: bool = Field(False, description="Only return candidates with every required skill")
+    min_score: float = Field(0.0, ge=0, le=1)
+    top_k: int = Field(10, ge=1, le=1000)
+
+class MatchCandidate(BaseModel):
+    id: str
+    skills: List[str] = []
+
+class MatchCandidatesRequest(BaseModel):
+    candidates: List[MatchCandidate]
+
+def _cache_key(content: Optional[bytes], filename: Optional[str], text: Optional[str]) -> Tuple[str, str]:
+    """(input kind for metrics, PARSE_CACHE key)."""
+    kind = os.path.splitext(filename or "")[1].lower().lstrip(".") if content is not None else "text"
+    # A hot-swapped taxonomy changes parse output, so it is part of the key
+    taxonomy = skill_taxonomy.active().digest
+    if content is not None:
+        return kind, PARSE_CACHE.key(content, os.path.splitext(filename or "")[1], taxonomy)
+    return kind, PARSE_CACHE.key((text or "").encode("utf-8"), "text", taxonomy)
+
+async def _cached_parse(
+    content: Optional[bytes], filename: Optional[str], text: Optional[str], timed: bool = False
+) -> Tuple[str, Dict[str, Any], Optional[Dict[str, Dict[str, Any]]]]:
+    """Cache lookup, then extraction/parsing on the pool. Timings are None on a cache hit."""
+    started = time.perf_counter()
+    kind, cache_key = _cache_key(content, filename, text)
+    cached = PARSE_CACHE.get(cache_key)
+    if cached is not None:
+        observe_parse(kind, "cached", time.perf_counter() - started, None)
+        return cached["text"], cached["parsed"], None
+    outcome = "error"
+    timings = None
+    try:
+        resume_text, parsed, timings = await PARSE_POOL.run(
+            run_parse, content, filename, text, timed or METRICS_ENABLED
+        )
+        outcome = "ok"
+    except ValueError:
+        outcome = "unsupported"
+        raise
+    except PoolSaturated:
+        outcome = "busy"
+        raise
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+        raise
+    finally:
+        observe_parse(kind, outcome, time.perf_counter() - started, timings)
+    # A time-budget cut depends on load at the moment, not on the document
+    if parsed.get("truncation_reason") != "parse_time_budget":
+        PARSE_CACHE.put(cache_key, {"text": resume_text, "parsed": parsed})
+    return resume_text, parsed, timings
+
+def _remember_candidate(candidate_id: str, resume_text: str, parsed: Dict[str, Any]) -> None:
+    # Runs off the event loop: fingerprinting is CPU work and the store commits to SQLite
+    parsed["duplicate_of"] = parsed["duplicate_similarity"] = None
+    if DEDUP_INDEX is not None:
+        match = DEDUP_INDEX.check(candidate_id, resume_text)
+        if match is not None:
+            # Copies stay out of the store so a candidate shows up once
+            parsed["duplicate_of"], parsed["duplicate_similarity"] = match
+            return
+    if CANDIDATE_STORE is not None and CANDIDATE_STORE.add(candidate_id, parsed):
+        MATCH_INDEX.add(candidate_id, parsed.get("skills") or [])
+
+def _negotiate(accept: Optional[str], default: str = serialize.JSON) -> str:
+    media_type = serialize.negotiate(accept, default)
+    if media_type is None:
+        supported = [default] + (list(serialize.MSGPACK_TYPES) if serialize.msgpack is not None else [])
+        raise HTTPException(status_code=406, detail=f"Supported media types: {', '.join(supported)}.")
+    return media_type
+
+def _encoded(obj: Any, media_type: str, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    headers = dict(headers or {}, Vary="Accept")
+    return Response(serialize.encode(obj, media_type), status_code=status_code, media_type=media_type, headers=headers)
+
+def _require_store() -> CandidateStore:
+    if CANDIDATE_STORE is None:
+        raise HTTPException(status_code=404, detail="Candidate store is disabled (set RESUME_STORE_PATH).")
+    return CANDIDATE_STORE
+
 @app.get("/")
 def root():
     """Redirect root to web interface."""
@@ -120,40 +302,469 @@ def favicon():
 def health():
     return {"ok": True, "version": "1.0.0"}
 
+@app.get("/metrics")
+def metrics_endpoint():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/cache/stats", dependencies=[Depends(require_api_key)])
+def cache_stats():
+    return PARSE_CACHE.stats()
+
+@app.get("/pool/stats", dependencies=[Depends(require_api_key)])
+def pool_stats():
+    return PARSE_POOL.stats()
+
+@app.post("/match", dependencies=[Depends(require_api_key)])
+def match_endpoint(req: MatchRequest):
+    """Rank stored candidates against a job's required/preferred skills."""
+    started = time.perf_counter()
+    job = JobSpec(req.required, req.preferred, req.group_weights, req.preferred_weight)
+    if not job.skills:
+        raise HTTPException(status_code=400, detail="No known skills in 'required' or 'preferred'.")
+    results = MATCH_INDEX.top_k(job, req.top_k, req.related_credit, req.require_all, req.min_score)
+    return {
+        "candidates": len(MATCH_INDEX),
+        "unknown_skills": job.unknown,
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+@app.post("/match/candidates", dependencies=[Depends(require_api_key)])
+def match_add_candidates(req: MatchCandidatesRequest):
+    """Insert or replace candidates by id, e.g. with the `skills` of a /parse result."""
+    added, updated = MATCH_INDEX.add_many((c.id, c.skills) for c in req.candidates)
+    return {"added": added, "updated": updated, "candidates": len(MATCH_INDEX)}
+
+@app.delete("/match/candidates/{candidate_id}", dependencies=[Depends(require_api_key)])
+def match_remove_candidate(candidate_id: str):
+    if not MATCH_INDEX.remove(candidate_id):
+        raise HTTPException(status_code=404, detail="Unknown candidate id.")
+    return {"removed": candidate_id, "candidates": len(MATCH_INDEX)}
+
+@app.get("/match/stats", dependencies=[Depends(require_api_key)])
+def match_stats():
+    return MATCH_INDEX.stats()
+
+@app.get("/taxonomy", dependencies=[Depends(require_api_key)])
+def taxonomy_info():
+    return skill_taxonomy.active().stats()
+
+@app.get("/taxonomy/lookup", dependencies=[Depends(require_api_key)])
+def taxonomy_lookup(name: List[str] = Query(..., description="Spellings to resolve, e.g. k8s, ReactJS, Postgress")):
+    taxonomy = skill_taxonomy.active()
+    return {n: taxonomy.lookup(n) for n in name}
+
+@app.get("/dedup/stats", dependencies=[Depends(require_api_key)])
+def dedup_stats():
+    if DEDUP_INDEX is None:
+        raise HTTPException(status_code=404, detail="Duplicate detection is disabled (RESUME_DEDUP=0).")
+    return DEDUP_INDEX.stats()
+
+@app.get("/candidates/search", dependencies=[Depends(require_api_key)])
+def candidates_search(
+    q: str = Query(..., max_length=MAX_QUERY_LENGTH,
+                   description='e.g. Kafka AND (Go OR Java) AND loc:bengaluru AND end>=2022'),
+    limit: int = Query(20, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+):
+    """Boolean search over stored candidates.
+
+    Bare words and "quoted phrases" match a skill, else a spoken language, else a
+    location token. Fields: skill:, lang:, link:, loc:, and start/end year
+    comparisons (>=, <=, >, <, =) against the earliest experience start and the
+    latest experience end ("present" for ongoing roles). Operators: AND (implicit),
+    OR, NOT, parentheses.
+    """
+    store = _require_store()
+    started = time.perf_counter()
+    try:
+        out = store.search(q, limit, offset)
+    except QuerySyntaxError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    out["took_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return out
+
+@app.delete("/candidates/{candidate_id}", dependencies=[Depends(require_api_key)])
+def candidates_remove(candidate_id: str):
+    if not _require_store().remove(candidate_id):
+        raise HTTPException(status_code=404, detail="Unknown candidate id.")
+    MATCH_INDEX.remove(candidate_id)
+    return {"removed": candidate_id}
+
+@app.get("/candidates/stats", dependencies=[Depends(require_api_key)])
+def candidates_stats():
+    return _require_store().stats()
+
+async def _run_job(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    options = job["options"]
+    try:
+        resume_text, parsed, _ = await _cached_parse(job["content"], job["filename"], job["text"])
+    except PoolSaturated:
+        return None  # interactive traffic has the pool; try again shortly
+    except ValueError as e:
+        raise JobFailed(415, str(e))
+    except asyncio.TimeoutError:
+        raise JobFailed(504, "Parsing timed out.")
+    content = job["content"] if job["content"] is not None else (job["text"] or "").encode("utf-8")
+    await asyncio.to_thread(
+        _remember_candidate, options.get("candidate_id") or hashlib.sha256(content).hexdigest(), resume_text, parsed
+    )
+    parsed["raw_text"] = resume_text if options.get("include_raw_text") else None
+    return parsed
+
+def _job_document(job: Dict[str, Any]) -> Dict[str, Any]:
+    # Same JSON for GET /parse/jobs/{id} and the callback POST
+    if "result" in job:
+        job["result"] = shape_parse_response(job["result"])
+    return job
+
+JOB_RUNNER = JobRunner(JOB_QUEUE, _run_job, JOB_WORKERS, JOB_CALLBACK_HOSTS, present=_job_document)
+
+STARTUP: Dict[str, float] = {}
+register_stats("startup", lambda: dict(STARTUP))
+
+@app.on_event("startup")
+async def warm_up_parser():
+    # RESUME_WARMUP picks the extractors loaded here; the others load on first use
+    for step, seconds in (await PARSE_POOL.warm_up()).items():
+        STARTUP[f"warm_up_{step}_seconds"] = seconds
+
+@app.on_event("startup")
+async def start_job_runner():
+    # Opened here rather than at import, so importing app (tests, re-imports) leaves the file alone
+    await asyncio.to_thread(JOB_QUEUE.open)
+    JOB_RUNNER.start()
+
+@app.on_event("shutdown")
+async def shutdown_pool():
+    await JOB_RUNNER.stop()
+    JOB_QUEUE.close()
+    PARSE_POOL.shutdown()
+    if CANDIDATE_STORE is not None:
+        CANDIDATE_STORE.close()
+
 @app.post("/parse", response_model=ParseResponse)
 async def parse_endpoint(
     file: Optional[UploadFile] = File(default=None),
     text: Optional[str] = Form(default=None),
     include_raw_text: bool = Form(default=False),
+    candidate_id: Optional[str] = Form(default=None, description="Store id; defaults to the sha256 of the upload"),
     api_key: Optional[str] = Query(default=None, description="API key for authentication"),
     x_api_key: Optional[str] = Header(default=None, description="API key for authentication (header)"),
+    x_parse_timing: Optional[str] = Header(default=None, description="Set to 1 for a Server-Timing breakdown"),
+    accept: Optional[str] = Header(default=None, description="application/json (default) or application/msgpack"),
 ):
     # Manual authentication check
     provided_key = x_api_key or api_key
     
-    if EXPECTED_KEY and (not provided_key or provided_key != EXPECTED_KEY):
+    if EXPECTED_KEY and (not provided_key or provided_key not in API_KEYS):
         raise HTTPException(status_code=401, detail="Invalid or missing API key.")
     
     if not file and not text:
         raise HTTPException(status_code=400, detail="Provide either 'file' or 'text'.")
     if file and text:
         raise HTTPException(status_code=400, detail="Provide only one of 'file' or 'text'.")
+    media_type = _negotiate(accept)
 
-    if file:
-        content = await file.read()
-        try:
-            resume_text = extract_text_from_file(content, file.filename)
-        except ValueError as e:
-            raise HTTPException(status_code=415, detail=str(e))
-    else:
-        resume_text = text or ""
+    want_timing = x_parse_timing in ("1", "true", "yes")
+    started = time.perf_counter()
+    content = await file.read(MAX_UPLOAD_BYTES + 1) if file else (text or "").encode("utf-8")
+    if len(content) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="File too large.")
+    try:
+        if file:
+            resume_text, parsed, timings = await _cached_parse(content, file.filename, None, want_timing)
+        else:
+            resume_text, parsed, timings = await _cached_parse(None, None, text or "", want_timing)
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Parsing timed out.")
 
-    parsed = parse_resume(resume_text)
+    await asyncio.to_thread(
+        _remember_candidate, candidate_id or hashlib.sha256(content).hexdigest(), resume_text, parsed
+    )
     if include_raw_text:
         parsed["raw_text"] = resume_text
     else:
         parsed["raw_text"] = None
-    return JSONResponse(parsed)
+    headers = None
+    if want_timing:
+        total = {"total": time.perf_counter() - started, "cache-hit" if timings is None else "cache-miss": 0.0}
+        headers = {"Server-Timing": server_timing(timings, total)}
+    return _encoded(shape_parse_response(parsed), media_type, headers=headers)
+
+def _sse(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + serialize.dumps_json(data) + b"\n\n"
+
+async def _stream_parse(
+    content: Optional[bytes], filename: Optional[str], text: Optional[str], include_raw_text: bool,
+    candidate_id: Optional[str],
+) -> AsyncIterator[bytes]:
+    started = time.perf_counter()
+    kind, cache_key = _cache_key(content, filename, text)
+    cached = PARSE_CACHE.get(cache_key)
+    if cached is not None:
+        observe_parse(kind, "cached", time.perf_counter() - started, None)
+        resume_text, parsed = cached["text"], cached["parsed"]
+    else:
+        resume_text, parsed = "", blank_result()
+        outcome = "error"
+        try:
+            async for stage, fields in PARSE_POOL.iterate(iter_run_parse, content, filename, text):
+                if stage == "extracted":
+                    resume_text = fields.pop("text")
+                parsed.update(fields)
+                yield _sse(stage, fields)
+            outcome = "ok"
+        except ValueError as e:
+            outcome = "unsupported"
+            yield _sse("error", {"status": 415, "detail": str(e)})
+            return
+        except PoolSaturated as e:
+            outcome = "busy"
+            yield _sse("error", {"status": 503, "detail": str(e)})
+            return
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            yield _sse("error", {"status": 504, "detail": "Parsing timed out."})
+            return
+        except Exception as e:
+            # Headers are already sent; a corrupt PDF/DOCX must still end the stream with an event
+            yield _sse("error", {"status": 500, "detail": f"Failed to parse: {e}"})
+            return
+        finally:
+            observe_parse(kind, outcome, time.perf_counter() - started, None)
+        if parsed.get("truncation_reason") != "parse_time_budget":
+            PARSE_CACHE.put(cache_key, {"text": resume_text, "parsed": parsed})
+    if content is None:
+        content = (text or "").encode("utf-8")
+    await asyncio.to_thread(
+        _remember_candidate, candidate_id or hashlib.sha256(content).hexdigest(), resume_text, parsed
+    )
+    parsed["raw_text"] = resume_text if include_raw_text else None
+    yield _sse("complete", shape_parse_response(parsed))
+
+@app.post("/parse/stream", dependencies=[Depends(require_api_key)])
+async def parse_stream_endpoint(
+    file: Optional[UploadFile] = File(default=None),
+    text: Optional[str] = Form(default=None),
+    include_raw_text: bool = Form(default=False),
+    candidate_id: Optional[str] = Form(default=None, description="Store id; defaults to the sha256 of the upload"),
+):
+    """/parse as Server-Sent Events: one event per parser stage with the fields it produced
+    (extracted, language, contact, sections, skills, education, experience, projects,
+    certifications, and truncated if a budget was hit), then `complete` with the full
+    ParseResponse. Failures after the stream has started arrive as an `error` event."""
+    if not file and not text:
+        raise HTTPException(status_code=400, detail="Provide either 'file' or 'text'.")
+    if file and text:
+        raise HTTPException(status_code=400, detail="Provide only one of 'file' or 'text'.")
+    content = None
+    if file:
+        content = await file.read(MAX_UPLOAD_BYTES + 1)
+        if len(content) > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="File too large.")
+    body = _stream_parse(content, file.filename if file else None, None if file else text, include_raw_text,
+                         candidate_id)
+    return StreamingResponse(body, media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.post("/parse/jobs", status_code=202, dependencies=[Depends(require_api_key)])
+async def parse_job_submit(
+    file: Optional[UploadFile] = File(default=None),
+    text: Optional[str] = Form(default=None),
+    include_raw_text: bool = Form(default=False),
+    candidate_id: Optional[str] = Form(default=None),
+    callback_url: Optional[str] = Form(default=None, description="POSTed the job document when it finishes"),
+):
+    """Queue a parse and return its id at once; poll GET /parse/jobs/{id} or wait for the callback."""
+    if not file and not text:
+        raise HTTPException(status_code=400, detail="Provide either 'file' or 'text'.")
+    if file and text:
+        raise HTTPException(status_code=400, detail="Provide only one of 'file' or 'text'.")
+    if callback_url and not callback_allowed(callback_url, JOB_CALLBACK_HOSTS):
+        raise HTTPException(status_code=400, detail="callback_url must be http(s) on an allowed host (RESUME_JOB_CALLBACK_HOSTS).")
+    content = None
+    if file:
+        content = await file.read(BATCH_MAX_FILE_BYTES + 1)
+        if len(content) > BATCH_MAX_FILE_BYTES:
+            raise HTTPException(status_code=413, detail="File too large.")
+    options = {"include_raw_text": include_raw_text, "candidate_id": candidate_id}
+    try:
+        job_id = await asyncio.to_thread(
+            JOB_QUEUE.enqueue, file.filename if file else None, content, text if not file else None,
+            options, callback_url,
+        )
+    except QueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    JOB_RUNNER.notify()
+    url = f"/parse/jobs/{job_id}"
+    return JSONResponse({"id": job_id, "status": "queued", "status_url": url}, status_code=202, headers={"Location": url})
+
+@app.get("/parse/jobs/{job_id}", dependencies=[Depends(require_api_key)])
+async def parse_job_status(job_id: str, accept: Optional[str] = Header(default=None)):
+    media_type = _negotiate(accept)
+    job = await asyncio.to_thread(JOB_QUEUE.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id.")
+    return _encoded(_job_document(job), media_type)
+
+def _spool_uploads(files: List[UploadFile]) -> List[Tuple[str, IO[bytes]]]:
+    # FastAPI closes UploadFiles when the endpoint returns, before a streamed body
+    # runs, so hand the stream its own spooled copies (small in memory, large on disk)
+    out = []
+    for f in files:
+        tmp = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        shutil.copyfileobj(f.file, tmp)
+        tmp.seek(0)
+        out.append((f.filename or "", tmp))
+    return out
+
+def _iter_zip_members(filename: str, fileobj: IO[bytes]) -> Iterator[Tuple[str, Optional[bytes], Optional[Tuple[int, str]]]]:
+    # Members are read one at a time from the spooled upload, never the whole archive
+    try:
+        zf = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        yield filename, None, (400, "Not a valid ZIP archive.")
+        return
+    with zf:
+        for info in zf.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith("__MACOSX/") or os.path.basename(name).startswith("."):
+                continue
+            if info.file_size > BATCH_MAX_FILE_BYTES:
+                yield name, None, (413, "File too large.")
+                continue
+            with zf.open(info) as member:
+                content = member.read(BATCH_MAX_FILE_BYTES + 1)
+            if len(content) > BATCH_MAX_FILE_BYTES:
+                yield name, None, (413, "File too large.")
+                continue
+            yield name, content, None
+
+def _batch_sources(uploads: List[Tuple[str, IO[bytes]]]) -> Iterator[Tuple[str, Optional[bytes], Optional[Tuple[int, str]]]]:
+    for filename, fileobj in uploads:
+        if filename.lower().endswith(".zip"):
+            yield from _iter_zip_members(filename, fileobj)
+        else:
+            content = fileobj.read(BATCH_MAX_FILE_BYTES + 1)
+            if len(content) > BATCH_MAX_FILE_BYTES:
+                yield filename, None, (413, "File too large.")
+            else:
+                yield filename, content, None
+
+async def _batch_item(index: int, filename: str, content: bytes, include_raw_text: bool) -> Dict[str, Any]:
+    item: Dict[str, Any] = {"index": index, "filename": filename}
+    retries = BATCH_BUSY_RETRIES
+    while True:
+        try:
+            resume_text, parsed, _ = await _cached_parse(content, filename, None)
+        except PoolSaturated as e:
+            # Other traffic is filling the pool; a batch waits its turn instead of failing
+            if retries > 0:
+                retries -= 1
+                await asyncio.sleep(0.25)
+                continue
+            item.update({"ok": False, "status": 503, "error": str(e)})
+        except ValueError as e:
+            item.update({"ok": False, "status": 415, "error": str(e)})
+        except asyncio.TimeoutError:
+            item.update({"ok": False, "status": 504, "error": "Parsing timed out."})
+        except Exception as e:
+            item.update({"ok": False, "status": 500, "error": f"Failed to parse: {e}"})
+        else:
+            await asyncio.to_thread(_remember_candidate, hashlib.sha256(content).hexdigest(), resume_text, parsed)
+            parsed["raw_text"] = resume_text if include_raw_text else None
+            item.update({"ok": True, "result": shape_parse_response(parsed)})
+        return item
+
+async def _stream_batch(uploads: List[Tuple[str, IO[bytes]]], include_raw_text: bool,
+                        media_type: str = serialize.NDJSON) -> AsyncIterator[bytes]:
+    limit = max(1, PARSE_POOL.workers)
+    pending: set = set()
+    index = 0
+
+    def _line(item: Dict[str, Any]) -> bytes:
+        # msgpack objects are self-delimiting, so that stream is just concatenated items
+        if media_type in serialize.MSGPACK_TYPES:
+            return serialize.dumps_msgpack(item)
+        return serialize.dumps_json(item) + b"\n"
+
+    sources = _batch_sources(uploads)
+    read: Optional[asyncio.Future] = None
+    try:
+        while True:
+            # Inflating a ZIP member or reading a spooled upload blocks; keep it off the event loop.
+            # Shielded so a disconnect doesn't abandon the read while the thread is still inside `sources`.
+            read = asyncio.ensure_future(asyncio.to_thread(next, sources, None))
+            source = await asyncio.shield(read)
+            if source is None:
+                break
+            filename, content, error = source
+            if index >= BATCH_MAX_ITEMS:
+                yield _line({"index": index, "filename": filename, "ok": False, "status": 413,
+                             "error": f"Batch limited to {BATCH_MAX_ITEMS} documents."})
+                break
+            if error:
+                yield _line({"index": index, "filename": filename, "ok": False, "status": error[0], "error": error[1]})
+            else:
+                pending.add(asyncio.ensure_future(_batch_item(index, filename, content, include_raw_text)))
+            index += 1
+            # At most `limit` documents are held in memory at once
+            while len(pending) >= limit:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for d in done:
+                    yield _line(d.result())
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for d in done:
+                yield _line(d.result())
+    finally:
+        for p in pending:
+            p.cancel()
+        try:
+            if read is not None and not read.done():
+                await asyncio.wait([read])  # closing a generator that is still executing raises
+            sources.close()
+        finally:
+            for _, fileobj in uploads:
+                fileobj.close()
+
+@app.post("/parse/batch", dependencies=[Depends(require_api_key)])
+async def parse_batch_endpoint(
+    files: List[UploadFile] = File(..., description="Resumes (PDF/DOCX/TXT) and/or ZIP archives of them"),
+    include_raw_text: bool = Form(default=False),
+    accept: Optional[str] = Header(default=None, description="application/x-ndjson (default) or application/msgpack"),
+):
+    """Parse many resumes; streams one NDJSON line (or msgpack object) per document in completion order."""
+    media_type = _negotiate(accept, serialize.NDJSON)
+    uploads = await asyncio.to_thread(_spool_uploads, files)
+    return StreamingResponse(_stream_batch(uploads, include_raw_text, media_type), media_type=media_type,
+                             headers={"Vary": "Accept"})
+
+@app.get("/export/{table}", dependencies=[Depends(require_api_key)])
+def export_table(
+    table: str,
+    format: str = Query("parquet", pattern="^(parquet|arrow)$", description="parquet or arrow (IPC stream)"),
+    row_group_size: int = Query(columnar.ROW_GROUP_SIZE, ge=1000, le=1_000_000),
+):
+    """Stream one table of the RESUME_EXPORT_SOURCE corpus: documents, or a child table keyed by doc_hash."""
+    if not EXPORT_SOURCES:
+        raise HTTPException(status_code=404, detail="Export is disabled (set RESUME_EXPORT_SOURCE).")
+    if not columnar.available():
+        raise HTTPException(status_code=501, detail="Export needs pyarrow installed on the server.")
+    if table not in columnar.TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown table; use one of {', '.join(columnar.TABLES)}.")
+    ext = "parquet" if format == "parquet" else "arrows"
+    body = columnar.iter_table_bytes(columnar.iter_sources(EXPORT_SOURCES), table, format, row_group_size)
+    return StreamingResponse(body, media_type=EXPORT_MEDIA_TYPES[format],
+                             headers={"Content-Disposition": f'attachment; filename="{table}.{ext}"'})
 
 if __name__ == "__main__":
-    uvicorn.run("app:app", host="0.0.0.0", port=int(os.getenv("PORT", "8080")), reload=False)
+    import uvicorn
+    # The app object, not "app:app": the string would import this module a second time
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "8080")), reload=False)
@@ -0,0 +1,77 @@
+# benchmarks/bench_adversarial.py
+# Worst-case parse latency on garbage input (what a broken PDF can dump).
+#
+#   python benchmarks/bench_adversarial.py                    # 1 MB cases, budget off
+#   python benchmarks/bench_adversarial.py --budget 2         # same, with ParseLimits(time_budget=2)
+#
+# Each case is parsed at `--size` and at a quarter of it. Linear patterns take
+# ~4x longer on the bigger input; a quadratic one takes ~16x. Exits 1 if any
+# case grows faster than --max-growth or takes longer than --max-seconds.
+import argparse
+import os
+import sys
+import time
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parser_core  # noqa: E402
+
+CASES: Dict[str, Callable[[int], str]] = {
+    "digits": lambda n: "1" * n,
+    "letters": lambda n: "a" * n,
+    "digit_groups": lambda n: ("12345678a" * (n // 9 + 1))[:n],
+    "spaced_digits": lambda n: ("1 " * (n // 2 + 1))[:n],
+    "phone_like": lambda n: ("(555) 12-" * (n // 9 + 1))[:n],
+    "month_run": lambda n: ("jan" * (n // 3 + 1))[:n],
+    "month_years": lambda n: ("Sept 1 19 " * (n // 10 + 1))[:n],
+    "email_local": lambda n: ("a." * (n // 2 + 1))[:n] + "@",
+    "email_domain": lambda n: "x@" + ("a." * (n // 2 + 1))[:n],
+    "at_signs": lambda n: ("a@" * (n // 2 + 1))[:n],
+    "urls": lambda n: ("www." * (n // 4 + 1))[:n],
+    "comma_letters": lambda n: ("a," * (n // 2 + 1))[:n],
+    "education_in": lambda n: "Education\nBS " + ("in " * (n // 3 + 1))[:n],
+    "education_gpa": lambda n: "Education\n2019 " + ("GPA " * (n // 4 + 1))[:n],
+    "many_lines": lambda n: ("2019 - 2020\n" * (n // 12 + 1))[:n],
+    "bullets": lambda n: "Experience\nAcme - Engineer 2019 - 2020\n" + ("- x\n" * (n // 4 + 1))[:n],
+    "skills_label": lambda n: "Skills: " + ("a" * n),
+}
+
+
+def time_parse(text: str, limits: parser_core.ParseLimits) -> float:
+    t0 = time.perf_counter()
+    parser_core.parse_resume(text, limits=limits)
+    return time.perf_counter() - t0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Parse latency on adversarial input.")
+    ap.add_argument("--size", type=int, default=1_000_000, help="characters per case")
+    ap.add_argument("--only", default="", help="substring filter on case names")
+    ap.add_argument("--budget", type=float, default=0.0, help="ParseLimits.time_budget (0 = off)")
+    ap.add_argument("--max-seconds", type=float, default=5.0, help="fail if a case takes longer")
+    ap.add_argument("--max-growth", type=float, default=8.0,
+                    help="fail if 4x the input takes more than this many times longer")
+    args = ap.parse_args(argv)
+
+    limits = parser_core.ParseLimits(time_budget=args.budget)
+    failures = 0
+    for name, make in CASES.items():
+        if args.only and args.only not in name:
+            continue
+        small = time_parse(make(args.size // 4), limits)
+        big = time_parse(make(args.size), limits)
+        # Tiny timings are all noise; only judge growth once there is something to measure
+        growth = big / small if small > 1e-3 else 1.0
+        bad = big > args.max_seconds or growth > args.max_growth
+        failures += bad
+        print(f"  {'FAIL' if bad else 'ok':<5} {name:<16} {small * 1e3:9.1f} -> {big * 1e3:9.1f} ms ({growth:5.1f}x)")
+    if failures:
+        print(f"{failures} case(s) over {args.max_seconds}s or growing faster than {args.max_growth}x",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+# benchmarks/bench_match.py
+# Ranking latency of matching.CandidateIndex over random candidates.
+#
+#   python benchmarks/bench_match.py --candidates 100000
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matching import CandidateIndex, JobSpec  # noqa: E402
+from skill_sets import CANONICAL_SKILLS  # noqa: E402
+
+
+def build_index(n: int, seed: int = 0) -> CandidateIndex:
+    rng = random.Random(seed)
+    index = CandidateIndex(capacity=n)
+    index.add_many((f"c{i}", rng.sample(CANONICAL_SKILLS, rng.randint(3, 20))) for i in range(n))
+    return index
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark top-k candidate ranking.")
+    ap.add_argument("--candidates", type=int, default=100_000)
+    ap.add_argument("--jobs", type=int, default=50)
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    index = build_index(args.candidates, args.seed)
+    print(f"indexed {len(index)} candidates in {time.perf_counter() - t0:.2f}s ({index.stats()['bytes'] >> 10} KiB)")
+
+    rng = random.Random(args.seed + 1)
+    took = []
+    for _ in range(args.jobs):
+        skills = rng.sample(CANONICAL_SKILLS, 10)
+        job = JobSpec(skills[:5], skills[5:], {"Data": 1.5})
+        t0 = time.perf_counter()
+        index.top_k(job, args.top_k)
+        took.append(time.perf_counter() - t0)
+    took.sort()
+    print(f"top-{args.top_k} over {args.jobs} jobs: p50 {took[len(took) // 2] * 1000:.2f} ms, "
+          f"max {took[-1] * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
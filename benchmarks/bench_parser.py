@@ -0,0 +1,120 @@
+# benchmarks/bench_parser.py
+# Per-stage micro-benchmarks for parser_core over the synthetic corpus.
+#
+#   python benchmarks/bench_parser.py --save benchmarks/baseline.json     # record a baseline
+#   python benchmarks/bench_parser.py --compare benchmarks/baseline.json  # exit 1 on regression
+#
+# Baselines are machine-specific: record and compare on the same box.
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parser_core  # noqa: E402
+import synth  # noqa: E402
+
+
+def time_call(fn: Callable[[], object], repeat: int = 5, min_time: float = 0.02) -> float:
+    """Best-of-`repeat` seconds per call, with the loop count scaled so each round takes ~min_time."""
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
+
+
+def stage_calls(text: str) -> Dict[str, Callable[[], object]]:
+    doc = parser_core.build_document(text)
+    return {
+        "build_document": lambda: parser_core.build_document(text),
+        "_split_sections": lambda: parser_core._split_sections(doc),
+        "_find_skill_hits": lambda: parser_core._find_skill_hits(doc),
+        "_parse_education": lambda: parser_core._parse_education(doc),
+        "_parse_experience": lambda: parser_core._parse_experience(doc),
+        "parse_resume": lambda: parser_core.parse_resume(text),
+    }
+
+
+def run(seed: int = 0, repeat: int = 7, only: str = "") -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    for case, files in synth.corpus(seed).items():
+        if only and only not in case:
+            continue
+        for fname, data in files.items():
+            fmt = fname.rsplit(".", 1)[1]
+            results[f"{case}/extract_text_from_file[{fmt}]"] = time_call(
+                lambda: parser_core.extract_text_from_file(data, fname), repeat
+            )
+        text = parser_core.extract_text_from_file(files["resume.txt"], "resume.txt")
+        for stage, fn in stage_calls(text).items():
+            results[f"{case}/{stage}"] = time_call(fn, repeat)
+    return results
+
+
+def compare(current: Dict[str, float], baseline: Dict[str, float], threshold: float,
+            floor: float = 1e-6) -> int:
+    regressions = 0
+    for key, now in sorted(current.items()):
+        was = baseline.get(key)
+        if was is None:
+            print(f"  new   {key}: {now * 1e6:10.1f} us")
+            continue
+        ratio = now / was if was else float("inf")
+        # Sub-microsecond stages (empty sections) are pure timer noise
+        flag = "REGR" if ratio > 1 + threshold and now - was > floor else "ok"
+        if flag == "REGR":
+            regressions += 1
+        print(f"  {flag:<5} {key}: {was * 1e6:10.1f} -> {now * 1e6:10.1f} us ({ratio:5.2f}x)")
+    return regressions
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark parser_core stages on synthetic resumes.")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--only", default="", help="substring filter on case names, e.g. 'large'")
+    ap.add_argument("--save", help="write results as a JSON baseline")
+    ap.add_argument("--compare", help="baseline JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    args = ap.parse_args(argv)
+
+    results = run(args.seed, args.repeat, args.only)
+    if args.save:
+        doc = {
+            "meta": {"python": platform.python_version(), "machine": platform.machine(),
+                     "platform": platform.platform(), "seed": args.seed},
+            "results": results,
+        }
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{regressions} stage(s) regressed by more than {args.threshold:.0%}", file=sys.stderr)
+            return 1
+        return 0
+    for key, secs in sorted(results.items()):
+        print(f"{key:<60} {secs * 1e6:10.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# benchmarks/bench_serialize.py
+# Encode time and response size of /parse results: the old path (JSONResponse's
+# json.dumps), pydantic validation + model_dump_json, and the serialize.py paths.
+#
+#   python benchmarks/bench_serialize.py --size large
+import argparse
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("RESUME_JOBS_PATH", ":memory:")  # importing app opens the job queue
+
+import parser_core  # noqa: E402
+import serialize  # noqa: E402
+import synth  # noqa: E402
+from app import ParseResponse, shape_parse_response  # noqa: E402
+from bench_parser import time_call  # noqa: E402
+
+
+def results(seed: int, size: str, count: int) -> List[Dict[str, Any]]:
+    out = []
+    for i in range(count):
+        text = "\n".join(synth.resume_lines(seed + i, size))
+        parsed = parser_core.parse_resume(text)
+        parsed.update(duplicate_of=None, duplicate_similarity=None, raw_text=None)
+        out.append(parsed)
+    return out
+
+
+def encoders() -> Dict[str, Callable[[Dict[str, Any]], bytes]]:
+    paths = {
+        "json.dumps (JSONResponse)": lambda r: json.dumps(
+            r, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8"),
+        "pydantic validate+dump": lambda r: ParseResponse.model_validate(r).model_dump_json().encode("utf-8"),
+        "shape + json": lambda r: serialize.dumps_json(shape_parse_response(r)),
+    }
+    if serialize.msgpack is not None:
+        paths["shape + msgpack"] = lambda r: serialize.dumps_msgpack(shape_parse_response(r))
+    return paths
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark parse-result encoding.")
+    ap.add_argument("--size", choices=sorted(synth.SIZES), default="medium")
+    ap.add_argument("--count", type=int, default=20, help="distinct parse results")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=7)
+    args = ap.parse_args(argv)
+
+    docs = results(args.seed, args.size, args.count)
+    print(f"{args.count} {args.size} parse results; orjson={'yes' if serialize.orjson else 'no'}"
+          f" msgpack={'yes' if serialize.msgpack else 'no'}")
+    print(f"{'path':<28} {'us/doc':>9} {'bytes/doc':>10}")
+    baseline = None
+    for name, fn in encoders().items():
+        took = time_call(lambda: [fn(d) for d in docs], args.repeat) / len(docs)
+        size = sum(len(fn(d)) for d in docs) / len(docs)
+        baseline = baseline or took
+        print(f"{name:<28} {took * 1e6:>9.1f} {size:>10.0f}   x{baseline / took:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
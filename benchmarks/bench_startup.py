@@ -0,0 +1,160 @@
+# benchmarks/bench_startup.py
+# Cold-start cost of app.py: where import time goes, and how long a fresh
+# server takes to answer its first requests.
+#
+#   python benchmarks/bench_startup.py                         # import profile + 5 cold starts
+#   python benchmarks/bench_startup.py --env RESUME_WARMUP=    # fully lazy extractors
+#   python benchmarks/bench_startup.py --save before.json
+#   python benchmarks/bench_startup.py --compare before.json
+#
+# The import profile is `python -X importtime -c "import app"`, summed per
+# top-level package (self time, so nothing is counted twice). Each cold start
+# launches the server the way the Dockerfile does, polls /health every 5 ms,
+# then sends one TXT and one PDF upload; times are from process launch. The
+# OS page cache is warm after the first run, so compare medians, not the
+# first run alone.
+import argparse
+import http.client
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synth  # noqa: E402
+from loadtest import multipart  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STEPS = ("import", "health", "first_txt", "first_pdf")
+
+
+def import_profile(env: Dict[str, str]) -> Tuple[float, Dict[str, float]]:
+    """(total seconds, self seconds per top-level package) for importing app."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"],
+                          cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    packages: Dict[str, float] = {}
+    total = 0.0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if not fields[0].strip().isdigit():
+            continue  # the column header
+        own, cumulative, name = int(fields[0]), int(fields[1]), fields[2]
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0.0) + own / 1e6
+        if name == " " + name.strip():  # top level: its cumulative time covers its children
+            total += cumulative / 1e6
+    return total, packages
+
+
+def _request(port: int, method: str, path: str, body: Optional[bytes] = None,
+             headers: Optional[Dict[str, str]] = None) -> int:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        resp = conn.getresponse()
+        resp.read()
+        return resp.status
+    finally:
+        conn.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def cold_start(env: Dict[str, str], uploads: Dict[str, bytes], api_key: str, timeout: float) -> Dict[str, float]:
+    """Seconds from launching uvicorn to the first healthy response and first parses."""
+    port = _free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port)],
+                            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    out: Dict[str, float] = {}
+    try:
+        while "health" not in out:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with {proc.returncode}")
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError("server did not become healthy")
+            try:
+                if _request(port, "GET", "/health") == 200:
+                    out["health"] = time.perf_counter() - started
+            except OSError:
+                time.sleep(0.005)
+        headers = {"X-API-Key": api_key, "Content-Type": "multipart/form-data; boundary=loadtest7d1f0a"}
+        for fmt, body in uploads.items():
+            status = _request(port, "POST", "/parse", body, headers)
+            if status != 200:
+                raise RuntimeError(f"first {fmt} upload returned {status}")
+            out[f"first_{fmt}"] = time.perf_counter() - started
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=20)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Import profile and time-to-first-request of app.py.")
+    ap.add_argument("--runs", type=int, default=5, help="cold starts to measure")
+    ap.add_argument("--top", type=int, default=12, help="packages to list in the import profile")
+    ap.add_argument("--api-key", default=os.getenv("RESUME_API_KEY", "dev"))
+    ap.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for /health")
+    ap.add_argument("--env", action="append", default=[], help="extra server environment, KEY=VALUE (repeatable)")
+    ap.add_argument("--save", help="write the report as JSON")
+    ap.add_argument("--compare", help="earlier --save report to compare against (same machine)")
+    args = ap.parse_args(argv)
+
+    lines = synth.resume_lines(0, "medium", synth.LAYOUTS[0])
+    uploads = {fmt: multipart(f"resume.{fmt}", synth.FORMATS[fmt](lines)) for fmt in ("txt", "pdf")}
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ)
+        env.update({"RESUME_JOBS_PATH": os.path.join(workdir, "jobs.db"), "RESUME_CACHE_ENTRIES": "0"})
+        env.update(kv.split("=", 1) for kv in args.env)
+        total, packages = import_profile(env)
+        runs: List[Dict[str, float]] = [cold_start(env, uploads, args.api_key, args.timeout)
+                                        for _ in range(args.runs)]
+
+    report: Dict[str, Any] = {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count(),
+                 "env": args.env, "runs": args.runs},
+        "import": total,
+        "packages": dict(sorted(packages.items(), key=lambda kv: -kv[1])),
+    }
+    for step in STEPS[1:]:
+        report[step] = statistics.median(r[step] for r in runs)
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(f"import app: {total * 1e3:.0f} ms; largest packages (self time):")
+    for name, seconds in list(report["packages"].items())[:args.top]:
+        print(f"  {name:<24} {seconds * 1e3:8.1f} ms")
+    print(f"median of {args.runs} cold start(s), ms from launch:")
+    for step in STEPS:
+        line = f"  {step:<10} {report[step] * 1e3:8.0f}"
+        if baseline is not None and baseline.get(step):
+            line += f"   (was {baseline[step] * 1e3:.0f}, {report[step] / baseline[step] - 1:+.0%})"
+        print(line)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
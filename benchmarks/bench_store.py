@@ -0,0 +1,75 @@
+# benchmarks/bench_store.py
+# Boolean query latency of candidate_store.CandidateStore over synthetic candidates.
+#
+#   python benchmarks/bench_store.py --candidates 1000000 --store /tmp/bench-store.db
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from candidate_store import CandidateStore  # noqa: E402
+from skill_sets import CANONICAL_SKILLS, LANGUAGES  # noqa: E402
+from synth import CITIES  # noqa: E402
+
+QUERIES = [
+    "Kafka AND (Go OR Java) AND loc:bengaluru AND end>=2022",
+    "Python AND NOT Java",
+    '"Machine Learning" AND PyTorch AND start<=2015',
+    "(React OR Angular) AND link:github AND lang:german",
+    "loc:berlin OR loc:austin",
+]
+
+
+def fake_parsed(rng: random.Random):
+    start = rng.randint(1995, 2022)
+    end = rng.choice([rng.randint(start, 2024), "Present"])
+    return {
+        "candidate_name": f"Candidate {rng.randint(0, 1 << 30)}",
+        "location": rng.choice(CITIES),
+        "skills": rng.sample(CANONICAL_SKILLS, rng.randint(3, 20)),
+        "languages": rng.sample(LANGUAGES, rng.randint(1, 3)),
+        "links": [{"type": t} for t in rng.sample(["linkedin", "github", "portfolio"], rng.randint(0, 2))],
+        "experience": [{"start_date": str(start), "end_date": str(end)}],
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark candidate store queries.")
+    ap.add_argument("--candidates", type=int, default=200_000)
+    ap.add_argument("--store", default=":memory:", help="SQLite path; reused if it already has candidates")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    store = CandidateStore(args.store)
+    print(f"opened {len(store)} candidates in {time.perf_counter() - t0:.2f}s")
+    if len(store) < args.candidates:
+        rng = random.Random(args.seed)
+        t0 = time.perf_counter()
+        batch = []
+        for i in range(len(store), args.candidates):
+            batch.append((f"c{i}", fake_parsed(rng)))
+            if len(batch) == 5000:
+                store.add_many(batch)
+                batch = []
+        store.add_many(batch)
+        store.flush()
+        print(f"indexed up to {len(store)} candidates in {time.perf_counter() - t0:.1f}s")
+
+    for q in QUERIES:
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            out = store.search(q, limit=20)
+            best = min(best, time.perf_counter() - t0)
+        print(f"{best * 1000:8.2f} ms  {out['total']:>8} hits  {q}")
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
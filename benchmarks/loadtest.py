@@ -0,0 +1,377 @@
+# benchmarks/loadtest.py
+# End-to-end load test of app.py: starts uvicorn locally, replays a mix of
+# synthetic TXT/DOCX/PDF uploads against /parse and reports throughput,
+# latency percentiles, errors and RSS, for each worker/exec-mode combination.
+#
+#   python benchmarks/loadtest.py --workers 1,2,4 --modes thread,process --concurrency 16
+#   python benchmarks/loadtest.py --rps 40 --duration 60 --save reports/c5.large.json
+#   python benchmarks/loadtest.py --compare reports/c5.large.json
+#
+# --concurrency runs a closed loop (each client sends its next request when the
+# last one returns); --rps sends on a fixed schedule and measures latency from
+# the scheduled time, so a stalled server shows up as latency, not lower load.
+# The parse cache is off and admission limits are lifted unless --env says
+# otherwise. RSS is read from /proc (Linux only).
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import synth  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONTENT_TYPES = {
+    "txt": "text/plain",
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+BOUNDARY = "loadtest7d1f0a"
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """"txt=0.5,docx=0.3,pdf=0.2" -> normalized weights."""
+    mix = {}
+    for part in spec.split(","):
+        fmt, _, weight = part.partition("=")
+        fmt = fmt.strip()
+        if fmt not in CONTENT_TYPES:
+            raise ValueError(f"Unknown format {fmt!r} in mix; use {', '.join(CONTENT_TYPES)}.")
+        mix[fmt] = float(weight or 1)
+    total = sum(mix.values())
+    return {fmt: w / total for fmt, w in mix.items()}
+
+
+def multipart(filename: str, data: bytes) -> bytes:
+    head = (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: {CONTENT_TYPES[filename.rsplit('.', 1)[1]]}\r\n\r\n").encode()
+    return head + data + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def build_payloads(mix: Dict[str, float], distinct: int, seed: int) -> List[Tuple[str, bytes]]:
+    """(format, multipart body) for `distinct` documents per format, sizes and layouts varied."""
+    out = []
+    for fmt in mix:
+        for k in range(distinct):
+            size = list(synth.SIZES)[k % len(synth.SIZES)]
+            layout = synth.LAYOUTS[(k // len(synth.SIZES)) % len(synth.LAYOUTS)]
+            data = synth.FORMATS[fmt](synth.resume_lines(seed + k, size, layout))
+            out.append((fmt, multipart(f"resume-{k}.{fmt}", data)))
+    return out
+
+
+class Server:
+    """uvicorn running app:app in a subprocess on `port`."""
+
+    def __init__(self, workers: int, mode: str, port: int, env: Dict[str, str], workdir: str):
+        self.port = port
+        full_env = dict(os.environ)
+        full_env.update({
+            "RESUME_EXEC_MODE": mode,
+            "RESUME_CACHE_ENTRIES": "0",
+            "RESUME_RATE_LIMIT": "0",
+            "RESUME_KEY_CONCURRENCY": "0",
+            "RESUME_JOBS_PATH": os.path.join(workdir, f"jobs-{port}.db"),
+        })
+        full_env.update(env)
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+            cwd=ROOT, env=full_env,
+        )
+
+    def wait_ready(self, timeout: float = 60.0) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"server exited with {self.proc.returncode}")
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=2)
+                conn.request("GET", "/health")
+                if conn.getresponse().status == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError("server did not become healthy")
+
+    def stop(self) -> None:
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=20)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+def _descendants(pid: int) -> List[int]:
+    children: Dict[int, List[int]] = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f:
+                ppid = int(f.read().rsplit(b")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+    out, todo = [], [pid]
+    while todo:
+        p = todo.pop()
+        out.append(p)
+        todo.extend(children.get(p, ()))
+    return out
+
+
+def _rss_kib(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+class RssSampler(threading.Thread):
+    """Peak RSS of the server process tree, sampled every `interval` seconds."""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak: Dict[int, int] = {}
+        self.peak_total = 0
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        if not os.path.isdir("/proc"):
+            return
+        while not self._done.is_set():
+            total = 0
+            for p in _descendants(self.pid):
+                rss = _rss_kib(p)
+                total += rss
+                self.peak[p] = max(self.peak.get(p, 0), rss)
+            self.peak_total = max(self.peak_total, total)
+            self._done.wait(self.interval)
+
+    def stop(self) -> Dict[str, Any]:
+        self._done.set()
+        self.join()
+        per_process = sorted(self.peak.values(), reverse=True)
+        return {
+            "processes": len(per_process),
+            "peak_total_mib": round(self.peak_total / 1024, 1),
+            "peak_max_process_mib": round(per_process[0] / 1024, 1) if per_process else 0.0,
+            "peak_per_process_mib": [round(v / 1024, 1) for v in per_process],
+        }
+
+
+class Client:
+    """One keep-alive connection; reconnects after errors."""
+
+    def __init__(self, port: int, api_key: str):
+        self.port = port
+        self.headers = {"Content-Type": f"multipart/form-data; boundary={BOUNDARY}", "X-API-Key": api_key}
+        self.conn: Optional[http.client.HTTPConnection] = None
+
+    def post(self, body: bytes) -> int:
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=120)
+        try:
+            self.conn.request("POST", "/parse", body=body, headers=self.headers)
+            resp = self.conn.getresponse()
+            resp.read()
+            return resp.status
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = None
+            return 0
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+def _pick(payloads: List[Tuple[str, bytes]], mix: Dict[str, float], rng: random.Random) -> Tuple[str, bytes]:
+    fmt = rng.choices(list(mix), weights=list(mix.values()))[0]
+    candidates = [p for p in payloads if p[0] == fmt]
+    return rng.choice(candidates)
+
+
+def run_load(port: int, api_key: str, payloads: List[Tuple[str, bytes]], mix: Dict[str, float],
+             duration: float, concurrency: int, rps: float, seed: int) -> List[Tuple[str, float, int]]:
+    """(format, latency seconds, status) per request; status 0 is a connection error."""
+    results: List[Tuple[str, float, int]] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    if rps:
+        # Open loop: request i is due at start + i/rps whether or not earlier ones have returned
+        rng = random.Random(seed)
+        local = threading.local()
+        start = time.perf_counter()
+
+        def fire(due: float, fmt: str, body: bytes) -> None:
+            client = getattr(local, "client", None)
+            if client is None:
+                client = local.client = Client(port, api_key)
+            status = client.post(body)
+            with lock:
+                results.append((fmt, time.perf_counter() - due, status))
+
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+            i = 0
+            while True:
+                due = start + i / rps
+                if due >= deadline:
+                    break
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                fmt, body = _pick(payloads, mix, rng)
+                pool.submit(fire, due, fmt, body)
+                i += 1
+        return results
+
+    def loop(worker: int) -> None:
+        rng = random.Random(seed * 1000 + worker)
+        client = Client(port, api_key)
+        while time.perf_counter() < deadline:
+            fmt, body = _pick(payloads, mix, rng)
+            t0 = time.perf_counter()
+            status = client.post(body)
+            with lock:
+                results.append((fmt, time.perf_counter() - t0, status))
+
+    threads = [threading.Thread(target=loop, args=(w,)) for w in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def summarize(results: List[Tuple[str, float, int]], elapsed: float) -> Dict[str, Any]:
+    def stats(rows: List[Tuple[str, float, int]]) -> Dict[str, Any]:
+        ok = sorted(lat for _, lat, status in rows if status == 200)
+        errors: Dict[str, int] = {}
+        for _, _, status in rows:
+            if status != 200:
+                errors[str(status)] = errors.get(str(status), 0) + 1
+        return {
+            "requests": len(rows),
+            "ok": len(ok),
+            "error_rate": round(1 - len(ok) / len(rows), 4) if rows else 0.0,
+            "errors": errors,
+            "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(ok, 0.50) * 1000, 1),
+            "p95_ms": round(percentile(ok, 0.95) * 1000, 1),
+            "p99_ms": round(percentile(ok, 0.99) * 1000, 1),
+            "max_ms": round(ok[-1] * 1000, 1) if ok else 0.0,
+        }
+
+    out = stats(results)
+    out["by_format"] = {fmt: stats([r for r in results if r[0] == fmt]) for fmt in sorted({r[0] for r in results})}
+    return out
+
+
+def run_config(workers: int, mode: str, args, payloads, mix, port: int, workdir: str) -> Dict[str, Any]:
+    env = dict(kv.split("=", 1) for kv in args.env)
+    server = Server(workers, mode, port, env, workdir)
+    try:
+        server.wait_ready()
+        if args.warmup:
+            run_load(port, args.api_key, payloads, mix, args.warmup, args.concurrency, 0, args.seed + 1)
+        sampler = RssSampler(server.proc.pid)
+        sampler.start()
+        t0 = time.perf_counter()
+        results = run_load(port, args.api_key, payloads, mix, args.duration, args.concurrency, args.rps, args.seed)
+        elapsed = time.perf_counter() - t0
+        report = summarize(results, elapsed)
+        report["rss"] = sampler.stop()
+    finally:
+        server.stop()
+    report.update({"workers": workers, "mode": mode})
+    return report
+
+
+def _key(report: Dict[str, Any]) -> str:
+    return f"workers={report['workers']} mode={report['mode']}"
+
+
+def print_table(reports: List[Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+    print(f"  {'config':<26} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'err %':>7} {'RSS MiB':>9}")
+    for r in reports:
+        line = (f"  {_key(r):<26} {r['throughput_rps']:8.1f} {r['p50_ms']:9.1f} {r['p95_ms']:9.1f} "
+                f"{r['p99_ms']:9.1f} {100 * r['error_rate']:7.2f} {r['rss']['peak_total_mib']:9.1f}")
+        was = (baseline or {}).get(_key(r))
+        if was:
+            line += (f"   vs baseline: rps {r['throughput_rps'] / max(was['throughput_rps'], 1e-9):4.2f}x,"
+                     f" p99 {r['p99_ms'] / max(was['p99_ms'], 1e-9):4.2f}x")
+        print(line)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Load-test /parse end to end across worker configurations.")
+    ap.add_argument("--workers", default="1,2", help="comma-separated uvicorn worker counts")
+    ap.add_argument("--modes", default="thread,process", help="comma-separated RESUME_EXEC_MODE values")
+    ap.add_argument("--concurrency", type=int, default=8, help="closed-loop clients (or sender threads with --rps)")
+    ap.add_argument("--rps", type=float, default=0.0, help="fixed request rate instead of a closed loop")
+    ap.add_argument("--duration", type=float, default=20.0, help="seconds of measured load per configuration")
+    ap.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before each run")
+    ap.add_argument("--mix", default="txt=0.4,docx=0.3,pdf=0.3", help="traffic mix by format")
+    ap.add_argument("--distinct", type=int, default=24, help="distinct documents per format")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--port", type=int, default=18080)
+    ap.add_argument("--api-key", default=os.getenv("RESUME_API_KEY", "dev"))
+    ap.add_argument("--env", action="append", default=[], help="extra server environment, KEY=VALUE (repeatable)")
+    ap.add_argument("--save", help="write the report as JSON")
+    ap.add_argument("--compare", help="earlier --save report to compare against (same machine)")
+    args = ap.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    payloads = build_payloads(mix, args.distinct, args.seed)
+    reports = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+            for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+                print(f"running workers={workers} mode={mode} ...", file=sys.stderr)
+                reports.append(run_config(workers, mode, args, payloads, mix, args.port, workdir))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = {_key(r): r for r in json.load(f)["configs"]}
+    load = f"rps={args.rps:g}" if args.rps else f"concurrency={args.concurrency}"
+    print(f"{load}, duration={args.duration:g}s, mix={args.mix}, cpus={os.cpu_count()}")
+    print_table(reports, baseline)
+    if args.save:
+        doc = {
+            "meta": {"python": platform.python_version(), "machine": platform.machine(),
+                     "platform": platform.platform(), "cpus": os.cpu_count(), "load": load,
+                     "duration": args.duration, "mix": mix, "seed": args.seed},
+            "configs": reports,
+        }
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
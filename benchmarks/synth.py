@@ -0,0 +1,168 @@
+# benchmarks/synth.py
+# Deterministic synthetic resumes (TXT/DOCX/PDF) for benchmarking parser_core.
+import io
+import os
+import random
+import sys
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_sets import CANONICAL_SKILLS, LANGUAGES  # noqa: E402
+
+FIRST = ["Asha", "Rahul", "Maria", "John", "Wei", "Fatima", "Carlos", "Priya", "Liam", "Sofia"]
+LAST = ["Sharma", "Fernandes", "Smith", "Chen", "Khan", "Garcia", "Iyer", "Brown", "Rossi", "Nair"]
+CITIES = ["Bengaluru, Karnataka, India", "Pune, Maharashtra, India", "Austin, TX, USA", "Berlin, Germany"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Tech"]
+TITLES = ["Software Engineer", "Senior Engineer", "Data Scientist", "Backend Developer", "SRE", "Tech Lead"]
+SCHOOLS = ["IIT Bombay", "University of Pune", "MIT", "TU Munich", "Anna University", "Stanford University"]
+DEGREES = ["B.Tech in Computer Science", "M.Tech in Data Science", "MS in Software Engineering", "Bachelor of Engineering in IT"]
+VERBS = ["Built", "Designed", "Migrated", "Optimized", "Led", "Automated", "Scaled", "Refactored"]
+NOUNS = ["pipelines", "services", "dashboards", "APIs", "data models", "deployments", "test suites"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# (experience entries, bullets per entry, projects, filler paragraphs)
+SIZES = {
+    "small": (2, 3, 1, 0),
+    "medium": (5, 5, 3, 2),
+    "large": (12, 8, 8, 20),
+}
+LAYOUTS = ("standard", "reordered", "no_headers")
+
+
+def _bullet(rng: random.Random) -> str:
+    skills = rng.sample(CANONICAL_SKILLS, 2)
+    return f"- {rng.choice(VERBS)} {rng.choice(NOUNS)} with {skills[0]} and {skills[1]} for {rng.randint(2, 90)}% gains"
+
+
+def resume_lines(seed: int, size: str = "medium", layout: str = "standard") -> List[str]:
+    """Lines of one synthetic resume; the same (seed, size, layout) always yields the same text."""
+    rng = random.Random(f"{seed}:{size}:{layout}")
+    n_exp, n_bullets, n_proj, n_filler = SIZES[size]
+    first, last = rng.choice(FIRST), rng.choice(LAST)
+    header = [
+        f"{first} {last}",
+        rng.choice(CITIES),
+        f"{first.lower()}.{last.lower()}@example.com | +91 98{rng.randint(10000000, 99999999)} | "
+        f"https://linkedin.com/in/{first.lower()}{last.lower()} | github.com/{first.lower()}{seed}",
+        f"Engineer with {rng.randint(1, 15)} years of experience. Speaks {', '.join(rng.sample(LANGUAGES, 2))}.",
+    ]
+    header += [" ".join(rng.choice(NOUNS + VERBS) for _ in range(18)) for _ in range(n_filler)]
+
+    exp = ["Experience"]
+    year = 2024
+    for _ in range(n_exp):
+        start = year - rng.randint(1, 4)
+        exp.append(f"{rng.choice(COMPANIES)} - {rng.choice(TITLES)}")
+        exp.append(f"{rng.choice(MONTHS)} {start} - {rng.choice(MONTHS)} {year}")
+        exp += [_bullet(rng) for _ in range(n_bullets)]
+        exp.append("")
+        year = start
+
+    edu = ["Education"]
+    for _ in range(max(1, n_exp // 4)):
+        edu.append(f"{rng.choice(DEGREES)} - {rng.choice(SCHOOLS)}")
+        edu.append(f"{year - 4} to {year}")
+        edu.append(f"GPA: {rng.randint(6, 9)}.{rng.randint(0, 9)}/10")
+        year -= 4
+
+    proj = ["Projects"]
+    for i in range(n_proj):
+        proj.append(f"Project{i} - {rng.choice(VERBS).lower()} {rng.choice(NOUNS)} https://github.com/x/p{i}")
+        proj += [_bullet(rng) for _ in range(3)]
+
+    certs = ["Certifications", f"AWS Solutions Architect - Amazon ({rng.randint(2015, 2024)})"]
+
+    body = [exp, edu, proj, certs]
+    if layout == "reordered":
+        rng.shuffle(body)
+    elif layout == "no_headers":
+        body = [b[1:] for b in body]
+    lines = list(header)
+    for block in body:
+        lines.append("")
+        lines += block
+    return lines
+
+
+def to_txt(lines: List[str]) -> bytes:
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def to_docx(lines: List[str]) -> bytes:
+    import docx  # python-docx; already a service dependency
+
+    d = docx.Document()
+    for line in lines:
+        d.add_paragraph(line)
+    buf = io.BytesIO()
+    d.save(buf)
+    return buf.getvalue()
+
+
+def _pdf_escape(s: str) -> str:
+    s = s.encode("latin-1", "replace").decode("latin-1")
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def to_pdf(lines: List[str], lines_per_page: int = 50) -> bytes:
+    """Minimal multi-page PDF with Helvetica text; no third-party writer needed."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objs: List[bytes] = []
+    # 1: catalog, 2: pages, 3: font, then (page, content) pairs
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages)))
+    objs.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objs.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objs.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, page in enumerate(pages):
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 790 Td"]
+        ops += [f"({_pdf_escape(l)}) Tj T*" for l in page]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objs.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objs.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for n, body in enumerate(objs, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % n + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1))
+    for off in offsets:
+        out.write(b"%010d 00000 n \n" % off)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref))
+    return out.getvalue()
+
+
+FORMATS = {"txt": to_txt, "docx": to_docx, "pdf": to_pdf}
+
+
+def corpus(seed: int = 0, formats=("txt", "docx", "pdf")) -> Dict[str, Dict[str, bytes]]:
+    """{case_name: {filename: bytes}} for every size x layout, one file per format."""
+    out: Dict[str, Dict[str, bytes]] = {}
+    for size in SIZES:
+        for layout in LAYOUTS:
+            lines = resume_lines(seed, size, layout)
+            out[f"{size}-{layout}"] = {f"resume.{fmt}": FORMATS[fmt](lines) for fmt in formats}
+    return out
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Write the synthetic resume corpus to a directory.")
+    ap.add_argument("outdir")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--count", type=int, default=1, help="resumes per size/layout/format")
+    args = ap.parse_args()
+    for k in range(args.count):
+        for case, files in corpus(args.seed + k).items():
+            for fname, data in files.items():
+                path = os.path.join(args.outdir, f"{case}-{args.seed + k}-{fname}")
+                os.makedirs(args.outdir, exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(data)
@@ -0,0 +1,519 @@
+# candidate_store.py
+# Persistent inverted index of parse results for boolean candidate search.
+#
+#   python candidate_store.py load store.db out/                    # ingest.py JSONL output
+#   python candidate_store.py query store.db 'Kafka AND (Go OR Java) AND loc:bengaluru AND end>=2022'
+#
+# SQLite holds one row per candidate plus one posting list (doc ids) per term. The
+# posting lists and the start/end year columns are kept in memory, and a query is
+# answered by combining them as boolean masks; documents are never scanned.
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+import skill_taxonomy
+from skill_sets import LANGUAGES
+
+PRESENT = 9999  # end year of an ongoing role, so "end>=2022" includes it
+
+_LANGUAGES = {l.lower() for l in LANGUAGES}
+_WORD_RE = re.compile(r"[^\W_]+")
+_YEAR_RE = re.compile(r"(?:19|20)\d{2}")
+_TOKEN_RE = re.compile(
+    r'\s*(?:(?P<paren>[()])'
+    r'|(?P<field>[a-z_]+)\s*(?P<op>>=|<=|>|<|=)\s*(?P<year>\w+)'
+    r'|(?P<prefix>[a-z_]+):(?:"(?P<qvalue>[^"]*)"|(?P<value>[^\s()"]+))'
+    r'|"(?P<phrase>[^"]*)"'
+    r'|(?P<word>[^\s()"]+))',
+    re.I,
+)
+_PREFIXES = {"skill": "skill", "lang": "lang", "language": "lang", "link": "link", "loc": "loc", "location": "loc"}
+_RANGE_FIELDS = ("start", "end")
+MAX_QUERY_LENGTH = 2000
+MAX_QUERY_DEPTH = 32  # nested parentheses and NOTs
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+def location_tokens(location: str) -> List[str]:
+    return [t for t in _WORD_RE.findall(location.lower()) if len(t) > 1]
+
+
+def _year(value: Optional[str]) -> int:
+    if not value:
+        return 0
+    if value.strip().lower() in ("present", "current", "now"):
+        return PRESENT
+    m = _YEAR_RE.search(value)
+    return int(m.group(0)) if m else 0
+
+
+def candidate_terms(parsed: Dict[str, Any]) -> List[str]:
+    terms = {"skill:" + s.lower() for s in parsed.get("skills") or []}
+    terms.update("lang:" + l.lower() for l in parsed.get("languages") or [])
+    terms.update("link:" + (l.get("type") or "other").lower() for l in parsed.get("links") or [])
+    terms.update("loc:" + t for t in location_tokens(parsed.get("location") or ""))
+    return sorted(terms)
+
+
+def experience_years(parsed: Dict[str, Any]) -> Tuple[int, int]:
+    """(earliest start, latest end) over all experience entries; 0 when unknown."""
+    starts = [y for y in (_year(e.get("start_date")) for e in parsed.get("experience") or []) if y]
+    ends = [y for y in (_year(e.get("end_date")) for e in parsed.get("experience") or []) if y]
+    return (min(starts) if starts else 0, max(ends) if ends else 0)
+
+
+def _summary(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: parsed.get(k) for k in ("candidate_name", "email", "location", "skills", "languages")}
+
+
+# ---- Query parsing ----
+# expr := and ("OR" and)* ; and := not (["AND"] not)* ; not := "NOT" not | "(" expr ")" | term
+
+def _tokenize(query: str) -> List[re.Match]:
+    tokens = []
+    pos = 0
+    query = query.strip()
+    while pos < len(query):
+        m = _TOKEN_RE.match(query, pos)
+        if not m or m.end() == pos:
+            raise QuerySyntaxError(f"Unexpected input at position {pos}: {query[pos:pos + 20]!r}")
+        tokens.append(m)
+        pos = m.end()
+        while pos < len(query) and query[pos].isspace():
+            pos += 1
+    return tokens
+
+
+def _keyword(tok: Optional[re.Match]) -> Optional[str]:
+    if tok is not None and tok.group("word") and tok.group("word").upper() in ("AND", "OR", "NOT"):
+        return tok.group("word").upper()
+    return None
+
+
+def _term_node(tok: re.Match) -> Tuple:
+    if tok.group("field"):
+        field = tok.group("field").lower()
+        if field not in _RANGE_FIELDS:
+            raise QuerySyntaxError(f"Unknown range field {field!r}; use start or end.")
+        raw = tok.group("year").lower()
+        year = PRESENT if raw in ("present", "current", "now") else int(raw) if raw.isdigit() else None
+        if year is None:
+            raise QuerySyntaxError(f"Bad year {tok.group('year')!r}.")
+        return ("range", field, tok.group("op"), year)
+    if tok.group("prefix"):
+        prefix = _PREFIXES.get(tok.group("prefix").lower())
+        if prefix is None:
+            raise QuerySyntaxError(f"Unknown field {tok.group('prefix')!r}.")
+        value = (tok.group("qvalue") if tok.group("qvalue") is not None else tok.group("value")).lower()
+        if prefix == "loc":
+            return ("all", ["loc:" + t for t in location_tokens(value)])
+        if prefix == "skill":
+            value = (skill_taxonomy.active().lookup(value) or value).lower()
+        return ("all", [f"{prefix}:{value.strip()}"])
+    # Bare words and phrases: a skill, else a spoken language, else a location
+    value = (tok.group("phrase") if tok.group("phrase") is not None else tok.group("word")).lower().strip()
+    skill = skill_taxonomy.active().lookup(value, fuzzy=False)
+    if skill is not None:
+        return ("all", ["skill:" + skill.lower()])
+    if value in _LANGUAGES:
+        return ("all", ["lang:" + value])
+    return ("all", ["loc:" + t for t in location_tokens(value)])
+
+
+def parse_query(query: str) -> Tuple:
+    if len(query) > MAX_QUERY_LENGTH:
+        raise QuerySyntaxError(f"Query longer than {MAX_QUERY_LENGTH} characters.")
+    tokens = _tokenize(query)
+    if not tokens:
+        raise QuerySyntaxError("Empty query.")
+    pos = 0
+    depth = 0
+
+    def peek() -> Optional[re.Match]:
+        return tokens[pos] if pos < len(tokens) else None
+
+    def parse_or() -> Tuple:
+        nonlocal pos
+        parts = [parse_and()]
+        while _keyword(peek()) == "OR":
+            pos += 1
+            parts.append(parse_and())
+        return parts[0] if len(parts) == 1 else ("or", parts)
+
+    def parse_and() -> Tuple:
+        nonlocal pos
+        parts = [parse_not()]
+        while True:
+            tok = peek()
+            kw = _keyword(tok)
+            if tok is None or kw == "OR" or tok.group("paren") == ")":
+                break
+            if kw == "AND":
+                pos += 1
+            parts.append(parse_not())
+        return parts[0] if len(parts) == 1 else ("and", parts)
+
+    def nested(parse):
+        # Each NOT and "(" recurses; bound it well below Python's recursion limit
+        nonlocal depth
+        depth += 1
+        if depth > MAX_QUERY_DEPTH:
+            raise QuerySyntaxError(f"Query nests deeper than {MAX_QUERY_DEPTH} levels.")
+        try:
+            return parse()
+        finally:
+            depth -= 1
+
+    def parse_not() -> Tuple:
+        nonlocal pos
+        tok = peek()
+        if tok is None:
+            raise QuerySyntaxError("Query ends unexpectedly.")
+        pos += 1
+        kw = _keyword(tok)
+        if kw == "NOT":
+            return ("not", nested(parse_not))
+        if kw is not None:
+            raise QuerySyntaxError(f"Unexpected {kw}.")
+        if tok.group("paren") == "(":
+            node = nested(parse_or)
+            if peek() is None or peek().group("paren") != ")":
+                raise QuerySyntaxError("Missing ')'.")
+            pos += 1
+            return node
+        if tok.group("paren") == ")":
+            raise QuerySyntaxError("Unexpected ')'.")
+        return _term_node(tok)
+
+    node = parse_or()
+    if pos != len(tokens):
+        raise QuerySyntaxError(f"Unexpected {tokens[pos].group(0).strip()!r}.")
+    return node
+
+
+class CandidateStore:
+    """Candidates keyed by id, searchable by skill/language/link/location terms and year ranges.
+
+    Doc ids are never reused: re-adding an id inserts a new doc and retires the
+    old one, so posting lists are append-only and dead docs are masked out.
+    Dirty posting lists are written back at most every FLUSH_EVERY seconds; on
+    load, candidates whose postings were never flushed are re-indexed from
+    their rows.
+
+    Several processes may write one file (API workers, `ingest.py --store`):
+    a flush merges its posting lists into the stored ones under the write
+    lock, so nobody's doc ids are lost. Each process only searches the
+    candidates that were stored when it opened the file plus those it added.
+    """
+
+    FLUSH_EVERY = 5.0
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("PRAGMA busy_timeout = 5000")  # other writers of the same file
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS candidates ("
+            " doc INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT UNIQUE NOT NULL,"
+            " start_year INTEGER NOT NULL, end_year INTEGER NOT NULL,"
+            " terms TEXT NOT NULL, summary TEXT NOT NULL, added REAL NOT NULL,"
+            " indexed INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS postings (term TEXT PRIMARY KEY, docs BLOB NOT NULL)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        if "indexed" not in {row[1] for row in self._db.execute("PRAGMA table_info(candidates)")}:
+            # Older files tracked flushed docs with one watermark
+            row = self._db.execute("SELECT value FROM store_meta WHERE key = 'indexed_upto'").fetchone()
+            self._db.execute("ALTER TABLE candidates ADD COLUMN indexed INTEGER NOT NULL DEFAULT 0")
+            self._db.execute("UPDATE candidates SET indexed = 1 WHERE doc <= ?", (row[0] if row else 0,))
+        self._postings: Dict[str, array] = {}
+        self._dirty: Set[str] = set()
+        self._unflushed: List[int] = []  # docs whose postings are only in memory
+        self._live = np.zeros(1024, dtype=bool)
+        self._start = np.zeros(1024, dtype=np.int16)
+        self._end = np.zeros(1024, dtype=np.int16)
+        self._next_doc = 1
+        self._count = 0
+        self._last_flush = time.monotonic()
+        self._load()
+
+    @classmethod
+    def from_env(cls) -> Optional["CandidateStore"]:
+        """RESUME_STORE_PATH enables the store; unset means parse results aren't kept."""
+        path = os.getenv("RESUME_STORE_PATH")
+        return cls(path) if path else None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _load(self) -> None:
+        # One read transaction, so postings, rows and the doc counter agree
+        self._db.execute("BEGIN")
+        try:
+            for term, blob in self._db.execute("SELECT term, docs FROM postings"):
+                docs = array("i")
+                docs.frombytes(blob)
+                self._postings[term] = docs
+            row = self._db.execute("SELECT seq FROM sqlite_sequence WHERE name = 'candidates'").fetchone()
+            self._next_doc = (row[0] if row else 0) + 1
+            self._grow(self._next_doc)
+            rows = self._db.execute("SELECT doc, start_year, end_year, terms, indexed FROM candidates").fetchall()
+        finally:
+            self._db.execute("COMMIT")
+        for doc, start, end, terms, indexed in rows:
+            self._live[doc], self._start[doc], self._end[doc] = True, start, end
+            self._count += 1
+            if not indexed:
+                for term in json.loads(terms):
+                    self._postings.setdefault(term, array("i")).append(doc)
+                    self._dirty.add(term)
+                self._unflushed.append(doc)
+
+    def _grow(self, need: int) -> None:
+        cap = len(self._live)
+        if need <= cap:
+            return
+        while cap < need:
+            cap *= 2
+        for name in ("_live", "_start", "_end"):
+            old = getattr(self, name)
+            new = np.zeros(cap, dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    def add(self, candidate_id: str, parsed: Dict[str, Any]) -> bool:
+        """Insert or replace one parse result; returns False if it was already stored unchanged."""
+        return self.add_many([(candidate_id, parsed)]) == 1
+
+    def add_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Upsert parse results in one transaction; returns how many were new or changed."""
+        rows = []
+        for candidate_id, parsed in items:
+            terms = candidate_terms(parsed)
+            start, end = experience_years(parsed)
+            rows.append((candidate_id, start, end, json.dumps(terms), json.dumps(_summary(parsed))))
+        changed = []
+        retired = []
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for row in rows:
+                    old = self._db.execute(
+                        "SELECT doc, start_year, end_year, terms, summary FROM candidates WHERE id = ?", (row[0],)
+                    ).fetchone()
+                    if old is not None:
+                        if tuple(old[1:]) == row[1:]:
+                            continue
+                        self._db.execute("DELETE FROM candidates WHERE doc = ?", (old[0],))
+                        retired.append(old[0])
+                    cur = self._db.execute(
+                        "INSERT INTO candidates (id, start_year, end_year, terms, summary, added)"
+                        " VALUES (?, ?, ?, ?, ?, ?)", row + (now,)
+                    )
+                    changed.append((cur.lastrowid, row))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            for doc in retired:
+                self._live[doc] = False
+                self._count -= 1
+            for doc, (_, start, end, terms, _) in changed:
+                self._grow(doc + 1)
+                self._live[doc], self._start[doc], self._end[doc] = True, start, end
+                self._count += 1
+                for term in json.loads(terms):
+                    self._postings.setdefault(term, array("i")).append(doc)
+                    self._dirty.add(term)
+                self._unflushed.append(doc)
+                self._next_doc = max(self._next_doc, doc + 1)
+            if time.monotonic() - self._last_flush >= self.FLUSH_EVERY:
+                self._flush()
+        return len(changed)
+
+    def remove(self, candidate_id: str) -> bool:
+        with self._lock:
+            row = self._db.execute("SELECT doc FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+            if row is None:
+                return False
+            self._db.execute("DELETE FROM candidates WHERE doc = ?", (row[0],))
+            self._live[row[0]] = False
+            self._count -= 1
+            return True
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._dirty and not self._unflushed:
+            return
+        # IMMEDIATE takes the write lock before reading, so a concurrent flush can't slip in between
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            rows = []
+            for term in self._dirty:
+                docs = np.frombuffer(self._postings[term], dtype=np.int32)
+                stored = self._db.execute("SELECT docs FROM postings WHERE term = ?", (term,)).fetchone()
+                if stored is not None:
+                    docs = np.union1d(np.frombuffer(stored[0], dtype=np.int32), docs)
+                rows.append((term, docs.astype(np.int32).tobytes()))
+            self._db.executemany("INSERT OR REPLACE INTO postings (term, docs) VALUES (?, ?)", rows)
+            self._db.executemany("UPDATE candidates SET indexed = 1 WHERE doc = ?", ((d,) for d in self._unflushed))
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._dirty.clear()
+        self._unflushed.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+
+    def _mask(self, node: Tuple, n: int) -> np.ndarray:
+        kind = node[0]
+        if kind == "all":
+            mask = np.ones(n, dtype=bool) if node[1] else np.zeros(n, dtype=bool)
+            for term in node[1]:
+                docs = self._postings.get(term)
+                hit = np.zeros(n, dtype=bool)
+                if docs:
+                    hit[np.frombuffer(docs, dtype=np.int32)] = True
+                mask &= hit
+            return mask
+        if kind == "range":
+            _, field, op, year = node
+            col = (self._start if field == "start" else self._end)[:n]
+            known = col != 0
+            if op == ">=":
+                return known & (col >= year)
+            if op == "<=":
+                return known & (col <= year)
+            if op == ">":
+                return known & (col > year)
+            if op == "<":
+                return known & (col < year)
+            return col == year
+        if kind == "not":
+            return ~self._mask(node[1], n)
+        masks = [self._mask(child, n) for child in node[1]]
+        out = masks[0]
+        for m in masks[1:]:
+            if kind == "and":
+                out &= m
+            else:
+                out |= m
+        return out
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """Matching candidates, most recently added first. Raises QuerySyntaxError on a bad query."""
+        node = parse_query(query)
+        with self._lock:
+            n = self._next_doc
+            mask = self._mask(node, n) & self._live[:n]
+        docs = np.flatnonzero(mask)[::-1]
+        page = [int(d) for d in docs[offset:offset + limit]]
+        results = []
+        if page:
+            marks = ",".join("?" * len(page))
+            with self._lock:
+                rows = dict(self._db.execute(
+                    f"SELECT doc, json_object('id', id, 'start_year', start_year, 'end_year', end_year,"
+                    f" 'summary', json(summary)) FROM candidates WHERE doc IN ({marks})", page,
+                ).fetchall())
+            results = [json.loads(rows[d]) for d in page if d in rows]
+        return {"total": int(len(docs)), "results": results}
+
+    def iter_skills(self) -> Iterator[Tuple[str, List[str]]]:
+        """(id, skills) of every stored candidate, for seeding the match index."""
+        with self._lock:
+            rows = self._db.execute("SELECT id, summary FROM candidates").fetchall()
+        for candidate_id, summary in rows:
+            yield candidate_id, json.loads(summary).get("skills") or []
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "candidates": self._count,
+                "docs": self._next_doc - 1,
+                "terms": len(self._postings),
+                "postings": sum(len(p) for p in self._postings.values()),
+                "dirty_terms": len(self._dirty),
+            }
+
+
+def _iter_ingest_records(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    names = sorted(os.path.join(path, n) for n in os.listdir(path) if n.endswith(".jsonl")) \
+        if os.path.isdir(path) else [path]
+    for name in names:
+        with open(name, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("parsed") and record.get("sha256"):
+                    yield record["sha256"], record["parsed"]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Load or query the candidate store.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    load = sub.add_parser("load", help="index ingest.py JSONL output (a file or shard directory)")
+    load.add_argument("store")
+    load.add_argument("source")
+    load.add_argument("--batch", type=int, default=1000)
+    query = sub.add_parser("query", help="run a boolean query")
+    query.add_argument("store")
+    query.add_argument("query")
+    query.add_argument("--limit", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    store = CandidateStore(args.store)
+    try:
+        if args.cmd == "load":
+            t0 = time.perf_counter()
+            changed = 0
+            batch: List[Tuple[str, Dict[str, Any]]] = []
+            for item in _iter_ingest_records(args.source):
+                batch.append(item)
+                if len(batch) >= args.batch:
+                    changed += store.add_many(batch)
+                    batch = []
+            changed += store.add_many(batch)
+            print(f"indexed {changed} candidates ({len(store)} total) in {time.perf_counter() - t0:.1f}s",
+                  file=sys.stderr)
+        else:
+            t0 = time.perf_counter()
+            out = store.search(args.query, args.limit)
+            out["took_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+            print(json.dumps(out, indent=2))
+    except QuerySyntaxError as e:
+        print(f"bad query: {e}", file=sys.stderr)
+        return 2
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
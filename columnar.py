@@ -0,0 +1,267 @@
+# columnar.py
+# Parse results as Arrow/Parquet tables for analytics.
+#
+#   python columnar.py out/ -o export/                  # ingest.py JSONL output -> export/*.parquet
+#   python columnar.py out/ -o export/ --format arrow   # Arrow IPC streams instead
+#
+# One row per document in `documents`, plus child tables (experience, education,
+# projects, certifications, links) keyed by doc_hash and ordered by `position`.
+# Skill/technology/language columns are dictionary-encoded, so they load as
+# pandas categoricals. Each table is written in row groups of at most
+# `row_group_size` rows; only the current group is held in memory.
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from candidate_store import _iter_ingest_records
+
+# Optional import, deferred to the first export (pyarrow is slow to import and
+# most processes never export): without it the API still runs.
+pa = pq = None
+
+FORMATS = ("parquet", "arrow")
+ROW_GROUP_SIZE = 50_000
+
+# Column kinds: str, cat (dictionary string), int, bool, float, list (of str), list_cat
+_CHILD_KEY = [("doc_hash", "str"), ("position", "int")]
+TABLES: Dict[str, List[Tuple[str, str]]] = {
+    "documents": [
+        ("doc_hash", "str"), ("candidate_name", "str"), ("email", "str"), ("phone", "str"),
+        ("location", "str"), ("detected_language", "cat"), ("summary", "str"),
+        ("skills", "list_cat"), ("skill_groups", "list_cat"), ("languages", "list_cat"),
+        ("experience_count", "int"), ("education_count", "int"), ("projects_count", "int"),
+        ("truncated", "bool"), ("truncation_reason", "cat"),
+        ("duplicate_of", "str"), ("duplicate_similarity", "float"),
+    ],
+    "experience": _CHILD_KEY + [
+        ("title", "str"), ("company", "str"), ("start_date", "str"), ("end_date", "str"),
+        ("location", "str"), ("bullets", "list"), ("technologies", "list_cat"),
+    ],
+    "education": _CHILD_KEY + [
+        ("institution", "str"), ("degree", "str"), ("field", "str"), ("start_date", "str"),
+        ("end_date", "str"), ("gpa", "str"), ("location", "str"), ("highlights", "list"),
+    ],
+    "projects": _CHILD_KEY + [
+        ("name", "str"), ("description", "str"), ("bullets", "list"), ("technologies", "list_cat"), ("link", "str"),
+    ],
+    "certifications": _CHILD_KEY + [
+        ("name", "str"), ("issuer", "str"), ("date", "str"), ("license", "str"), ("url", "str"),
+    ],
+    "links": _CHILD_KEY + [("type", "cat"), ("url", "str")],
+}
+
+
+class ExportUnavailable(RuntimeError):
+    pass
+
+
+def available() -> bool:
+    global pa, pq
+    if pa is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except Exception:
+            return False
+        pa, pq = pyarrow, pyarrow.parquet
+    return True
+
+
+def _require_arrow() -> None:
+    if not available():
+        raise ExportUnavailable("Columnar export needs pyarrow (pip install pyarrow).")
+
+
+def _arrow_type(kind: str):
+    return {
+        "str": pa.string(), "cat": pa.dictionary(pa.int32(), pa.string()), "int": pa.int32(),
+        "bool": pa.bool_(), "float": pa.float64(), "list": pa.list_(pa.string()),
+        "list_cat": pa.list_(pa.dictionary(pa.int32(), pa.string())),
+    }[kind]
+
+
+def schema(table: str):
+    _require_arrow()
+    return pa.schema([(name, _arrow_type(kind)) for name, kind in TABLES[table]])
+
+
+def _array(kind: str, values: List[Any]):
+    if kind == "cat":
+        return pa.array(values, pa.string()).dictionary_encode()
+    if kind == "list_cat":
+        offsets = [0]
+        flat: List[str] = []
+        for v in values:
+            flat.extend(v or ())
+            offsets.append(len(flat))
+        return pa.ListArray.from_arrays(pa.array(offsets, pa.int32()), pa.array(flat, pa.string()).dictionary_encode())
+    if kind == "list":
+        return pa.array([v or [] for v in values], pa.list_(pa.string()))
+    return pa.array(values, _arrow_type(kind))
+
+
+def table_rows(doc_hash: str, parsed: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(table, row) pairs for one parse result."""
+    groups = parsed.get("skill_groups") or {}
+    yield "documents", dict(
+        parsed, doc_hash=doc_hash,
+        skill_groups=[g for g, hits in groups.items() if hits],
+        experience_count=len(parsed.get("experience") or []),
+        education_count=len(parsed.get("education") or []),
+        projects_count=len(parsed.get("projects") or []),
+    )
+    for table in ("experience", "education", "projects", "certifications", "links"):
+        for position, entry in enumerate(parsed.get(table) or []):
+            yield table, dict(entry, doc_hash=doc_hash, position=position)
+
+
+class TableWriter:
+    """Buffers rows of one table and writes them to `sink` a row group at a time."""
+
+    def __init__(self, table: str, sink: BinaryIO, fmt: str = "parquet", row_group_size: int = ROW_GROUP_SIZE):
+        _require_arrow()
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format {fmt!r}; use one of {', '.join(FORMATS)}.")
+        self.table = table
+        self.rows = 0
+        self._columns = TABLES[table]
+        self._schema = schema(table)
+        self._buf: Dict[str, List[Any]] = {name: [] for name, _ in self._columns}
+        self._pending = 0
+        self.row_group_size = row_group_size
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(sink, self._schema, compression="zstd")
+        else:
+            # The stream format (not the file format) allows a new dictionary per batch
+            self._writer = pa.ipc.new_stream(sink, self._schema)
+
+    def append(self, row: Dict[str, Any]) -> None:
+        for name, values in self._buf.items():
+            values.append(row.get(name))
+        self._pending += 1
+        if self._pending >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        arrays = [_array(kind, self._buf[name]) for name, kind in self._columns]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+        self.rows += self._pending
+        self._pending = 0
+        for values in self._buf.values():
+            values.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
+
+
+class ColumnarExporter:
+    """Writes every table to `<out_dir>/<table>.<fmt>`."""
+
+    def __init__(self, out_dir: str, fmt: str = "parquet", row_group_size: int = ROW_GROUP_SIZE):
+        _require_arrow()
+        os.makedirs(out_dir, exist_ok=True)
+        ext = "parquet" if fmt == "parquet" else "arrows"
+        self.paths = {table: os.path.join(out_dir, f"{table}.{ext}") for table in TABLES}
+        self._files = {table: pa.OSFile(self.paths[table], "wb") for table in TABLES}
+        self._writers = {table: TableWriter(table, self._files[table], fmt, row_group_size) for table in TABLES}
+
+    def add(self, doc_hash: str, parsed: Dict[str, Any]) -> None:
+        for table, row in table_rows(doc_hash, parsed):
+            self._writers[table].append(row)
+
+    def add_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        n = 0
+        for doc_hash, parsed in items:
+            self.add(doc_hash, parsed)
+            n += 1
+        return n
+
+    def close(self) -> Dict[str, int]:
+        """Finish every file; returns rows written per table."""
+        for table, writer in self._writers.items():
+            writer.close()
+            self._files[table].close()
+        return {table: w.rows for table, w in self._writers.items()}
+
+
+class _ChunkSink:
+    """Write-only file object whose contents are drained by the caller between writes."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+def iter_table_bytes(records: Iterable[Tuple[str, Dict[str, Any]]], table: str, fmt: str = "parquet",
+                     row_group_size: int = ROW_GROUP_SIZE) -> Iterator[bytes]:
+    """One table of `records` as a byte stream, a row group at a time (for HTTP downloads)."""
+    if table not in TABLES:
+        raise ValueError(f"Unknown table {table!r}; use one of {', '.join(TABLES)}.")
+    sink = _ChunkSink()
+    writer = TableWriter(table, sink, fmt, row_group_size)
+    for doc_hash, parsed in records:
+        for name, row in table_rows(doc_hash, parsed):
+            if name == table:
+                writer.append(row)
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+    writer.close()
+    yield sink.drain()
+
+
+def iter_sources(paths: Iterable[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(sha256, parsed) from ingest.py JSONL files or shard directories."""
+    for path in paths:
+        yield from _iter_ingest_records(path)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Export ingest.py JSONL output as Parquet/Arrow tables.")
+    ap.add_argument("sources", nargs="+", help="JSONL files or shard directories")
+    ap.add_argument("-o", "--output", required=True, help="directory for <table>.parquet files")
+    ap.add_argument("--format", choices=FORMATS, default="parquet")
+    ap.add_argument("--row-group-size", type=int, default=ROW_GROUP_SIZE)
+    args = ap.parse_args(argv)
+
+    try:
+        exporter = ColumnarExporter(args.output, args.format, args.row_group_size)
+    except ExportUnavailable as e:
+        print(e, file=sys.stderr)
+        return 2
+    t0 = time.perf_counter()
+    n = exporter.add_many(iter_sources(args.sources))
+    rows = exporter.close()
+    print(json.dumps({"documents": n, "rows": rows, "seconds": round(time.perf_counter() - t0, 2)}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+# dedup.py
+# Near-duplicate detection on extracted resume text: word-shingle MinHash
+# signatures in a banded LSH index, so a lookup only compares against documents
+# that share a band instead of the whole corpus.
+#
+#   python dedup.py uploads/ -o clusters.json     # cluster an existing corpus
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 16          # 16 bands x 8 rows: pairs above ~0.7 Jaccard almost always share a band
+ROWS = NUM_PERM // BANDS
+SHINGLE = 5
+
+_WORD_RE = re.compile(r"\w+")
+_PRIME = np.uint64((1 << 61) - 1)
+_MASK = np.uint64(0xFFFFFFFF)
+# Fixed seed: signatures must be comparable across processes and restarts
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64).reshape(-1, 1)
+_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64).reshape(-1, 1)
+
+
+class Fingerprint(NamedTuple):
+    exact: bytes            # hash of the normalized word sequence
+    signature: np.ndarray   # NUM_PERM uint32 MinHash values
+
+
+def fingerprint(text: str) -> Optional[Fingerprint]:
+    """MinHash of lowercased word 5-shingles; None for text with no words."""
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return None
+    exact = hashlib.blake2b(" ".join(words).encode("utf-8"), digest_size=16).digest()
+    if len(words) < SHINGLE:
+        shingles = {zlib.crc32(" ".join(words).encode("utf-8"))}
+    else:
+        shingles = {zlib.crc32(" ".join(words[i:i + SHINGLE]).encode("utf-8"))
+                    for i in range(len(words) - SHINGLE + 1)}
+    h = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+    # a*x + b stays below 2**64 because a, b and x are all 32-bit
+    sig = ((_A * h + _B) % _PRIME & _MASK).min(axis=1).astype(np.uint32)
+    return Fingerprint(exact, sig)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+class DedupIndex:
+    """Exact-text and MinHash/LSH lookup of previously seen documents.
+
+    `path` persists fingerprints to SQLite; the band buckets are rebuilt in
+    memory on open. At most `max_docs` documents are kept (0 = no limit): the
+    least recently matched or added ones are evicted first, from the file too.
+    """
+
+    def __init__(self, threshold: float = 0.85, path: Optional[str] = None, max_docs: int = 100_000):
+        self.threshold = threshold
+        self.max_docs = max_docs
+        self._lock = threading.Lock()
+        self._exact: Dict[bytes, str] = {}
+        self._docs: "OrderedDict[str, Fingerprint]" = OrderedDict()
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(BANDS)]
+        self._counters = {"lookups": 0, "exact": 0, "near": 0, "evicted": 0}
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprints (id TEXT PRIMARY KEY, exact BLOB NOT NULL, sig BLOB NOT NULL)"
+            )
+            rows = self._db.execute("SELECT id, exact, sig FROM fingerprints ORDER BY rowid").fetchall()
+            for doc_id, exact, sig in rows:
+                self._index(doc_id, Fingerprint(bytes(exact), np.frombuffer(sig, dtype=np.uint32)))
+
+    @classmethod
+    def from_env(cls) -> Optional["DedupIndex"]:
+        if os.getenv("RESUME_DEDUP", "1") == "0":
+            return None
+        return cls(
+            threshold=float(os.getenv("RESUME_DEDUP_THRESHOLD", "0.85")),
+            path=os.getenv("RESUME_DEDUP_PATH") or None,
+            max_docs=int(os.getenv("RESUME_DEDUP_MAX_DOCS", "100000")),
+        )
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _bands(self, sig: np.ndarray) -> List[bytes]:
+        return [sig[i * ROWS:(i + 1) * ROWS].tobytes() for i in range(BANDS)]
+
+    def _index(self, doc_id: str, fp: Fingerprint) -> None:
+        self._exact.setdefault(fp.exact, doc_id)
+        self._docs[doc_id] = fp
+        for band, key in zip(self._buckets, self._bands(fp.signature)):
+            band.setdefault(key, []).append(doc_id)
+        while self.max_docs and len(self._docs) > self.max_docs:
+            self._evict()
+
+    def _evict(self) -> None:
+        doc_id, fp = self._docs.popitem(last=False)
+        if self._exact.get(fp.exact) == doc_id:
+            del self._exact[fp.exact]
+        for band, key in zip(self._buckets, self._bands(fp.signature)):
+            bucket = band[key]
+            bucket.remove(doc_id)
+            if not bucket:
+                del band[key]
+        if self._db is not None:
+            self._db.execute("DELETE FROM fingerprints WHERE id = ?", (doc_id,))
+        self._counters["evicted"] += 1
+
+    def candidates(self, fp: Fingerprint) -> List[Tuple[str, float]]:
+        """Indexed documents at or above the threshold, most similar first."""
+        seen = set()
+        out = []
+        for band, key in zip(self._buckets, self._bands(fp.signature)):
+            for doc_id in band.get(key, ()):
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                sim = similarity(fp.signature, self._docs[doc_id].signature)
+                if sim >= self.threshold:
+                    out.append((doc_id, sim))
+        out.sort(key=lambda x: -x[1])
+        return out
+
+    def find(self, fp: Fingerprint, exclude: Optional[str] = None) -> Optional[Tuple[str, float]]:
+        """Best earlier match as (id, similarity); 1.0 means the normalized text is identical."""
+        with self._lock:
+            self._counters["lookups"] += 1
+            doc_id = self._exact.get(fp.exact)
+            if doc_id is not None and doc_id != exclude:
+                self._counters["exact"] += 1
+                self._docs.move_to_end(doc_id)
+                return doc_id, 1.0
+            for doc_id, sim in self.candidates(fp):
+                if doc_id != exclude:
+                    self._counters["near"] += 1
+                    self._docs.move_to_end(doc_id)
+                    return doc_id, sim
+            return None
+
+    def add(self, doc_id: str, fp: Fingerprint) -> None:
+        with self._lock:
+            if doc_id in self._docs:
+                return
+            self._index(doc_id, fp)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR IGNORE INTO fingerprints (id, exact, sig) VALUES (?, ?, ?)",
+                    (doc_id, fp.exact, fp.signature.tobytes()),
+                )
+
+    def check(self, doc_id: str, text: str) -> Optional[Tuple[str, float]]:
+        """Look `text` up and index it unless it duplicates an earlier document."""
+        fp = fingerprint(text)
+        if fp is None:
+            return None
+        match = self.find(fp, exclude=doc_id)
+        if match is None:
+            self.add(doc_id, fp)
+        return match
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._counters)
+            out.update({"documents": len(self._docs), "max_docs": self.max_docs, "threshold": self.threshold})
+            return out
+
+
+def cluster(items: Iterable[Tuple[str, Fingerprint]], threshold: float = 0.85) -> List[List[str]]:
+    """Group documents into duplicate clusters (connected components of above-threshold pairs)."""
+    parent: Dict[str, str] = {}
+
+    def root(x: str) -> str:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    index = DedupIndex(threshold, max_docs=0)
+    for doc_id, fp in items:
+        parent[doc_id] = doc_id
+        links = [d for d, _ in index.candidates(fp)]
+        exact = index._exact.get(fp.exact)
+        if exact is not None:
+            links.append(exact)
+        for other in links:
+            a, b = root(doc_id), root(other)
+            if a != b:
+                parent[a] = b
+        index._index(doc_id, fp)
+
+    groups: Dict[str, List[str]] = {}
+    for doc_id in parent:
+        groups.setdefault(root(doc_id), []).append(doc_id)
+    return sorted((sorted(g) for g in groups.values() if len(g) > 1), key=lambda g: (-len(g), g[0]))
+
+
+def _fingerprint_file(path: str) -> Tuple[str, Optional[Tuple[bytes, bytes]], Optional[str]]:
+    from parser_core import extract_text_from_file
+
+    try:
+        with open(path, "rb") as f:
+            fp = fingerprint(extract_text_from_file(f.read(), path))
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+    return path, (fp.exact, fp.signature.tobytes()) if fp else None, None
+
+
+def main(argv=None) -> int:
+    from ingest import iter_resume_files
+
+    ap = argparse.ArgumentParser(description="Cluster exact and near-duplicate resumes in a directory.")
+    ap.add_argument("root")
+    ap.add_argument("-o", "--output", help="write clusters as JSON (default: stdout)")
+    ap.add_argument("--threshold", type=float, default=0.85, help="estimated Jaccard similarity to count as duplicate")
+    ap.add_argument("-j", "--workers", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    items: List[Tuple[str, Fingerprint]] = []
+    errors = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for path, fp, err in pool.map(_fingerprint_file, iter_resume_files(args.root), chunksize=8):
+            if err:
+                errors += 1
+                print(f"skip {path}: {err}", file=sys.stderr)
+            elif fp is not None:
+                items.append((path, Fingerprint(fp[0], np.frombuffer(fp[1], dtype=np.uint32))))
+    t1 = time.perf_counter()
+    clusters = cluster(items, args.threshold)
+    t2 = time.perf_counter()
+
+    dupes = sum(len(c) - 1 for c in clusters)
+    print(f"{len(items)} documents ({errors} errors), {len(clusters)} clusters, {dupes} redundant copies; "
+          f"fingerprint {t1 - t0:.1f}s, cluster {t2 - t1:.2f}s", file=sys.stderr)
+    out = json.dumps({"threshold": args.threshold, "clusters": clusters}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# docx_text.py
+# Streaming DOCX text extraction: reads the WordprocessingML parts straight out of
+# the ZIP with iterparse instead of building a python-docx object model.
+import io
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import IO, List, Optional
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+_P, _T, _TAB, _BR, _CR = W + "p", W + "t", W + "tab", W + "br", W + "cr"
+_TBL, _TR, _TC = W + "tbl", W + "tr", W + "tc"
+_R, _PPR = W + "r", W + "pPr"
+
+_HEADER_RE = re.compile(r"^word/header\d*\.xml$")
+_FOOTER_RE = re.compile(r"^word/footer\d*\.xml$")
+
+
+def _part_lines(stream: IO[bytes]) -> List[str]:
+    """Lines of one part in document order: one per paragraph, one per table row.
+
+    Text boxes are nested paragraphs and come out as their own lines. The
+    VML copy of a text box inside mc:Fallback is skipped so it isn't
+    duplicated. Table cells are joined with " | " so a row reads like
+    "Company | Title | 2020 - 2022". Tabs and breaks count only inside runs,
+    as in python-docx; w:tab under w:pPr/w:tabs is a tab-stop definition.
+    """
+    lines: List[str] = []
+    paragraphs: List[List[str]] = []   # open paragraphs (text boxes nest them)
+    rows: List[List[str]] = []         # open table rows
+    cells: List[List[str]] = []        # open table cells
+    fallback = 0
+    runs = 0      # open w:r (a text box's runs nest inside its anchor run)
+    props = 0     # open w:pPr
+
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == _P:
+                paragraphs.append([])
+            elif tag == _TR:
+                rows.append([])
+            elif tag == _TC:
+                cells.append([])
+            elif tag == _R:
+                runs += 1
+            elif tag == _PPR:
+                props += 1
+            elif tag == MC_FALLBACK:
+                fallback += 1
+            continue
+
+        if tag == _R:
+            runs -= 1
+        elif tag == _PPR:
+            props -= 1
+        elif tag == MC_FALLBACK:
+            fallback -= 1
+            elem.clear()
+        elif fallback:
+            if tag == _P:
+                paragraphs.pop()
+            elif tag == _TR:
+                rows.pop()
+            elif tag == _TC:
+                cells.pop()
+        elif tag == _T:
+            if paragraphs and elem.text:
+                paragraphs[-1].append(elem.text)
+        elif tag == _TAB:
+            if paragraphs and runs and not props:
+                paragraphs[-1].append("\t")
+        elif tag in (_BR, _CR):
+            if paragraphs and runs and not props:
+                paragraphs[-1].append("\n")
+        elif tag == _P:
+            text = "".join(paragraphs.pop())
+            if cells:
+                cells[-1].append(text)
+            else:
+                lines.append(text)
+            elem.clear()
+        elif tag == _TC:
+            cell = " ".join(t.strip() for t in cells.pop() if t.strip())
+            if rows:
+                rows[-1].append(cell)
+        elif tag == _TR:
+            line = " | ".join(c for c in rows.pop() if c)
+            # A nested table's row becomes text of the enclosing cell
+            if cells:
+                cells[-1].append(line)
+            else:
+                lines.append(line)
+            elem.clear()
+        elif tag == _TBL:
+            elem.clear()
+    return lines
+
+
+def extract_docx_text(content: bytes) -> str:
+    """Headers, body (tables and text boxes included), then footers, joined by newlines.
+
+    Raises zipfile.BadZipFile, KeyError or ET.ParseError on malformed input so
+    the caller can fall back to python-docx.
+    """
+    with zipfile.ZipFile(io.BytesIO(content)) as zf:
+        names = zf.namelist()
+        headers = sorted(n for n in names if _HEADER_RE.match(n))
+        footers = sorted(n for n in names if _FOOTER_RE.match(n))
+        out: List[str] = []
+        seen_parts = set()
+        for name in headers + ["word/document.xml"] + footers:
+            with zf.open(name) as f:
+                lines = _part_lines(f)
+            if name != "word/document.xml":
+                # First/even/default headers usually repeat the same contact block
+                key = tuple(lines)
+                if not any(l.strip() for l in lines) or key in seen_parts:
+                    continue
+                seen_parts.add(key)
+            out.extend(lines)
+    return "\n".join(out)
+
+
+def docx_text_or_none(content: bytes) -> Optional[str]:
+    try:
+        return extract_docx_text(content)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError):
+        return None
@@ -0,0 +1,286 @@
+# ingest.py
+# Offline bulk parsing: walk a directory of resumes and write parse results as JSONL.
+#
+#   python ingest.py uploads/ -o out/ --shard-size 50000 --checkpoint out/done.txt
+#
+# Files are hashed in the parent process (cheap) so duplicates and anything listed in
+# the checkpoint are skipped before any worker runs pdfminer. Output is written before
+# the checkpoint, so a crash can at worst repeat a record, never lose one. Only
+# successful records are checkpointed: files that errored are retried on the next
+# run (their error records stay in the earlier output).
+# --store also indexes each result into a candidate_store.py database, and
+# --parquet writes Parquet tables (see columnar.py) alongside the JSONL.
+# --stage-cache keeps per-stage outputs (see stage_cache.py): documents already in
+# it skip every stage whose code and data are unchanged, extraction included.
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, IO, Iterator, List, Optional, Set, Tuple
+
+from candidate_store import CandidateStore
+from columnar import ColumnarExporter
+import stage_cache
+from stage_cache import StageCache
+
+from parse_pool import PARSE_LIMITS
+from parser_core import ParseLimits, extract_text_from_file, parse_resume
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+STORE_BATCH = 1000
+# Same size cap as the API, but no time budget: offline output must not depend on
+# machine load (stage_cache.run drops it the same way)
+OFFLINE_LIMITS = ParseLimits(max_chars=PARSE_LIMITS.max_chars)
+
+
+def iter_resume_files(root: str) -> Iterator[str]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                yield os.path.join(dirpath, name)
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def process_file(
+    path: str, digest: str, include_text: bool = False, cached: Optional[stage_cache.Cached] = None
+) -> Dict[str, Any]:
+    """Parse one file. With `cached` (stage cache enabled), only stale stages run."""
+    timings: Dict[str, float] = {"read": 0.0, "extract": 0.0}
+    record: Dict[str, Any] = {"sha256": digest, "path": path}
+
+    def load_text() -> str:
+        t0 = time.perf_counter()
+        with open(path, "rb") as f:
+            content = f.read()
+        t1 = time.perf_counter()
+        timings["read"] = t1 - t0
+        text = extract_text_from_file(content, path)
+        timings["extract"] = time.perf_counter() - t1
+        return text
+
+    t0 = time.perf_counter()
+    try:
+        if cached is None:
+            text = load_text()
+            record["parsed"] = parse_resume(text, limits=OFFLINE_LIMITS)
+        else:
+            record["parsed"], text, record["_stages"] = stage_cache.run(cached, load_text)
+        timings["parse"] = time.perf_counter() - t0 - timings["read"] - timings["extract"]
+        if include_text:
+            record["text"] = text
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["_timings"] = timings
+    return record
+
+
+def load_checkpoint(path: Optional[str]) -> Set[str]:
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+class ShardWriter:
+    """Appends JSON lines to one file, or rolls over to out-NNNNN.jsonl shards in a directory."""
+
+    def __init__(self, output: str, shard_size: int = 0):
+        self.output = output
+        self.shard_size = shard_size
+        self._fh: Optional[IO[str]] = None
+        self._in_shard = 0
+        self._shard = 0
+        if shard_size:
+            os.makedirs(output, exist_ok=True)
+            # Resume numbering after any shards left by a previous run
+            existing = [n for n in os.listdir(output) if n.startswith("out-") and n.endswith(".jsonl")]
+            self._shard = len(existing)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if self._fh is None or (self.shard_size and self._in_shard >= self.shard_size):
+            self._open_next()
+        self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._in_shard += 1
+
+    def flush(self) -> None:
+        if self._fh is not None:
+            self._fh.flush()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def _open_next(self) -> None:
+        self.close()
+        if self.shard_size:
+            path = os.path.join(self.output, f"out-{self._shard:05d}.jsonl")
+            self._shard += 1
+        else:
+            path = self.output
+        self._fh = open(path, "a", encoding="utf-8")
+        self._in_shard = 0
+
+
+def _pending_work(root: str, done: Set[str], stats: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    seen: Set[str] = set()
+    for path in iter_resume_files(root):
+        t0 = time.perf_counter()
+        try:
+            digest = file_sha256(path)
+        except OSError as e:
+            print(f"skip {path}: {e}", file=sys.stderr)
+            continue
+        finally:
+            stats["stages"]["hash"] += time.perf_counter() - t0
+        if digest in done:
+            stats["resumed"] += 1
+        elif digest in seen:
+            stats["duplicates"] += 1
+        else:
+            seen.add(digest)
+            yield path, digest
+
+
+def ingest(
+    root: str,
+    output: str,
+    workers: Optional[int] = None,
+    shard_size: int = 0,
+    checkpoint: Optional[str] = None,
+    include_text: bool = False,
+    max_tasks_per_worker: int = 500,
+    store_path: Optional[str] = None,
+    parquet_dir: Optional[str] = None,
+    stage_cache_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    workers = workers or os.cpu_count() or 1
+    done = load_checkpoint(checkpoint)
+    stats: Dict[str, Any] = {
+        "documents": 0, "errors": 0, "resumed": 0, "duplicates": 0,
+        "stages": {"hash": 0.0, "read": 0.0, "extract": 0.0, "parse": 0.0, "write": 0.0},
+    }
+    writer = ShardWriter(output, shard_size)
+    ckpt = open(checkpoint, "a", encoding="utf-8") if checkpoint else None
+    store = CandidateStore(store_path) if store_path else None
+    to_store: List[Tuple[str, Dict[str, Any]]] = []
+    exporter = ColumnarExporter(parquet_dir) if parquet_dir else None
+    stages = StageCache(stage_cache_path) if stage_cache_path else None
+    to_stage: List[Tuple[str, Optional[str], stage_cache.Cached]] = []
+    if stages is not None:
+        stats["recomputed"] = {name: 0 for name in stage_cache.STAGE_NAMES}
+    started = time.perf_counter()
+    window = workers * 4
+
+    def _finish(record: Dict[str, Any]) -> None:
+        for stage, secs in record.pop("_timings").items():
+            stats["stages"][stage] += secs
+        fresh = record.pop("_stages", None)
+        if fresh:
+            for stage in fresh:
+                stats["recomputed"][stage] += 1
+            to_stage.append((record["sha256"], record["path"], fresh))
+            if len(to_stage) >= STORE_BATCH:
+                stages.save_many(to_stage)
+                to_stage.clear()
+        t0 = time.perf_counter()
+        writer.write(record)
+        stats["documents"] += 1
+        if "error" in record:
+            stats["errors"] += 1
+        else:
+            if exporter is not None:
+                exporter.add(record["sha256"], record["parsed"])
+            if store is not None:
+                to_store.append((record["sha256"], record["parsed"]))
+                if len(to_store) >= STORE_BATCH:
+                    store.add_many(to_store)
+                    to_store.clear()
+        if ckpt is not None and "error" not in record:
+            writer.flush()
+            ckpt.write(record["sha256"] + "\n")
+        stats["stages"]["write"] += time.perf_counter() - t0
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=max_tasks_per_worker) as pool:
+            pending = set()
+            for path, digest in _pending_work(root, done, stats):
+                cached = stages.load(digest) if stages is not None else None
+                pending.add(pool.submit(process_file, path, digest, include_text, cached))
+                if len(pending) >= window:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        _finish(fut.result())
+            for fut in pending:
+                _finish(fut.result())
+    finally:
+        writer.close()
+        if ckpt is not None:
+            ckpt.close()
+        if store is not None:
+            store.add_many(to_store)
+            store.close()
+        if exporter is not None:
+            stats["columnar_rows"] = exporter.close()
+        if stages is not None:
+            stages.save_many(to_stage)
+            stages.close()
+
+    elapsed = time.perf_counter() - started
+    stats["elapsed"] = elapsed
+    stats["docs_per_sec"] = stats["documents"] / elapsed if elapsed else 0.0
+    return stats
+
+
+def _report(stats: Dict[str, Any]) -> str:
+    n = max(stats["documents"], 1)
+    lines = [
+        f"documents: {stats['documents']} ({stats['errors']} errors), "
+        f"skipped: {stats['resumed']} from checkpoint, {stats['duplicates']} duplicates",
+        f"elapsed: {stats['elapsed']:.1f}s, throughput: {stats['docs_per_sec']:.1f} docs/sec",
+        "stage totals (worker stages summed across processes):",
+    ]
+    for stage, secs in stats["stages"].items():
+        lines.append(f"  {stage:<8} {secs:9.2f}s  {1000 * secs / n:8.2f} ms/doc")
+    if "recomputed" in stats:
+        lines.append("stage cache, documents recomputed per stage: "
+                     + ", ".join(f"{k} {v}" for k, v in stats["recomputed"].items()))
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Parse a directory of resumes (PDF/DOCX/TXT) into JSONL.")
+    ap.add_argument("root", help="directory to walk")
+    ap.add_argument("-o", "--output", required=True,
+                    help="JSONL file to append to, or a directory when --shard-size is set")
+    ap.add_argument("--shard-size", type=int, default=0, help="records per out-NNNNN.jsonl shard")
+    ap.add_argument("--checkpoint", help="file of processed content hashes; enables resume")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--include-text", action="store_true", help="also store the extracted text")
+    ap.add_argument("--store", help="also index results into this candidate store (SQLite path)")
+    ap.add_argument("--parquet", help="also write Parquet tables of the results into this directory")
+    ap.add_argument("--stage-cache", help="reuse and update per-stage outputs in this SQLite file")
+    args = ap.parse_args(argv)
+
+    stats = ingest(
+        args.root, args.output, workers=args.workers, shard_size=args.shard_size,
+        checkpoint=args.checkpoint, include_text=args.include_text, store_path=args.store,
+        parquet_dir=args.parquet, stage_cache_path=args.stage_cache,
+    )
+    print(_report(stats), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
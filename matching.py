@@ -0,0 +1,264 @@
+# matching.py
+# Batched candidate-to-job scoring. Each candidate is one uint8 row over
+# CANONICAL_SKILLS plus one row over SKILL_GROUPS; a job is scored against every
+# stored candidate with a couple of matrix products instead of a Python loop.
+# Group membership comes from the active skill taxonomy (a skill may sit in
+# several groups); group rows are rebuilt when the taxonomy changes.
+import glob
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import skill_taxonomy
+from skill_sets import CANONICAL_SKILLS, SKILL_GROUPS
+
+SKILL_INDEX = {s: i for i, s in enumerate(CANONICAL_SKILLS)}
+GROUP_NAMES = list(SKILL_GROUPS)  # a taxonomy may regroup skills but not add groups
+# Trailing group column that is always zero: ungrouped skills point at it, so
+# they never earn related-skill credit
+_NO_GROUP = len(GROUP_NAMES)
+
+_membership: Optional[Tuple[str, np.ndarray]] = None
+
+
+def group_membership(taxonomy: Optional[skill_taxonomy.Taxonomy] = None) -> Tuple[str, np.ndarray]:
+    """(taxonomy digest, skills x groups 0/1 matrix) for the active taxonomy, plus the _NO_GROUP column."""
+    global _membership
+    taxonomy = taxonomy or skill_taxonomy.active()
+    cached = _membership
+    if cached is not None and cached[0] == taxonomy.digest:
+        return cached
+    m = np.zeros((len(CANONICAL_SKILLS), len(GROUP_NAMES) + 1), dtype=np.uint8)
+    for g, name in enumerate(GROUP_NAMES):
+        for s in taxonomy.groups.get(name, ()):
+            if s in SKILL_INDEX:
+                m[SKILL_INDEX[s], g] = 1
+    _membership = (taxonomy.digest, m)
+    return _membership
+
+
+def canonical_skill(name: str, fuzzy: bool = False) -> Optional[str]:
+    """Canonical name for a spelling or alias ("k8s" -> "Kubernetes")."""
+    return skill_taxonomy.active().lookup(name, fuzzy)
+
+
+class JobSpec:
+    """Required/preferred skills resolved to columns, with one weight per column."""
+
+    def __init__(
+        self,
+        required: Iterable[str],
+        preferred: Iterable[str] = (),
+        group_weights: Optional[Dict[str, float]] = None,
+        preferred_weight: float = 0.5,
+    ):
+        self.unknown: List[str] = []
+        req = self._resolve(required)
+        pref = [s for s in self._resolve(preferred) if s not in req]
+        self.required = req
+        self.preferred = pref
+        self.skills = req + pref
+        self.cols = np.array([SKILL_INDEX[s] for s in self.skills], dtype=np.intp)
+        self.taxonomy, self.membership = group_membership()
+        # Every (skill, group) pair, grouped by skill: skill i owns group_cols[group_starts[i]:group_starts[i + 1]]
+        groups = [list(np.flatnonzero(self.membership[c])) or [_NO_GROUP] for c in self.cols]
+        self.group_cols = np.array([g for gs in groups for g in gs], dtype=np.intp)
+        self.group_starts = np.cumsum([0] + [len(gs) for gs in groups[:-1]], dtype=np.intp)
+        group_weights = group_weights or {}
+        # A skill in several weighted groups takes the largest of their weights
+        gw = np.array(
+            [max((group_weights[GROUP_NAMES[g]] for g in gs if g != _NO_GROUP and GROUP_NAMES[g] in group_weights),
+                 default=1.0) for gs in groups],
+            dtype=np.float32,
+        )
+        base = np.array([1.0] * len(req) + [preferred_weight] * len(pref), dtype=np.float32)
+        self.weights = base * gw
+
+    def _resolve(self, names: Iterable[str]) -> List[str]:
+        out: List[str] = []
+        for name in names:
+            skill = canonical_skill(name, fuzzy=True)
+            if skill is None:
+                self.unknown.append(name)
+            elif skill not in out:
+                out.append(skill)
+        return out
+
+
+class CandidateIndex:
+    """In-memory skill matrix of stored candidates, keyed by candidate id.
+
+    Rows are preallocated in doubling chunks; re-adding an id overwrites its row
+    and removing one only clears its live flag, so ids keep stable rows.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._lock = threading.Lock()
+        self._skills = np.zeros((capacity, len(CANONICAL_SKILLS)), dtype=np.uint8)
+        self._groups = np.zeros((capacity, len(GROUP_NAMES) + 1), dtype=np.uint8)
+        self._groups_taxonomy: Optional[str] = None  # digest the group rows were built with
+        self._live = np.zeros(capacity, dtype=bool)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._count = 0
+
+    @classmethod
+    def from_env(cls) -> "CandidateIndex":
+        """Load candidates from RESUME_MATCH_CORPUS: comma-separated ingest.py JSONL files or directories."""
+        index = cls()
+        for path in filter(None, (p.strip() for p in os.getenv("RESUME_MATCH_CORPUS", "").split(","))):
+            index.load_jsonl(path)
+        return index
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _grow(self, need: int) -> None:
+        cap = len(self._live)
+        if need <= cap:
+            return
+        while cap < need:
+            cap *= 2
+        extra = cap - len(self._live)
+        self._skills = np.vstack([self._skills, np.zeros((extra, self._skills.shape[1]), dtype=np.uint8)])
+        self._groups = np.vstack([self._groups, np.zeros((extra, self._groups.shape[1]), dtype=np.uint8)])
+        self._live = np.concatenate([self._live, np.zeros(extra, dtype=bool)])
+
+    def add(self, candidate_id: str, skills: Iterable[str]) -> bool:
+        """Insert or replace a candidate; returns True if the id is new."""
+        return self.add_many([(candidate_id, skills)])[0] == 1
+
+    def add_many(self, items: Iterable[Tuple[str, Iterable[str]]]) -> Tuple[int, int]:
+        """Bulk upsert; returns (added, updated)."""
+        added = updated = 0
+        digest, membership = group_membership()
+        with self._lock:
+            self._regroup(digest, membership)
+            for candidate_id, skills in items:
+                cols = []
+                for s in skills:
+                    # Parse results are already canonical; only other spellings need a lookup
+                    skill = s if s in SKILL_INDEX else canonical_skill(s)
+                    if skill is not None:
+                        cols.append(SKILL_INDEX[skill])
+                row = self._rows.get(candidate_id)
+                if row is None:
+                    row = len(self._ids)
+                    self._grow(row + 1)
+                    self._ids.append(candidate_id)
+                    self._rows[candidate_id] = row
+                    added += 1
+                else:
+                    updated += int(self._live[row])
+                    added += int(not self._live[row])
+                self._skills[row] = 0
+                self._groups[row] = 0
+                self._skills[row, cols] = 1
+                if cols:
+                    self._groups[row] = membership[cols].max(axis=0)
+                self._live[row] = True
+            self._count = int(self._live[: len(self._ids)].sum())
+        return added, updated
+
+    def _regroup(self, digest: str, membership: np.ndarray) -> None:
+        # Caller holds the lock. Group rows follow from skill rows, so a taxonomy change only costs one product.
+        if self._groups_taxonomy == digest:
+            return
+        self._groups = (np.matmul(self._skills, membership, dtype=np.uint16) > 0).astype(np.uint8)
+        self._groups_taxonomy = digest
+
+    def remove(self, candidate_id: str) -> bool:
+        with self._lock:
+            row = self._rows.get(candidate_id)
+            if row is None or not self._live[row]:
+                return False
+            self._live[row] = False
+            self._count -= 1
+            return True
+
+    def load_jsonl(self, path: str) -> int:
+        """Add every successfully parsed record from ingest.py output (a file or a shard directory)."""
+        files = sorted(glob.glob(os.path.join(path, "*.jsonl"))) if os.path.isdir(path) else [path]
+        before = len(self)
+        for name in files:
+            self.add_many(_iter_ingest_records(name))
+        return len(self) - before
+
+    def top_k(
+        self,
+        job: JobSpec,
+        k: int = 10,
+        related_credit: float = 0.25,
+        require_all: bool = False,
+        min_score: float = 0.0,
+    ) -> List[Dict[str, Any]]:
+        """Best k candidates for a job, highest score first.
+
+        A candidate earns a skill's full weight for having it, and `related_credit`
+        of it for lacking the skill but having another one from the same group.
+        Scores are normalized to [0, 1] by the job's total weight.
+        """
+        if not len(job.cols):
+            return []
+        with self._lock:
+            self._regroup(job.taxonomy, job.membership)
+            n = len(self._ids)
+            has = self._skills[:n, job.cols]
+            shares_group = self._groups[:n, job.group_cols]
+            if len(job.group_cols) > len(job.cols):  # some skill sits in several groups
+                shares_group = np.maximum.reduceat(shares_group, job.group_starts, axis=1)
+            related = shares_group & (has ^ 1)
+            live = self._live[:n].copy()
+            ids = self._ids
+        total = float(job.weights.sum())
+        if total <= 0:
+            return []
+        scores = (has.astype(np.float32) @ job.weights
+                  + related.astype(np.float32) @ (job.weights * related_credit)) / total
+        mask = live
+        n_req = len(job.required)
+        if require_all and n_req:
+            mask &= has[:, :n_req].all(axis=1)
+        if min_score > 0:
+            mask &= scores >= min_score
+        scores = np.where(mask, scores, -1.0)
+        k = min(k, int(mask.sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        results = []
+        for row in top:
+            got = has[row]
+            results.append({
+                "id": ids[row],
+                "score": round(float(scores[row]), 4),
+                "matched_required": [s for s, h in zip(job.required, got[:n_req]) if h],
+                "missing_required": [s for s, h in zip(job.required, got[:n_req]) if not h],
+                "matched_preferred": [s for s, h in zip(job.preferred, got[n_req:]) if h],
+            })
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "candidates": self._count,
+            "rows": len(self._ids),
+            "capacity": len(self._live),
+            "bytes": int(self._skills.nbytes + self._groups.nbytes + self._live.nbytes),
+        }
+
+
+def _iter_ingest_records(path: str) -> Iterator[Tuple[str, Sequence[str]]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            parsed = record.get("parsed")
+            if parsed and record.get("sha256"):
+                yield record["sha256"], parsed.get("skills") or []
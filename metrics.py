@@ -0,0 +1,92 @@
+# metrics.py
+# Prometheus metrics for the parse path. Recording is a no-op when prometheus_client
+# is missing or RESUME_METRICS=0.
+import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import prometheus_client
+    from prometheus_client.core import GaugeMetricFamily
+except Exception:
+    prometheus_client = None
+
+METRICS_ENABLED = prometheus_client is not None and os.getenv("RESUME_METRICS", "1") != "0"
+
+if METRICS_ENABLED:
+    REGISTRY = prometheus_client.CollectorRegistry()
+    STAGE_SECONDS = prometheus_client.Histogram(
+        "resume_parse_stage_seconds", "Time spent in each extraction/parsing stage.", ["stage"],
+        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+        registry=REGISTRY,
+    )
+    REQUEST_SECONDS = prometheus_client.Histogram(
+        "resume_parse_seconds", "End-to-end parse latency including cache and queueing.", ["kind"],
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+        registry=REGISTRY,
+    )
+    INPUT_BYTES = prometheus_client.Histogram(
+        "resume_input_bytes", "Size of uploaded documents.", ["kind"],
+        buckets=(1 << 10, 8 << 10, 32 << 10, 128 << 10, 512 << 10, 1 << 20, 4 << 20, 16 << 20, 64 << 20),
+        registry=REGISTRY,
+    )
+    INPUT_PAGES = prometheus_client.Histogram(
+        "resume_input_pages", "Pages per PDF.", buckets=(1, 2, 3, 5, 10, 20, 50, 100, 500), registry=REGISTRY,
+    )
+    INPUT_LINES = prometheus_client.Histogram(
+        "resume_input_lines", "Non-blank lines of extracted text.",
+        buckets=(10, 25, 50, 100, 200, 400, 800, 1600, 5000, 20000), registry=REGISTRY,
+    )
+    PARSE_TOTAL = prometheus_client.Counter(
+        "resume_parse_total", "Parse attempts by input kind and outcome.", ["kind", "outcome"], registry=REGISTRY,
+    )
+
+
+def observe_parse(kind: str, outcome: str, seconds: float, timings: Optional[Dict[str, Dict[str, Any]]]) -> None:
+    if not METRICS_ENABLED:
+        return
+    PARSE_TOTAL.labels(kind, outcome).inc()
+    REQUEST_SECONDS.labels(kind).observe(seconds)
+    if not timings:
+        return
+    for stage, secs in timings["stages"].items():
+        STAGE_SECONDS.labels(stage).observe(secs)
+    sizes = timings["sizes"]
+    if "bytes" in sizes:
+        INPUT_BYTES.labels(kind).observe(sizes["bytes"])
+    if "pages" in sizes:
+        INPUT_PAGES.observe(sizes["pages"])
+    if "lines" in sizes:
+        INPUT_LINES.observe(sizes["lines"])
+
+
+def server_timing(timings: Optional[Dict[str, Dict[str, Any]]], extra: Optional[Dict[str, float]] = None) -> str:
+    """Format stage durations as a Server-Timing header value (milliseconds)."""
+    parts = []
+    for stage, secs in (extra or {}).items():
+        parts.append(f"{stage};dur={secs * 1000:.3f}")
+    for stage, secs in ((timings or {}).get("stages") or {}).items():
+        parts.append(f"{stage};dur={secs * 1000:.3f}")
+    return ", ".join(parts)
+
+
+class _StatsCollector:
+    # Re-exports the numeric fields of a stats() dict as gauges at scrape time
+    def __init__(self, prefix: str, fn: Callable[[], Dict[str, Any]]):
+        self.prefix = prefix
+        self.fn = fn
+
+    def collect(self):
+        for key, value in self.fn().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                yield GaugeMetricFamily(f"resume_{self.prefix}_{key}", f"{self.prefix} {key}", value=value)
+
+
+def register_stats(prefix: str, fn: Callable[[], Dict[str, Any]]) -> None:
+    if METRICS_ENABLED:
+        REGISTRY.register(_StatsCollector(prefix, fn))
+
+
+def render() -> Tuple[bytes, str]:
+    if not METRICS_ENABLED:
+        return b"# metrics disabled\n", "text/plain; charset=utf-8"
+    return prometheus_client.generate_latest(REGISTRY), prometheus_client.CONTENT_TYPE_LATEST
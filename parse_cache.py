@@ -0,0 +1,171 @@
+# parse_cache.py
+# Content-addressed cache of parse results: in-process LRU with an optional SQLite tier.
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+_FINGERPRINT_MODULES = ("parser_core.py", "docx_text.py", "skill_matcher.py", "skill_sets.py", "skill_taxonomy.py")
+
+
+def parser_fingerprint(salt: str = "") -> str:
+    """Short hash of the parser and taxonomy sources (plus any config salt); changes whenever either is edited."""
+    h = hashlib.sha256(salt.encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in _FINGERPRINT_MODULES:
+        h.update(name.encode())
+        try:
+            with open(os.path.join(here, name), "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b"-")
+    return h.hexdigest()[:16]
+
+
+class ParseCache:
+    """Maps sha256(content) + input kind + parser fingerprint to a parse result.
+
+    The memory tier is bounded by entry count and total bytes; both tiers drop
+    entries older than `ttl` seconds. Values are stored as JSON so callers always
+    get a fresh dict they can mutate.
+    """
+
+    DISK_SWEEP_EVERY = 64
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 7 * 24 * 3600,
+        path: Optional[str] = None,
+        max_disk_bytes: int = 1024 * 1024 * 1024,
+        salt: str = "",
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_disk_bytes = max_disk_bytes
+        self.fingerprint = parser_fingerprint(salt)
+        self._mem: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "puts": 0, "evictions": 0}
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS parse_cache_accessed ON parse_cache(accessed)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS parse_cache_created ON parse_cache(created)")
+
+    @classmethod
+    def from_env(cls, salt: str = "") -> "ParseCache":
+        return cls(
+            max_entries=int(os.getenv("RESUME_CACHE_ENTRIES", "1024")),
+            max_bytes=int(os.getenv("RESUME_CACHE_MB", "64")) * 1024 * 1024,
+            ttl=float(os.getenv("RESUME_CACHE_TTL", str(7 * 24 * 3600))),
+            path=os.getenv("RESUME_CACHE_PATH") or None,
+            max_disk_bytes=int(os.getenv("RESUME_CACHE_DISK_MB", "1024")) * 1024 * 1024,
+            salt=salt,
+        )
+
+    def key(self, content: bytes, kind: str, version: str = "") -> str:
+        """`version` names data the parser reads at runtime (e.g. the active skill taxonomy)."""
+        digest = hashlib.sha256(content).hexdigest()
+        return f"{self.fingerprint}{version}:{(kind or '').lower()}:{digest}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                blob, created = entry
+                if now - created <= self.ttl:
+                    self._mem.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return json.loads(blob)
+                self._drop(key)
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created FROM parse_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] <= self.ttl:
+                    self._db.execute("UPDATE parse_cache SET accessed = ? WHERE key = ?", (now, key))
+                    self._counters["disk_hits"] += 1
+                    self._remember(key, bytes(row[0]), row[1])
+                    return json.loads(row[0])
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        blob = json.dumps(value, separators=(",", ":")).encode()
+        now = time.time()
+        with self._lock:
+            self._counters["puts"] += 1
+            self._remember(key, blob, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO parse_cache (key, value, size, created, accessed)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, blob, len(blob), now, now),
+                )
+                # Sweeping the table on every write would dominate put(); amortize it
+                if self._counters["puts"] % self.DISK_SWEEP_EVERY == 1:
+                    self._evict_disk(now)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._counters)
+            out.update({
+                "fingerprint": self.fingerprint,
+                "entries": len(self._mem),
+                "bytes": self._mem_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            })
+            if self._db is not None:
+                n, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache").fetchone()
+                out["disk_entries"] = n
+                out["disk_bytes"] = size
+            return out
+
+    def _remember(self, key: str, blob: bytes, created: float) -> None:
+        if len(blob) > self.max_bytes:
+            return
+        self._drop(key)
+        self._mem[key] = (blob, created)
+        self._mem_bytes += len(blob)
+        while self._mem and (len(self._mem) > self.max_entries or self._mem_bytes > self.max_bytes):
+            old_key, (old_blob, _) = self._mem.popitem(last=False)
+            self._mem_bytes -= len(old_blob)
+            self._counters["evictions"] += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._mem.pop(key, None)
+        if entry is not None:
+            self._mem_bytes -= len(entry[0])
+
+    def _evict_disk(self, now: float) -> None:
+        self._db.execute("DELETE FROM parse_cache WHERE created < ?", (now - self.ttl,))
+        (size,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM parse_cache").fetchone()
+        if size <= self.max_disk_bytes:
+            return
+        # Drop least recently used rows until we're back under budget
+        excess = size - self.max_disk_bytes
+        freed = 0
+        victims = []
+        for k, s in self._db.execute("SELECT key, size FROM parse_cache ORDER BY accessed"):
+            victims.append((k,))
+            freed += s
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM parse_cache WHERE key = ?", victims)
+        self._counters["evictions"] += len(victims)
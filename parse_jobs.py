@@ -0,0 +1,356 @@
+# parse_jobs.py
+# Durable queue of parse jobs in SQLite, drained by asyncio workers in the API
+# process. A job row is committed before the client gets its id, so queued work
+# survives a restart. A running job holds a lease its runner keeps renewing;
+# once the lease lapses (the process died) any process sharing the file may
+# claim it again, so several API processes can drain one queue.
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+JOB_STATES = ("queued", "running", "done", "failed")
+
+
+class QueueFull(Exception):
+    """Raised when enqueueing would exceed max_queued."""
+
+
+class JobFailed(Exception):
+    """A job that should not be retried, with the HTTP status /parse would have used."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class JobQueue:
+    """Parse jobs with their inputs, state and results.
+
+    Inputs are dropped once a job finishes; finished jobs are deleted `ttl`
+    seconds later. A job is attempted at most `max_attempts` times, counting
+    attempts cut short by a crash, so one poisonous document can't take the
+    server down on every restart.
+
+    Nothing touches `path` until open(). A claimed job is leased to this
+    queue for `lease` seconds (renew() extends it); complete(), fail() and
+    requeue() only apply while this queue still owns the job.
+    """
+
+    def __init__(self, path: str = "jobs.db", max_queued: int = 10000, ttl: float = 24 * 3600,
+                 max_attempts: int = 3, lease: float = 60.0):
+        self.path = path
+        self.max_queued = max_queued
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self.lease = lease
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def open(self) -> None:
+        with self._lock:
+            if self._db is None:
+                self._db = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA busy_timeout = 5000")  # other processes claim from the same file
+        if self.path != ":memory:":
+            db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS parse_jobs ("
+            " id TEXT PRIMARY KEY, status TEXT NOT NULL, filename TEXT, content BLOB, text TEXT,"
+            " options TEXT NOT NULL, callback_url TEXT, attempts INTEGER NOT NULL DEFAULT 0,"
+            " created REAL NOT NULL, started REAL, finished REAL,"
+            " result TEXT, error TEXT, error_status INTEGER, callback_status TEXT,"
+            " owner TEXT, lease_until REAL)"
+        )
+        columns = {row[1] for row in db.execute("PRAGMA table_info(parse_jobs)")}
+        for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+            if column not in columns:
+                # Files from before leases: their running rows have no lease and count as expired
+                db.execute(f"ALTER TABLE parse_jobs ADD COLUMN {column} {kind}")
+        db.execute("CREATE INDEX IF NOT EXISTS parse_jobs_status ON parse_jobs(status, created)")
+        db.execute("CREATE INDEX IF NOT EXISTS parse_jobs_finished ON parse_jobs(finished)")
+        return db
+
+    @classmethod
+    def from_env(cls) -> "JobQueue":
+        return cls(
+            path=os.getenv("RESUME_JOBS_PATH", "jobs.db"),
+            max_queued=int(os.getenv("RESUME_JOBS_MAX_QUEUED", "10000")),
+            ttl=float(os.getenv("RESUME_JOBS_TTL", str(24 * 3600))),
+            max_attempts=int(os.getenv("RESUME_JOBS_MAX_ATTEMPTS", "3")),
+            lease=float(os.getenv("RESUME_JOBS_LEASE", "60")),
+        )
+
+    def enqueue(self, filename: Optional[str], content: Optional[bytes], text: Optional[str],
+                options: Dict[str, Any], callback_url: Optional[str] = None) -> str:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            (queued,) = self._db.execute("SELECT COUNT(*) FROM parse_jobs WHERE status = 'queued'").fetchone()
+            if queued >= self.max_queued:
+                raise QueueFull(f"{queued} jobs already queued.")
+            self._db.execute(
+                "INSERT INTO parse_jobs (id, status, filename, content, text, options, callback_url, created)"
+                " VALUES (?, 'queued', ?, ?, ?, ?, ?, ?)",
+                (job_id, filename, content, text, json.dumps(options), callback_url, time.time()),
+            )
+        return job_id
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Lease the oldest queued job (or running job whose lease lapsed) and return it with its inputs, or None."""
+        with self._lock:
+            while True:
+                now = time.time()
+                claimable = "(status = 'queued' OR (status = 'running' AND COALESCE(lease_until, 0) < ?))"
+                row = self._db.execute(
+                    "SELECT id, filename, content, text, options, callback_url, attempts FROM parse_jobs"
+                    f" WHERE {claimable} ORDER BY created LIMIT 1", (now,)
+                ).fetchone()
+                if row is None:
+                    return None
+                job_id, filename, content, text, options, callback_url, attempts = row
+                if attempts >= self.max_attempts:
+                    self._db.execute(
+                        "UPDATE parse_jobs SET status = 'failed', finished = ?, error = ?, error_status = 500,"
+                        f" content = NULL, text = NULL WHERE id = ? AND {claimable}",
+                        (now, f"Gave up after {attempts} attempts.", job_id, now),
+                    )
+                    continue
+                # Another process may have taken it since the SELECT; only the update that lands wins
+                cur = self._db.execute(
+                    "UPDATE parse_jobs SET status = 'running', started = ?, attempts = attempts + 1, owner = ?,"
+                    f" lease_until = ? WHERE id = ? AND {claimable}",
+                    (now, self.owner, now + self.lease, job_id, now),
+                )
+                if cur.rowcount != 1:
+                    continue
+                return {
+                    "id": job_id, "filename": filename, "content": content, "text": text,
+                    "options": json.loads(options), "callback_url": callback_url,
+                }
+
+    def renew(self, job_id: str) -> bool:
+        """Extend this queue's lease on a running job; False if the job is no longer ours."""
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE parse_jobs SET lease_until = ? WHERE id = ? AND status = 'running' AND owner = ?",
+                (time.time() + self.lease, job_id, self.owner),
+            )
+            return cur.rowcount == 1
+
+    def requeue(self, job_id: str) -> None:
+        """Put a running job back without charging the attempt (e.g. the parser was busy)."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE parse_jobs SET status = 'queued', attempts = attempts - 1, owner = NULL, lease_until = NULL"
+                " WHERE id = ? AND status = 'running' AND owner = ?", (job_id, self.owner)
+            )
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> bool:
+        """Store the result; False if the lease was lost and another process owns the job now."""
+        with self._lock:
+            return self._finish(job_id, "done", json.dumps(result), None, None)
+
+    def fail(self, job_id: str, error: str, status: int = 500) -> bool:
+        with self._lock:
+            return self._finish(job_id, "failed", None, error, status)
+
+    def _finish(self, job_id: str, status: str, result: Optional[str], error: Optional[str],
+                error_status: Optional[int]) -> bool:
+        cur = self._db.execute(
+            "UPDATE parse_jobs SET status = ?, finished = ?, result = ?, error = ?, error_status = ?,"
+            " content = NULL, text = NULL, lease_until = NULL WHERE id = ? AND status = 'running' AND owner = ?",
+            (status, time.time(), result, error, error_status, job_id, self.owner),
+        )
+        return cur.rowcount == 1
+
+    def set_callback_status(self, job_id: str, status: str) -> None:
+        with self._lock:
+            self._db.execute("UPDATE parse_jobs SET callback_status = ? WHERE id = ?", (status, job_id))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, created, started, finished, attempts, result, error, error_status, callback_status"
+                " FROM parse_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, created, started, finished, attempts, result, error, error_status, callback_status = row
+        out: Dict[str, Any] = {
+            "id": job_id, "status": status, "created": created, "started": started,
+            "finished": finished, "attempts": attempts,
+        }
+        if status == "done":
+            out["result"] = json.loads(result)
+        elif status == "failed":
+            out["error"] = {"status": error_status, "detail": error}
+        if callback_status:
+            out["callback_status"] = callback_status
+        return out
+
+    def sweep(self) -> int:
+        """Delete finished jobs older than the TTL."""
+        with self._lock:
+            cur = self._db.execute(
+                "DELETE FROM parse_jobs WHERE status IN ('done', 'failed') AND finished < ?", (time.time() - self.ttl,)
+            )
+            return cur.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._db is None:
+                return {state: 0 for state in JOB_STATES}
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM parse_jobs GROUP BY status").fetchall())
+        return {state: counts.get(state, 0) for state in JOB_STATES}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def callback_allowed(url: str, allowed_hosts: List[str]) -> bool:
+    """http(s) URL whose host is in `allowed_hosts` ("*" allows any)."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return False
+    return "*" in allowed_hosts or parts.hostname.lower() in allowed_hosts
+
+
+class _RefuseRedirects(urllib.request.HTTPRedirectHandler):
+    # A redirect could send the POST to a host callback_allowed never saw
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+_callback_opener = urllib.request.build_opener(_RefuseRedirects)
+
+
+def post_callback(url: str, payload: Dict[str, Any], attempts: int = 3, timeout: float = 10.0) -> str:
+    """POST the job document as JSON; returns "ok" or the last error. Blocking. Redirects are not followed."""
+    body = json.dumps(payload).encode("utf-8")
+    error = ""
+    for attempt in range(attempts):
+        req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+        try:
+            with _callback_opener.open(req, timeout=timeout) as resp:
+                if 200 <= resp.status < 300:
+                    return "ok"
+                error = f"HTTP {resp.status}"
+        except urllib.error.HTTPError as e:
+            if 300 <= e.code < 400:
+                return f"HTTP {e.code}: redirect refused"
+            error = f"HTTP {e.code}"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        time.sleep(0.5 * 2 ** attempt)
+    return error
+
+
+class JobRunner:
+    """`workers` asyncio tasks that claim jobs and pass them to `handler`.
+
+    handler(job) returns the result dict; JobFailed marks the job failed with its
+    status, any other exception fails it with 500. Returning None means "not now"
+    and puts the job back in the queue. The job's lease is renewed while the
+    handler runs; if it is lost anyway, the outcome is dropped (the process
+    that took the job over reports it) and no callback is sent. `present`
+    turns a stored job document into what clients see (callbacks use it too).
+    """
+
+    IDLE_POLL = 1.0
+    SWEEP_EVERY = 600.0
+
+    def __init__(self, queue: JobQueue, handler: Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]],
+                 workers: int = 2, allowed_callback_hosts: Optional[List[str]] = None,
+                 present: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+        self.queue = queue
+        self.handler = handler
+        self.present = present
+        self.workers = workers
+        self.allowed_callback_hosts = allowed_callback_hosts or ["localhost", "127.0.0.1", "::1"]
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._callbacks: set = set()  # keeps callback tasks referenced until they finish
+        self._last_sweep = 0.0
+
+    def start(self) -> None:
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _work(self) -> None:
+        while True:
+            if time.monotonic() - self._last_sweep > self.SWEEP_EVERY:
+                self._last_sweep = time.monotonic()
+                await asyncio.to_thread(self.queue.sweep)
+            job = await asyncio.to_thread(self.queue.claim)
+            if job is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.IDLE_POLL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+            try:
+                result = await self.handler(job)
+            except asyncio.CancelledError:
+                # Shutting down mid-job: leave it for the next process to pick up
+                await asyncio.to_thread(self.queue.requeue, job["id"])
+                raise
+            except JobFailed as e:
+                finished = await asyncio.to_thread(self.queue.fail, job["id"], str(e), e.status)
+            except Exception as e:
+                print(f"parse job {job['id']} failed: {type(e).__name__}: {e}", file=sys.stderr)
+                finished = await asyncio.to_thread(self.queue.fail, job["id"], f"Failed to parse: {e}", 500)
+            else:
+                if result is None:
+                    await asyncio.to_thread(self.queue.requeue, job["id"])
+                    await asyncio.sleep(0.25)
+                    continue
+                finished = await asyncio.to_thread(self.queue.complete, job["id"], result)
+            finally:
+                heartbeat.cancel()
+            if not finished:
+                print(f"parse job {job['id']}: lease lost, result dropped", file=sys.stderr)
+                continue
+            if job["callback_url"]:
+                task = asyncio.create_task(self._callback(job["id"], job["callback_url"]))
+                self._callbacks.add(task)
+                task.add_done_callback(self._callbacks.discard)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.queue.lease / 3)
+            if not await asyncio.to_thread(self.queue.renew, job_id):
+                return
+
+    async def _callback(self, job_id: str, url: str) -> None:
+        payload = await asyncio.to_thread(self.queue.get, job_id)
+        if self.present is not None:
+            payload = self.present(payload)
+        status = await asyncio.to_thread(post_callback, url, payload)
+        await asyncio.to_thread(self.queue.set_callback_status, job_id, status)
@@ -0,0 +1,308 @@
+# parse_pool.py
+# Runs CPU-bound extraction/parsing off the asyncio event loop, with backpressure.
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from parser_core import (
+    NO_TIMINGS, ExtractLimits, ParseLimits, StageTimings, extract_document, iter_parse_resume, parse_resume, warm_up,
+)
+
+EXEC_MODES = ("inline", "thread", "process")
+
+# PDF budgets; read at import so process-pool workers pick them up from the environment too
+EXTRACT_LIMITS = ExtractLimits(
+    max_pages=int(os.getenv("RESUME_PDF_MAX_PAGES", "50")),
+    time_budget=float(os.getenv("RESUME_PDF_TIME_BUDGET", "20")),
+    max_chars=int(os.getenv("RESUME_PDF_MAX_CHARS", str(2_000_000))),
+    early_stop=os.getenv("RESUME_PDF_EARLY_STOP", "0") == "1",
+)
+PARSE_LIMITS = ParseLimits(
+    time_budget=float(os.getenv("RESUME_PARSE_TIME_BUDGET", "5")),
+    max_chars=int(os.getenv("RESUME_PARSE_MAX_CHARS", str(1_000_000))),
+)
+
+
+# Modules behind each warm-up format, preloaded into the process pool's fork server
+_PRELOAD = {
+    "pdf": ["pdfminer.converter", "pdfminer.layout", "pdfminer.pdfinterp", "pdfminer.pdfpage"],
+    "docx": ["docx"],
+}
+
+
+class PoolSaturated(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+def run_parse(
+    content: Optional[bytes], filename: Optional[str], text: Optional[str], timed: bool = False
+) -> Tuple[str, Dict[str, Any], Optional[Dict[str, Dict[str, Any]]]]:
+    # Module-level so it can be pickled into worker processes; timings travel back with the result
+    timings = StageTimings() if timed else NO_TIMINGS
+    truncated, reason = False, None
+    if content is not None:
+        extraction = extract_document(content, filename, EXTRACT_LIMITS, timings)
+        resume_text, truncated, reason = extraction.text, extraction.truncated, extraction.reason
+    else:
+        resume_text = text or ""
+    parsed = parse_resume(resume_text, timings, PARSE_LIMITS)
+    if truncated:
+        # An extraction budget explains a short result better than a parse budget
+        parsed["truncated"] = True
+        parsed["truncation_reason"] = reason
+    return resume_text, parsed, (timings.as_dict() if timed else None)
+
+
+def iter_run_parse(
+    content: Optional[bytes], filename: Optional[str], text: Optional[str]
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """run_parse as (stage, fields) pairs: ("extracted", {text, truncated, truncation_reason}) first,
+    then parser_core.iter_parse_resume's stages."""
+    truncated, reason = False, None
+    if content is not None:
+        extraction = extract_document(content, filename, EXTRACT_LIMITS)
+        resume_text, truncated, reason = extraction.text, extraction.truncated, extraction.reason
+    else:
+        resume_text = text or ""
+    yield "extracted", {"text": resume_text, "truncated": truncated, "truncation_reason": reason}
+    for stage, fields in iter_parse_resume(resume_text, NO_TIMINGS, PARSE_LIMITS):
+        if stage == "truncated" and truncated:
+            continue  # the extraction budget already explains the short result
+        yield stage, fields
+
+
+def _drain(fn, *args) -> List[Any]:
+    # Process workers can't stream back to the caller; ship the whole sequence at once
+    return list(fn(*args))
+
+
+class ParsePool:
+    """Bounded executor for parse tasks.
+
+    mode: "inline" runs on the caller (old behaviour), "thread" uses a thread
+    pool, "process" uses a process pool whose workers are replaced after
+    `max_tasks_per_worker` tasks. At most `workers + queue_size` tasks are
+    admitted; the rest get PoolSaturated immediately. A task that exceeds
+    `timeout` raises asyncio.TimeoutError for the caller but keeps its slot
+    until the worker actually finishes, so the admission count stays honest.
+
+    `warm_up` lists extractors ("pdf", "docx") to load before the first parse
+    (see warm_up()); the rest are imported on the first upload of their type.
+    Process workers fork from a fork server that has already imported the
+    parser and those extractors, so a replacement worker is ready in
+    milliseconds. Workers still re-run a __main__ script (not a -m module), so
+    serve with `python -m uvicorn app:app` rather than `python app.py`.
+    """
+
+    def __init__(
+        self,
+        mode: str = "thread",
+        workers: Optional[int] = None,
+        queue_size: int = 32,
+        timeout: float = 30.0,
+        max_tasks_per_worker: int = 200,
+        warm_up: Tuple[str, ...] = (),
+    ):
+        if mode not in EXEC_MODES:
+            raise ValueError(f"Unknown execution mode {mode!r}; use one of {', '.join(EXEC_MODES)}.")
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.warm_up_formats = tuple(warm_up)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._counters = {"submitted": 0, "completed": 0, "rejected": 0, "timeouts": 0, "failed": 0}
+
+    @classmethod
+    def from_env(cls) -> "ParsePool":
+        workers = os.getenv("RESUME_WORKERS")
+        return cls(
+            mode=os.getenv("RESUME_EXEC_MODE", "thread"),
+            workers=int(workers) if workers else None,
+            queue_size=int(os.getenv("RESUME_QUEUE_SIZE", "32")),
+            timeout=float(os.getenv("RESUME_TASK_TIMEOUT", "30")),
+            max_tasks_per_worker=int(os.getenv("RESUME_MAX_TASKS_PER_WORKER", "200")),
+            warm_up=tuple(f.strip() for f in os.getenv("RESUME_WARMUP", "pdf").split(",") if f.strip()),
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.mode == "process":
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=self._mp_context(),
+                        initializer=warm_up,
+                        initargs=(self.warm_up_formats,),
+                        max_tasks_per_child=self.max_tasks_per_worker or None,
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="parse")
+            return self._executor
+
+    def _mp_context(self):
+        if "forkserver" not in multiprocessing.get_all_start_methods():
+            return None  # spawn: every worker imports everything itself
+        ctx = multiprocessing.get_context("forkserver")
+        preload = [__name__]
+        for fmt in self.warm_up_formats:
+            preload += _PRELOAD.get(fmt, [])
+        ctx.set_forkserver_preload(preload)
+        return ctx
+
+    async def warm_up(self) -> Dict[str, float]:
+        """Pay first-parse costs before serving: parser_core.warm_up() here, or
+        in process mode, start the fork server and a first worker. Returns
+        seconds per step."""
+        started = time.perf_counter()
+        if self.mode == "process":
+            spent = await self.run(warm_up, self.warm_up_formats)
+        else:
+            spent = await asyncio.to_thread(warm_up, self.warm_up_formats)
+        spent["total"] = time.perf_counter() - started
+        return spent
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._counters["rejected"] += 1
+                raise PoolSaturated(f"Parser busy: {self._in_flight} tasks in flight.")
+            self._in_flight += 1
+            self._counters["submitted"] += 1
+
+    def _release(self, _future: Any = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn, *args):
+        """Run fn(*args) under the pool's admission and timeout rules."""
+        self._acquire()
+        if self.mode == "inline":
+            try:
+                result = fn(*args)
+            except Exception:
+                self._counters["failed"] += 1
+                raise
+            finally:
+                self._release()
+            self._counters["completed"] += 1
+            return result
+
+        try:
+            cfut = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        cfut.add_done_callback(self._release)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(cfut), self.timeout)
+        except asyncio.TimeoutError:
+            self._counters["timeouts"] += 1
+            raise
+        except BrokenProcessPool:
+            # A worker died (OOM, segfault in a native lib); start over with a fresh pool
+            self._counters["failed"] += 1
+            with self._lock:
+                broken, self._executor = self._executor, None
+            if broken is not None:
+                broken.shutdown(wait=False, cancel_futures=True)
+            raise PoolSaturated("Parser worker crashed; retry.")
+        except Exception:
+            self._counters["failed"] += 1
+            raise
+        self._counters["completed"] += 1
+        return result
+
+    async def iterate(self, fn, *args) -> AsyncIterator[Any]:
+        """Run generator function fn(*args) under run()'s rules, yielding items as they are produced.
+
+        In thread mode items cross over as the worker yields them; in process
+        mode the generator runs to completion first and its items arrive
+        together. `timeout` applies to the whole sequence.
+        """
+        if self.mode == "process":
+            for item in await self.run(_drain, fn, *args):
+                yield item
+            return
+        self._acquire()
+        if self.mode == "inline":
+            try:
+                for item in fn(*args):
+                    yield item
+            except Exception:
+                self._counters["failed"] += 1
+                raise
+            finally:
+                self._release()
+            self._counters["completed"] += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[Tuple[bool, Any]]" = asyncio.Queue()
+        abandoned = threading.Event()
+
+        def pump() -> None:
+            # (True, item) per item, then (False, exception or None)
+            try:
+                for item in fn(*args):
+                    if abandoned.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, (True, item))
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, (False, e))
+                return
+            loop.call_soon_threadsafe(queue.put_nowait, (False, None))
+
+        try:
+            cfut = self._get_executor().submit(pump)
+        except BaseException:
+            self._release()
+            raise
+        cfut.add_done_callback(self._release)
+        deadline = loop.time() + self.timeout
+        try:
+            while True:
+                try:
+                    more, value = await asyncio.wait_for(queue.get(), max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    self._counters["timeouts"] += 1
+                    raise
+                if not more:
+                    break
+                yield value
+        finally:
+            # Also reached when the consumer goes away; the worker stops at its next item
+            abandoned.set()
+        if value is not None:
+            self._counters["failed"] += 1
+            raise value
+        self._counters["completed"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._counters)
+            out.update({
+                "mode": self.mode,
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+            })
+            return out
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
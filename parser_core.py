@@ -1,31 +1,59 @@
 # parser_core.py
+import functools
 import io
 import re
 import sys
-from typing import List, Dict, Any, Tuple, Optional
-from skill_sets import CANONICAL_SKILLS, SKILL_GROUPS, LANGUAGES
-
-# Optional imports: handled gracefully if libs aren’t installed.
-try:
-    from pdfminer.high_level import extract_text as pdf_extract_text
-except Exception:
-    pdf_extract_text = None
-
-try:
-    import docx
-except Exception:
-    docx = None
-
-URL_RE = re.compile(r'((?:https?://|www\.)[^\s)]+)', re.IGNORECASE)
-EMAIL_RE = re.compile(r'[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}', re.IGNORECASE)
+import time
+from bisect import bisect_left
+from typing import List, Dict, Any, Callable, Iterable, Iterator, NamedTuple, Tuple, Optional
+import skill_taxonomy
+from skill_matcher import Hit, _lower_same_length
+from skill_taxonomy import Taxonomy
+from docx_text import docx_text_or_none
+
+# Optional imports: handled gracefully if libs aren’t installed. Both are slow
+# to import, so they load on the first PDF / malformed DOCX (or in warm_up()),
+# not on every cold start.
+@functools.lru_cache(maxsize=None)
+def _pdfminer() -> Optional[Tuple[Any, ...]]:
+    try:
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+    except Exception:
+        return None
+    return TextConverter, LAParams, PDFPageInterpreter, PDFResourceManager, PDFPage
+
+@functools.lru_cache(maxsize=None)
+def _docx() -> Any:
+    try:
+        import docx
+    except Exception:
+        return None
+    return docx
+
+# Hot-path patterns must stay linear on garbage input (megabytes of digits or
+# letters from a broken PDF). Every repeat that can run past a failed match is
+# either bounded or possessive, and run-shaped patterns only start at the
+# beginning of a run, so a failed attempt is never retried from inside it.
+# benchmarks/bench_adversarial.py checks this.
+URL_RE = re.compile(r'((?:https?://|www\.)[^\s)]++)', re.IGNORECASE)
+EMAIL_RE = re.compile(r'(?<![A-Z0-9._%+-])[A-Z0-9._%+-]++@[A-Z0-9.-]+\.[A-Z]{2,}', re.IGNORECASE)
 PHONE_RE = re.compile(
-    r'(\+?\d{1,3}[\s\-\.]?)?(\(?\d{3,4}\)?[\s\-\.]?)?\d{3,4}[\s\-\.]?\d{4}', re.IGNORECASE
+    r'(?<!\d)(\+?\d{1,3}[\s\-\.]?)?(\(?\d{3,4}\)?[\s\-\.]?)?\d{3,4}[\s\-\.]?\d{4}', re.IGNORECASE
 )
 YEAR_RE = r'(20\d{2}|19\d{2})'
+# "Sep" + "tember" is the longest month name
 DATE_RE = re.compile(
-    fr'((Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?\s?\d{{0,2}},?\s?{YEAR_RE}|{YEAR_RE}\s?-\s?(Present|{YEAR_RE})|{YEAR_RE}\s?to\s?(Present|{YEAR_RE}))',
+    fr'((Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]{{0,6}}\.?\s?\d{{0,2}},?\s?{YEAR_RE}|{YEAR_RE}\s?-\s?(Present|{YEAR_RE})|{YEAR_RE}\s?to\s?(Present|{YEAR_RE}))',
     re.IGNORECASE
 )
+_TIMELINE_TOKEN_RE = re.compile(r'(Present|20\d{2}|19\d{2})', re.IGNORECASE)
+_LOCATION_RE = re.compile(r'[A-Za-z]+,\s*[A-Za-z .-]+(,\s*[A-Za-z .-]+)?')
+_FIELD_RE = re.compile(r'in\s([A-Za-z& /]{1,80})', re.IGNORECASE)
+_GPA_RE = re.compile(r'GPA[:\s]++([0-9.]+/?[0-9.]*)', re.IGNORECASE)
+_PART_SPLIT_RE = re.compile(r'\s[–\-|]\s')
 
 DEGREE_WORDS = [
     "bachelor", "master", "phd", "b.tech", "btech", "m.tech", "mtech", "mba",
@@ -36,39 +64,341 @@ EXP_SECTION_HINTS = ["experience", "work history", "employment"]
 PROJ_SECTION_HINTS = ["projects", "personal projects"]
 CERT_SECTION_HINTS = ["certifications", "licenses", "certs"]
 
+_SECTION_HEADERS = {}
+for _name, _hints in (("education", EDU_SECTION_HINTS), ("experience", EXP_SECTION_HINTS),
+                      ("projects", PROJ_SECTION_HINTS), ("certifications", CERT_SECTION_HINTS)):
+    for _h in _hints:
+        _SECTION_HEADERS[_h] = _name
+
+# Skill lists ("Skills: ..." lines, or lines under a "Technical Skills" heading) are
+# the one place where typo-tolerant lookup is safe enough to run
+_SKILL_LABEL_RE = re.compile(r'(?:[a-z/&]+ ){0,3}?(?:skills|technologies|tech stack|tools|toolkit)\b[^:]{0,30}:')
+_SKILL_HEADINGS = {
+    "skills", "technical skills", "key skills", "core skills", "skills & tools", "skills and tools",
+    "tech stack", "technologies", "tools", "core competencies",
+}
+_SKILL_ITEM_RE = re.compile(r'[^,;|•]+')
+
+class StageTimings:
+    """Per-stage durations (seconds) and input sizes for one document.
+
+    Stages are recorded as laps: lap(name) charges the time since the previous
+    lap (or start()) to `name`. Pass NO_TIMINGS when nobody is listening.
+    """
+    __slots__ = ("stages", "sizes", "_last")
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.sizes: Dict[str, int] = {}
+        self._last = time.perf_counter()
+
+    def start(self) -> None:
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._last)
+        self._last = now
+
+    def size(self, key: str, value: int) -> None:
+        self.sizes[key] = value
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {"stages": dict(self.stages), "sizes": dict(self.sizes)}
+
+class _NoTimings(StageTimings):
+    __slots__ = ()
+
+    def __init__(self):
+        pass
+
+    def start(self) -> None:
+        pass
+
+    def lap(self, stage: str) -> None:
+        pass
+
+    def size(self, key: str, value: int) -> None:
+        pass
+
+NO_TIMINGS = _NoTimings()
+
+class ExtractLimits(NamedTuple):
+    """Budgets for PDF extraction; 0 means unlimited.
+
+    early_stop ends extraction one page after the email and both the
+    education and experience headers have been seen, which cuts portfolios
+    and theses down to their resume pages.
+    """
+    max_pages: int = 0
+    time_budget: float = 0.0
+    max_chars: int = 0
+    early_stop: bool = False
+
+NO_LIMITS = ExtractLimits()
+
+class ParseLimits(NamedTuple):
+    """Budgets for parse_resume; 0 means unlimited.
+
+    max_chars cuts the text (at a line break) before any work is done.
+    time_budget is checked between stages: once it is spent the remaining
+    stages are skipped and their fields keep empty defaults. With the
+    patterns above linear, one stage is bounded by max_chars, so a document
+    can overrun the budget by at most one stage.
+    """
+    time_budget: float = 0.0
+    max_chars: int = 0
+
+NO_PARSE_LIMITS = ParseLimits()
+
+class Extraction(NamedTuple):
+    text: str
+    pages: int
+    truncated: bool
+    reason: Optional[str]  # "max_pages" / "time_budget" / "max_chars" / "early_stop"
+
 def _clean_text(t: str) -> str:
     return re.sub(r'[ \t]+', ' ', t).replace('\r', '\n')
 
-def extract_text_from_file(content: bytes, filename: str) -> str:
+def iter_pdf_pages(content: bytes) -> Iterator[Tuple[str, bool]]:
+    """Yield (page_text, more_pages) lazily; a page is laid out only when requested."""
+    pdfminer = _pdfminer()
+    if not pdfminer:
+        raise ValueError("pdfminer.six is not installed.")
+    TextConverter, LAParams, PDFPageInterpreter, PDFResourceManager, PDFPage = pdfminer
+    out = io.StringIO()
+    rsrcmgr = PDFResourceManager(caching=True)
+    device = TextConverter(rsrcmgr, out, codec="utf-8", laparams=LAParams())
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    try:
+        # Walking the page tree is cheap; it's process_page that does the layout work
+        pages = PDFPage.get_pages(io.BytesIO(content), caching=True)
+        page = next(pages, None)
+        while page is not None:
+            interpreter.process_page(page)
+            text = out.getvalue()
+            out.seek(0)
+            out.truncate()
+            page = next(pages, None)
+            yield text, page is not None
+    finally:
+        device.close()
+
+def _resume_complete(page: str, seen: set) -> bool:
+    # Tracks what the early-stop heuristic needs across pages
+    if "email" not in seen and EMAIL_RE.search(page):
+        seen.add("email")
+    for line in page.splitlines():
+        section = _SECTION_HEADERS.get(line.strip().lower().strip(":").strip())
+        if section:
+            seen.add(section)
+    return {"email", "education", "experience"} <= seen
+
+def _extract_pdf(content: bytes, limits: ExtractLimits) -> Extraction:
+    started = time.perf_counter()
+    parts: List[str] = []
+    chars = 0
+    seen: set = set()
+    complete_at = None
+    reason = None
+    pages = iter_pdf_pages(content)
+    for n, (page, more) in enumerate(pages, start=1):
+        parts.append(page)
+        chars += len(page)
+        if limits.early_stop and complete_at is None and _resume_complete(page, seen):
+            complete_at = n
+        if not more:
+            break
+        if limits.max_pages and n >= limits.max_pages:
+            reason = "max_pages"
+        elif limits.max_chars and chars >= limits.max_chars:
+            reason = "max_chars"
+        elif limits.time_budget and time.perf_counter() - started >= limits.time_budget:
+            reason = "time_budget"
+        elif complete_at is not None and n > complete_at:
+            reason = "early_stop"
+        if reason:
+            pages.close()
+            break
+    return Extraction(_clean_text("".join(parts)), len(parts), reason is not None, reason)
+
+def extract_document(
+    content: bytes, filename: str, limits: ExtractLimits = NO_LIMITS, timings: StageTimings = NO_TIMINGS
+) -> Extraction:
     name = (filename or "").lower()
+    timings.start()
+    timings.size("bytes", len(content))
     if name.endswith(".pdf"):
-        if not pdf_extract_text:
-            raise ValueError("pdfminer.six is not installed.")
-        return _clean_text(pdf_extract_text(io.BytesIO(content)))
+        result = _extract_pdf(content, limits)
+        timings.lap("extract.pdf")
+        timings.size("pages", result.pages)
+        return result
     elif name.endswith(".docx"):
-        if not docx:
-            raise ValueError("python-docx is not installed.")
-        doc = docx.Document(io.BytesIO(content))
-        return _clean_text("\n".join(p.text for p in doc.paragraphs))
+        raw = docx_text_or_none(content)
+        if raw is None:
+            # Malformed package: let python-docx have a go (it is more forgiving about rels)
+            docx = _docx()
+            if not docx:
+                raise ValueError("python-docx is not installed.")
+            doc = docx.Document(io.BytesIO(content))
+            raw = "\n".join(p.text for p in doc.paragraphs)
+        timings.lap("extract.docx")
+        return Extraction(_clean_text(raw), 0, False, None)
     elif name.endswith(".txt"):
         # best-effort decode
         for enc in ("utf-8", "latin-1", "utf-16"):
             try:
-                return _clean_text(content.decode(enc))
+                raw = content.decode(enc)
+                break
             except Exception:
                 continue
-        return _clean_text(content.decode(errors="ignore"))
+        else:
+            raw = content.decode(errors="ignore")
+        timings.lap("extract.txt")
+        return Extraction(_clean_text(raw), 0, False, None)
     else:
         raise ValueError("Unsupported file type. Use PDF, DOCX, or TXT.")
 
-def _top_lines(text: str, n=12) -> List[str]:
-    lines = [l.strip() for l in text.splitlines() if l.strip()]
-    return lines[:n]
+def extract_text_from_file(content: bytes, filename: str, timings: StageTimings = NO_TIMINGS) -> str:
+    return extract_document(content, filename, NO_LIMITS, timings).text
+
+class ResumeDoc(NamedTuple):
+    """Immutable, pre-processed view of one resume, shared by every extractor.
+
+    Offsets index into `text` (the stripped input) and `lower` (same length,
+    lowercased); line indices index into `lines`.
+    """
+    text: str
+    lower: str
+    lines: Tuple[str, ...]                    # stripped lines, blanks included
+    spans: Tuple[Tuple[int, int], ...]        # stripped line i == text[spans[i][0]:spans[i][1]]
+    raw_spans: Tuple[Tuple[int, int], ...]    # same, before stripping (line break excluded)
+    nonblank: Tuple[int, ...]                 # indices of non-blank lines
+    sections: Dict[str, Tuple[int, ...]]      # section -> line indices, header lines excluded
+    bullets: Dict[int, Tuple[int, int]]       # bullet line index -> span of the bullet text
+    hits: Tuple[Hit, ...]                     # vocabulary hits over the whole text
+    hit_starts: Tuple[int, ...]               # hits[k].start, for bisecting
+    taxonomy: Taxonomy                        # vocabulary the hits were made with
+
+    def lower_line(self, i: int) -> str:
+        s, e = self.spans[i]
+        return self.lower[s:e]
+
+    def raw_line(self, i: int) -> str:
+        s, e = self.raw_spans[i]
+        return self.text[s:e]
 
-def _guess_name(text: str, email: Optional[str]) -> Optional[str]:
+    def section_ids(self, name: str) -> Tuple[int, ...]:
+        return self.sections.get(name, ())
+
+    def bullet_text(self, i: int) -> str:
+        s, e = self.bullets[i]
+        return self.text[s:e]
+
+    def terms_in(self, line_ids: List[int], kind: str) -> List[str]:
+        """Sorted distinct terms of `kind` hit inside the bullet text of the given lines."""
+        found = set()
+        for i in line_ids:
+            s, e = self.bullets[i]
+            k = bisect_left(self.hit_starts, s)
+            while k < len(self.hits) and self.hit_starts[k] < e:
+                h = self.hits[k]
+                if h.end <= e and h.kind == kind:
+                    found.add(h.term)
+                k += 1
+        return sorted(found)
+
+def _skill_list_hits(t: str, list_spans: List[Tuple[int, int]], exact: List[Hit],
+                     taxonomy: Taxonomy) -> List[Hit]:
+    """Fuzzy hits for skill-list items the exact scan didn't recognise ("Kubernates", "Py-Torch")."""
+    starts = [h.start for h in exact]
+    out = []
+    for a, b in list_spans:
+        for m in _SKILL_ITEM_RE.finditer(t, a, b):
+            item = m.group(0)
+            body = item.strip().lstrip("-•* ").strip()
+            if not body or len(body) > 40:
+                continue
+            s = m.start() + item.index(body)
+            e = s + len(body)
+            k = bisect_left(starts, s)
+            if k < len(exact) and exact[k].start < e:
+                continue
+            term = taxonomy.lookup(body)
+            if term is not None:
+                out.append(Hit(s, e, "skill", term))
+    return out
+
+def build_document(text: str) -> ResumeDoc:
+    """Single pass over the text: lines with offsets, sections, bullets and vocabulary hits."""
+    taxonomy = skill_taxonomy.active()
+    t = text.strip()
+    lower = _lower_same_length(t)
+    lines: List[str] = []
+    spans: List[Tuple[int, int]] = []
+    raw_spans: List[Tuple[int, int]] = []
+    nonblank: List[int] = []
+    sections: Dict[str, List[int]] = {"_intro": []}
+    bullets: Dict[int, Tuple[int, int]] = {}
+    current = sections["_intro"]
+    list_spans: List[Tuple[int, int]] = []
+    in_skill_list = False
+    pos = 0
+    for raw, with_end in zip(t.splitlines(), t.splitlines(True)):
+        i = len(lines)
+        lead = len(raw) - len(raw.lstrip())
+        l = raw.strip()
+        s = pos + lead
+        lines.append(l)
+        spans.append((s, s + len(l)))
+        raw_spans.append((pos, pos + len(raw)))
+        pos += len(with_end)
+        if not l:
+            current.append(i)
+            in_skill_list = False
+            continue
+        nonblank.append(i)
+        key = lower[s:s + len(l)].strip(":").strip()
+        section = _SECTION_HEADERS.get(key)
+        if section:
+            current = sections.setdefault(section, [])
+            in_skill_list = False
+            continue
+        current.append(i)
+        if key in _SKILL_HEADINGS:
+            in_skill_list = True
+        elif in_skill_list:
+            list_spans.append((s, s + len(l)))
+        else:
+            m = _SKILL_LABEL_RE.match(lower, s, s + len(l))
+            if m:
+                list_spans.append((m.end(), s + len(l)))
+        if l[0] in "-•*":
+            body = l.lstrip("-•* ")
+            b = s + len(l) - len(body)
+            body = body.strip()
+            bullets[i] = (b, b + len(body))
+    exact = taxonomy.matcher.scan(t)
+    fuzzy = _skill_list_hits(t, list_spans, exact, taxonomy) if list_spans else []
+    hits = tuple(sorted(exact + fuzzy)) if fuzzy else tuple(exact)
+    return ResumeDoc(
+        text=t,
+        lower=lower,
+        lines=tuple(lines),
+        spans=tuple(spans),
+        raw_spans=tuple(raw_spans),
+        nonblank=tuple(nonblank),
+        sections={k: tuple(v) for k, v in sections.items()},
+        bullets=bullets,
+        hits=hits,
+        hit_starts=tuple(h.start for h in hits),
+        taxonomy=taxonomy,
+    )
+
+def _guess_name(doc: ResumeDoc, email: Optional[str]) -> Optional[str]:
     # Heuristic: Look at the first lines for 2–4 capitalized tokens
-    lines = _top_lines(text, n=8)
-    for l in lines:
+    for i in doc.nonblank[:8]:
+        l = doc.lines[i]
         tokens = [t for t in re.split(r'[\s|,]+', l) if t]
         caps = [t for t in tokens if re.match(r"^[A-Z][a-zA-Z'\-]+$", t)]
         if 2 <= len(caps) <= 4 and not re.search(EMAIL_RE, l):
@@ -82,8 +412,8 @@ def _guess_name(text: str, email: Optional[str]) -> Optional[str]:
             return " ".join(parts[:3])
     return None
 
-def _extract_links(text: str) -> List[Dict[str, str]]:
-    urls = set(m.group(1) for m in URL_RE.finditer(text))
+def _extract_links(doc: ResumeDoc) -> List[Dict[str, str]]:
+    urls = set(m.group(1) for m in URL_RE.finditer(doc.text))
     links = []
     for u in urls:
         lu = u.lower()
@@ -101,47 +431,31 @@ def _extract_links(text: str) -> List[Dict[str, str]]:
         links.append({"type": t, "url": u if u.startswith("http") else f"https://{u}"})
     return sorted(links, key=lambda x: x["type"])
 
-def _detect_location(lines: List[str]) -> Optional[str]:
+def _detect_location(doc: ResumeDoc) -> Optional[str]:
     # Naive: find line with city/state/country-like commas and no bullets
-    for l in lines[:10]:
-        if "@" in l or "http" in l.lower():
+    for i in doc.nonblank[:10]:
+        l = doc.raw_line(i)
+        if "@" in l or "http" in doc.lower_line(i):
             continue
-        if re.search(r'[A-Za-z]+,\s*[A-Za-z .-]+(,\s*[A-Za-z .-]+)?', l) and len(l) < 80:
+        # Length first: the pattern is quadratic on a long comma-free run of letters
+        if len(l) < 80 and _LOCATION_RE.search(l):
             return l.strip("•- ")
     return None
 
-def _split_sections(text: str) -> Dict[str, List[str]]:
-    lines = [l.strip() for l in text.splitlines()]
-    sections: Dict[str, List[str]] = {"_intro": []}
-    current = "_intro"
-    for l in lines:
-        bare = l.lower().strip(":").strip()
-        if bare in EDU_SECTION_HINTS:
-            current = "education"
-            sections.setdefault(current, [])
-            continue
-        if bare in EXP_SECTION_HINTS:
-            current = "experience"
-            sections.setdefault(current, [])
-            continue
-        if bare in PROJ_SECTION_HINTS:
-            current = "projects"
-            sections.setdefault(current, [])
-            continue
-        if bare in CERT_SECTION_HINTS:
-            current = "certifications"
-            sections.setdefault(current, [])
-            continue
-        sections.setdefault(current, []).append(l)
-    return sections
+def _split_sections(doc: ResumeDoc) -> Dict[str, List[str]]:
+    return {name: [doc.lines[i] for i in ids] for name, ids in doc.sections.items()}
+
+_SUMMARY_STOP_HINTS = EDU_SECTION_HINTS + EXP_SECTION_HINTS + PROJ_SECTION_HINTS
 
-def _extract_summary(intro_lines: List[str]) -> Optional[str]:
+def _extract_summary(doc: ResumeDoc) -> Optional[str]:
     # first 3–6 lines that are not contact info
     body = []
-    for l in intro_lines:
+    for i in doc.section_ids("_intro"):
+        l = doc.lines[i]
         if re.search(EMAIL_RE, l) or re.search(PHONE_RE, l) or re.search(URL_RE, l):
             continue
-        if any(h in l.lower() for h in EDU_SECTION_HINTS + EXP_SECTION_HINTS + PROJ_SECTION_HINTS):
+        lower = doc.lower_line(i)
+        if any(h in lower for h in _SUMMARY_STOP_HINTS):
             break
         body.append(l.strip("•- "))
         if len(" ".join(body)) > 400:
@@ -149,24 +463,15 @@ def _extract_summary(intro_lines: List[str]) -> Optional[str]:
     t = " ".join(body).strip()
     return t or None
 
-def _find_skill_hits(text: str) -> Tuple[List[str], Dict[str, List[str]]]:
-    text_l = text.lower()
-    hits = []
-    for s in CANONICAL_SKILLS:
-        if re.search(rf'\b{re.escape(s.lower())}\b', text_l):
-            hits.append(s)
+def _find_skill_hits(doc: ResumeDoc) -> Tuple[List[str], Dict[str, List[str]]]:
+    found = {h.term for h in doc.hits if h.kind == "skill"}
     buckets: Dict[str, List[str]] = {}
-    for g, items in SKILL_GROUPS.items():
-        buckets[g] = sorted([s for s in items if s in hits])
-    return sorted(set(hits)), buckets
-
-def _find_languages(text: str) -> List[str]:
-    hits = []
-    tl = text.lower()
-    for lang in LANGUAGES:
-        if re.search(rf'\b{re.escape(lang.lower())}\b', tl):
-            hits.append(lang)
-    return sorted(set(hits))
+    for g, items in doc.taxonomy.groups.items():
+        buckets[g] = sorted([s for s in items if s in found])
+    return sorted(found), buckets
+
+def _find_languages(doc: ResumeDoc) -> List[str]:
+    return sorted({h.term for h in doc.hits if h.kind == "language"})
 
 def _parse_timeline_line(l: str) -> Tuple[Optional[str], Optional[str]]:
     # Try "Jan 2020 - Mar 2022", "2021 - Present", "2019 to 2020"
@@ -174,29 +479,33 @@ def _parse_timeline_line(l: str) -> Tuple[Optional[str], Optional[str]]:
     if not m:
         return (None, None)
     # normalize roughly by pulling the first and last year-like tokens
-    years = re.findall(r'(Present|20\d{2}|19\d{2})', m.group(0), re.I)
+    years = _TIMELINE_TOKEN_RE.findall(m.group(0))
     if not years:
         return (None, None)
     start = years[0]
     end = years[-1] if len(years) > 1 else None
     return (start, end)
 
-def _parse_bullets(lines: List[str], start_idx: int) -> List[str]:
-    bullets = []
-    for i in range(start_idx, min(start_idx + 12, len(lines))):
-        l = lines[i].strip()
-        if l.startswith(("-", "•", "*")) or l[:2] in ("- ", "• ", "* "):
-            bullets.append(l.lstrip("-•* ").strip())
+def _parse_bullets(doc: ResumeDoc, ids: Tuple[int, ...], start_idx: int) -> List[int]:
+    """Line indices of the bullets following position `start_idx` of a section."""
+    out = []
+    for k in range(start_idx, min(start_idx + 12, len(ids))):
+        i = ids[k]
+        if i in doc.bullets:
+            out.append(i)
         else:
             # stop if we hit a blank or a new section-ish header
+            l = doc.lines[i]
             if not l or l.isupper() or len(l) < 3:
                 break
-    return bullets
+    return out
 
-def _parse_education(section_lines: List[str]) -> List[Dict[str, Any]]:
+def _parse_education(doc: ResumeDoc) -> List[Dict[str, Any]]:
+    ids = doc.section_ids("education")
+    lines = [doc.lines[i] for i in ids]
     out = []
-    for i, l in enumerate(section_lines):
-        lower = l.lower()
+    for k, l in enumerate(lines):
+        lower = doc.lower_line(ids[k])
         if any(dw in lower for dw in DEGREE_WORDS) or re.search(YEAR_RE, l):
             start, end = _parse_timeline_line(l)
             # attempt: Institution – Degree, Field
@@ -206,12 +515,12 @@ def _parse_education(section_lines: List[str]) -> List[Dict[str, Any]]:
             loc = None
             # institution often on same or next line
             inst_line = l
-            if i + 1 < len(section_lines):
-                nxt = section_lines[i + 1]
+            if k + 1 < len(lines):
+                nxt = lines[k + 1]
                 if len(nxt) > len(inst_line):
                     inst_line = nxt + " " + inst_line
             # split on dash/pipe
-            parts = re.split(r'\s[–\-|]\s', inst_line)
+            parts = _PART_SPLIT_RE.split(inst_line)
             if parts:
                 if any(dw in parts[0].lower() for dw in DEGREE_WORDS):
                     # flipped
@@ -221,12 +530,12 @@ def _parse_education(section_lines: List[str]) -> List[Dict[str, Any]]:
                     inst = parts[0]
                     deg = parts[1] if len(parts) > 1 else None
             # field guess
-            m = re.search(r'in\s([A-Za-z& /]+)', l, re.I)
+            m = _FIELD_RE.search(l)
             if m:
                 field = m.group(1).strip()
             # gpa
             gpa = None
-            mg = re.search(r'GPA[:\s]+([0-9.]+/?[0-9.]*)', " ".join(section_lines[i:i+3]), re.I)
+            mg = _GPA_RE.search(" ".join(lines[k:k+3]))
             if mg:
                 gpa = mg.group(1)
             out.append({
@@ -237,7 +546,7 @@ def _parse_education(section_lines: List[str]) -> List[Dict[str, Any]]:
                 "end_date": end,
                 "gpa": gpa,
                 "location": loc,
-                "highlights": _parse_bullets(section_lines, i+1),
+                "highlights": [doc.bullet_text(i) for i in _parse_bullets(doc, ids, k + 1)],
             })
     # dedupe
     uniq = []
@@ -248,19 +557,23 @@ def _parse_education(section_lines: List[str]) -> List[Dict[str, Any]]:
             uniq.append(e); seen.add(key)
     return uniq
 
-def _parse_experience(section_lines: List[str], text: str) -> List[Dict[str, Any]]:
+def _parse_experience(doc: ResumeDoc) -> List[Dict[str, Any]]:
+    ids = doc.section_ids("experience")
+    lines = [doc.lines[i] for i in ids]
+    # each line's dates are needed for itself and for the line above it
+    timeline = [_parse_timeline_line(l) if l else (None, None) for l in lines]
     out = []
-    for i, l in enumerate(section_lines):
-        if not l.strip():
+    for k, l in enumerate(lines):
+        if not l:
             continue
         # Look for Company — Title with dates on same/next line
-        dates = _parse_timeline_line(l)
+        dates = timeline[k]
         if not any(dates):
-            if i + 1 < len(section_lines):
-                dates = _parse_timeline_line(section_lines[i + 1])
+            if k + 1 < len(lines):
+                dates = timeline[k + 1]
         if any(dates):
             # title/company heuristic
-            parts = re.split(r'\s[–\-|]\s', l)
+            parts = _PART_SPLIT_RE.split(l)
             title = None
             company = None
             if len(parts) >= 2:
@@ -273,20 +586,16 @@ def _parse_experience(section_lines: List[str], text: str) -> List[Dict[str, Any
             else:
                 # fallback: first token is title-ish
                 title = l
-            bullets = _parse_bullets(section_lines, i + 1)
-            # tech mentions
-            techs = []
-            for s in CANONICAL_SKILLS:
-                if re.search(rf'\b{re.escape(s)}\b', " ".join(bullets), re.I):
-                    techs.append(s)
+            bullet_ids = _parse_bullets(doc, ids, k + 1)
             out.append({
                 "title": (title or "").strip("•- ").strip(),
                 "company": (company or "").strip("•- ").strip(),
                 "start_date": dates[0],
                 "end_date": dates[1],
                 "location": None,
-                "bullets": bullets[:10],
-                "technologies": sorted(set(techs))[:20],
+                "bullets": [doc.bullet_text(i) for i in bullet_ids[:10]],
+                # tech mentions
+                "technologies": doc.terms_in(bullet_ids, "skill")[:20],
             })
     # basic ordering: most recent first by end_date
     def _year_to_int(y):
@@ -299,53 +608,35 @@ def _parse_experience(section_lines: List[str], text: str) -> List[Dict[str, Any
     out.sort(key=lambda e: _year_to_int(e.get("end_date") or "Present"), reverse=True)
     return out
 
-def detect_language_simple(text: str) -> Optional[str]:
-    # extremely naive: look for Devanagari or Latin
-    if re.search(r'[\u0900-\u097F]', text):
-        return "hi-Latn/Devanagari-mixed"
-    return "en"  # default
-
-def parse_resume(text: str) -> Dict[str, Any]:
-    t = text.strip()
-    lines = [l for l in t.splitlines() if l.strip()]
-    head = "\n".join(lines[:20])
-
-    email = (re.search(EMAIL_RE, t).group(0) if re.search(EMAIL_RE, t) else None)
-    phone = (re.search(PHONE_RE, t).group(0) if re.search(PHONE_RE, t) else None)
-    name = _guess_name(t, email)
-    links = _extract_links(t)
-    location = _detect_location(lines)
-    sections = _split_sections(t)
-    summary = _extract_summary(sections.get("_intro", []))
-    skills, buckets = _find_skill_hits(t)
-    languages = _find_languages(t)
-    education = _parse_education(sections.get("education", []))
-    experience = _parse_experience(sections.get("experience", []), t)
-
+def _parse_projects(doc: ResumeDoc) -> List[Dict[str, Any]]:
+    ids = doc.section_ids("projects")
     projects = []
-    for i, l in enumerate(sections.get("projects", [])):
+    for k, i in enumerate(ids):
+        l = doc.lines[i]
         if len(l) < 2: continue
         # "ProjectName – short desc"
-        parts = re.split(r'\s[–\-|]\s', l)
+        parts = _PART_SPLIT_RE.split(l)
         if len(parts) >= 2 and len(parts[0]) < 80:
-            bullets = _parse_bullets(sections.get("projects", []), i + 1)
-            techs = [s for s in skills if re.search(rf'\b{re.escape(s)}\b', " ".join(bullets), re.I)]
+            bullet_ids = _parse_bullets(doc, ids, k + 1)
             link = None
             m = re.search(URL_RE, l)
             if m: link = m.group(1)
             projects.append({
                 "name": parts[0].strip(),
                 "description": parts[1].strip(),
-                "bullets": bullets[:8],
-                "technologies": sorted(set(techs))[:15],
+                "bullets": [doc.bullet_text(b) for b in bullet_ids[:8]],
+                "technologies": doc.terms_in(bullet_ids, "skill")[:15],
                 "link": link,
             })
+    return projects
 
+def _parse_certifications(doc: ResumeDoc) -> List[Dict[str, Any]]:
     certs = []
-    for l in sections.get("certifications", []):
+    for i in doc.section_ids("certifications"):
+        l = doc.lines[i]
         if len(l) < 3: continue
         # "Name – Issuer (YYYY)" patterns
-        parts = re.split(r'\s[–\-|]\s', l)
+        parts = _PART_SPLIT_RE.split(l)
         name = parts[0].strip()
         issuer = parts[1].strip() if len(parts) > 1 else None
         yr = None
@@ -355,20 +646,176 @@ def parse_resume(text: str) -> Dict[str, Any]:
         m2 = re.search(URL_RE, l)
         if m2: url = m2.group(1)
         certs.append({"name": name, "issuer": issuer, "date": yr, "license": None, "url": url})
+    return certs
+
+def detect_language_simple(text: str) -> Optional[str]:
+    # extremely naive: look for Devanagari or Latin
+    if re.search(r'[\u0900-\u097F]', text):
+        return "hi-Latn/Devanagari-mixed"
+    return "en"  # default
 
+def _contact_fields(doc: ResumeDoc) -> Dict[str, Any]:
+    m = EMAIL_RE.search(doc.text)
+    email = m.group(0) if m else None
+    m = PHONE_RE.search(doc.text)
     return {
-        "detected_language": detect_language_simple(t),
-        "candidate_name": name,
+        "candidate_name": _guess_name(doc, email),
         "email": email,
-        "phone": phone,
-        "location": location,
-        "summary": summary,
-        "links": links,
-        "skills": skills,
-        "skill_groups": buckets,
-        "languages": languages,
-        "education": education,
-        "experience": experience,
-        "projects": projects,
-        "certifications": certs,
+        "phone": m.group(0) if m else None,
+        "location": _detect_location(doc),
+        "links": _extract_links(doc),
     }
+
+def _skill_fields(doc: ResumeDoc) -> Dict[str, Any]:
+    skills, buckets = _find_skill_hits(doc)
+    return {"skills": skills, "skill_groups": buckets, "languages": _find_languages(doc)}
+
+# (timing stage, fields) in the order parse_resume runs them
+_PARSE_STAGES = (
+    ("language", lambda doc: {"detected_language": detect_language_simple(doc.text)}),
+    ("contact", _contact_fields),
+    ("sections", lambda doc: {"summary": _extract_summary(doc)}),
+    ("skills", _skill_fields),
+    ("education", lambda doc: {"education": _parse_education(doc)}),
+    ("experience", lambda doc: {"experience": _parse_experience(doc)}),
+    ("projects", lambda doc: {"projects": _parse_projects(doc)}),
+    ("certifications", lambda doc: {"certifications": _parse_certifications(doc)}),
+)
+_STAGE_FIELDS = dict(_PARSE_STAGES)
+
+class ParseStage(NamedTuple):
+    """A separately cacheable slice of parse_resume (see stage_cache.py).
+
+    `laps` are the _PARSE_STAGES it runs. `code` lists further roots of what
+    its output depends on besides the document; stage_cache hashes them and
+    everything they reach through module globals (functions and classes by
+    source, patterns and constants by value), starting from the lap functions.
+    Stages with `uses_taxonomy` read vocabulary hits, so they also depend on
+    the active skill taxonomy.
+    """
+    name: str
+    laps: Tuple[str, ...]
+    code: Tuple[Any, ...]
+    uses_taxonomy: bool
+
+# Roots only: helpers, patterns and constants reached from these through module
+# globals are followed by stage_cache, so they need not be listed.
+EXTRACT_CODE = (extract_document, extract_text_from_file, _extract_pdf, iter_pdf_pages, _resume_complete, _clean_text)
+DOCUMENT_CODE = (build_document, ResumeDoc, _lower_same_length, _SECTION_HEADERS, _SKILL_HEADINGS, _SKILL_LABEL_RE,
+                 _SKILL_ITEM_RE)
+VOCABULARY_CODE = (_skill_list_hits,)
+STAGES = (
+    ParseStage("sections", ("language", "contact", "sections"),
+               (_contact_fields, _guess_name, _extract_links, _detect_location, _extract_summary, detect_language_simple,
+                _SUMMARY_STOP_HINTS, EMAIL_RE, PHONE_RE, URL_RE, _LOCATION_RE), False),
+    ParseStage("skills", ("skills",), (_skill_fields, _find_skill_hits, _find_languages), True),
+    ParseStage("history", ("education", "experience"),
+               (_parse_education, _parse_experience, _parse_bullets, _parse_timeline_line, DEGREE_WORDS, YEAR_RE,
+                DATE_RE, _TIMELINE_TOKEN_RE, _FIELD_RE, _GPA_RE, _PART_SPLIT_RE), True),
+    ParseStage("projects", ("projects", "certifications"),
+               (_parse_projects, _parse_certifications, _parse_bullets, YEAR_RE, URL_RE, _PART_SPLIT_RE), True),
+)
+
+def stage_functions(stage: ParseStage) -> List[Callable[[ResumeDoc], Dict[str, Any]]]:
+    return [_STAGE_FIELDS[lap] for lap in stage.laps]
+
+def run_stage(doc: ResumeDoc, stage: ParseStage) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for fields in stage_functions(stage):
+        out.update(fields(doc))
+    return out
+
+def limit_text(text: str, limits: ParseLimits) -> Tuple[str, Optional[str]]:
+    """`text` cut to limits.max_chars (at a line break if possible), and the truncation reason if it was cut."""
+    if not limits.max_chars or len(text) <= limits.max_chars:
+        return text, None
+    cut = text.rfind("\n", 0, limits.max_chars)
+    return text[:cut if cut > 0 else limits.max_chars], "parse_max_chars"
+
+def blank_result() -> Dict[str, Any]:
+    """parse_resume's output with every field empty, in output order."""
+    return {
+        "detected_language": None,
+        "candidate_name": None,
+        "email": None,
+        "phone": None,
+        "location": None,
+        "summary": None,
+        "links": [],
+        "skills": [],
+        "skill_groups": {},
+        "languages": [],
+        "education": [],
+        "experience": [],
+        "projects": [],
+        "certifications": [],
+        "truncated": False,
+        "truncation_reason": None,
+    }
+
+def iter_parse_resume(text: str, timings: StageTimings = NO_TIMINGS,
+                      limits: ParseLimits = NO_PARSE_LIMITS) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """parse_resume one stage at a time, for callers that show results as they come.
+
+    Yields (stage, fields) in _PARSE_STAGES order, then ("truncated", ...) if
+    a budget cut the document short. Merging every fields dict into
+    blank_result() gives parse_resume's output. Time the caller spends
+    between items counts against neither the stage timings nor the budget.
+    """
+    started = time.perf_counter()
+    timings.start()
+    text, reason = limit_text(text, limits)
+    doc = build_document(text)
+    timings.size("chars", len(doc.text))
+    timings.size("lines", len(doc.nonblank))
+    timings.lap("document")
+
+    for stage, fields in _PARSE_STAGES:
+        if limits.time_budget and time.perf_counter() - started >= limits.time_budget:
+            reason = "parse_time_budget"
+            break
+        out = fields(doc)
+        timings.lap(stage)
+        paused = time.perf_counter()
+        yield stage, out
+        started += time.perf_counter() - paused
+        timings.start()
+    if reason:
+        yield "truncated", {"truncated": True, "truncation_reason": reason}
+
+def parse_resume(text: str, timings: StageTimings = NO_TIMINGS,
+                 limits: ParseLimits = NO_PARSE_LIMITS) -> Dict[str, Any]:
+    result = blank_result()
+    for _, fields in iter_parse_resume(text, timings, limits):
+        result.update(fields)
+    return result
+
+_WARM_UP_TEXT = """Jane Doe
+jane.doe@example.com | +1 555 123 4567 | Berlin, Germany
+Skills: Python, SQL, Docker
+Experience
+Acme GmbH - Software Engineer Jan 2019 - Present
+- Built data pipelines in Python
+Education
+BSc in Computer Science, TU Berlin 2015 - 2019
+"""
+
+def warm_up(formats: Iterable[str] = ("pdf", "docx")) -> Dict[str, float]:
+    """Pay the first-request costs up front: import the extractors for `formats`
+    ("pdf", "docx"), load the active skill taxonomy and run one small parse.
+    Returns seconds spent per step."""
+    loaders = {"pdf": _pdfminer, "docx": _docx}
+    spent: Dict[str, float] = {}
+    for fmt in formats:
+        if fmt not in loaders:
+            raise ValueError(f"Unknown warm-up format {fmt!r}; use one of {', '.join(loaders)}.")
+        t0 = time.perf_counter()
+        loaders[fmt]()
+        spent[fmt] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    skill_taxonomy.active()
+    spent["taxonomy"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    parse_resume(_WARM_UP_TEXT)
+    spent["parse"] = time.perf_counter() - t0
+    return spent
@@ -0,0 +1,123 @@
+# serialize.py
+# Response bodies: Accept negotiation between JSON and msgpack, the fastest
+# available JSON encoder, and schema shaping from pydantic models without
+# per-request validation.
+import json
+import typing
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+# Optional imports: stdlib json and JSON-only negotiation without them.
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+try:
+    import msgpack
+except Exception:
+    msgpack = None
+
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+_MISSING = object()
+
+
+def dumps_json(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    # Same settings as starlette's JSONResponse
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_msgpack(obj: Any) -> bytes:
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def encode(obj: Any, media_type: str) -> bytes:
+    return dumps_msgpack(obj) if media_type in MSGPACK_TYPES else dumps_json(obj)
+
+
+def negotiate(accept: Optional[str], default: str = JSON) -> Optional[str]:
+    """Best supported media type for an Accept header: JSON (or `default`) or msgpack; None if neither is acceptable.
+
+    The most specific entry decides a type's quality, so `application/json;q=0, */*` refuses JSON.
+    """
+    if not accept:
+        return default
+    ranges: Dict[str, Tuple[float, int]] = {}  # media range -> (q, position of its first entry)
+    for i, part in enumerate(accept.split(",")):
+        media, _, params = part.partition(";")
+        media = media.strip().lower()
+        q = 1.0
+        for p in params.split(";"):
+            name, _, value = p.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        ranges.setdefault(media, (q, i))
+    offers: List[Tuple[float, int, str]] = []
+    if msgpack is not None:
+        offers += [(q, -i, media) for media, (q, i) in ranges.items() if media in MSGPACK_TYPES]
+    # Everything JSON-like selects `default`; its own entry wins over wildcards, which win over its sibling
+    for media in (default, "application/*", "*/*", JSON, NDJSON):
+        if media in ranges:
+            q, i = ranges[media]
+            offers.append((q, -i, default))
+            break
+    best = max(offers, default=None)
+    return best[2] if best is not None and best[0] > 0 else None
+
+
+def _field_default(field: Any) -> Callable[[], Any]:
+    if field.default_factory is not None:
+        return field.default_factory
+    default = field.get_default() if not field.is_required() else None
+    if isinstance(default, (list, dict)):
+        return type(default)  # fresh container; only empty defaults occur in the schemas
+    return lambda: default
+
+
+def _nested(annotation: Any) -> Tuple[Optional[Callable[[Dict[str, Any]], Dict[str, Any]]], bool]:
+    """(shaper, is_list) for a field typed as a model, a list of models, or Optional of either."""
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        return _nested(args[0]) if len(args) == 1 else (None, False)
+    if origin in (list, List):
+        inner, _ = _nested(typing.get_args(annotation)[0])
+        return inner, inner is not None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return shaper(annotation), False
+    return None, False
+
+
+def shaper(model: type) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Build a function that lays a plain dict out as `model` would serialize it.
+
+    Keys come out in schema order, missing fields get their defaults, unknown
+    keys are dropped and nested models are shaped the same way. Values are not
+    validated or coerced: the parser is trusted to produce the declared types.
+    """
+    fields = []
+    for name, field in model.model_fields.items():
+        sub, many = _nested(field.annotation)
+        fields.append((name, _field_default(field), sub, many))
+
+    def shape(data: Dict[str, Any]) -> Dict[str, Any]:
+        out = {}
+        for name, default, sub, many in fields:
+            value = data.get(name, _MISSING)
+            if value is _MISSING:
+                value = default()
+            elif sub is not None and value is not None:
+                value = [sub(v) for v in value] if many else sub(value)
+            out[name] = value
+        return out
+
+    return shape
@@ -0,0 +1,114 @@
+# skill_matcher.py
+# Single-pass multi-pattern matcher (Aho-Corasick) for the skill/language tables.
+# Built once at import; scanning cost depends on text length, not on table size.
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+
+class Hit(NamedTuple):
+    start: int
+    end: int
+    kind: str
+    term: str
+
+
+def _is_word(c: str) -> bool:
+    # Same notion of "word character" as re's \b
+    return c.isalnum() or c == "_"
+
+
+def _lower_same_length(text: str) -> str:
+    # str.lower() can change length for a handful of code points (e.g. "İ"),
+    # which would shift offsets; keep a 1:1 mapping in that case.
+    tl = text.lower()
+    if len(tl) == len(text):
+        return tl
+    return "".join(c.lower()[:1] or c for c in text)
+
+
+class TermMatcher:
+    """Case-insensitive whole-word matcher over a fixed vocabulary.
+
+    `vocab` maps a kind (e.g. "skill", "language") to its canonical terms;
+    a (surface, canonical) pair matches `surface` but reports `canonical`.
+    A hit must not be glued to a word character on either side, so
+    "C++", "C#", "Node.js" and "CI/CD" match inside ordinary prose.
+    """
+
+    def __init__(self, vocab: Dict[str, Iterable[Union[str, Tuple[str, str]]]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._terms: List[Hit] = []  # template hits: (0, len, kind, term)
+        for kind, terms in vocab.items():
+            for term in terms:
+                if isinstance(term, tuple):
+                    self._add(term[0], kind, term[1])
+                else:
+                    self._add(term, kind, term)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _add(self, term: str, kind: str, canonical: str) -> None:
+        key = _lower_same_length(term)
+        if not key:
+            return
+        node = 0
+        for c in key:
+            nxt = self._goto[node].get(c)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][c] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        if any(self._terms[k].kind == kind and self._terms[k].end == len(key) for k in self._out[node]):
+            return  # surface already registered (aliases may repeat a spelling)
+        self._out[node].append(len(self._terms))
+        self._terms.append(Hit(0, len(key), kind, canonical))
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for c, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and c not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(c, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def scan(self, text: str, start: int = 0, end: Optional[int] = None) -> List[Hit]:
+        """Return every whole-word hit in text[start:end], with absolute offsets."""
+        if end is None:
+            end = len(text)
+        tl = _lower_same_length(text)
+        goto, fail, out, terms = self._goto, self._fail, self._out, self._terms
+        hits: List[Hit] = []
+        node = 0
+        for i in range(start, end):
+            c = tl[i]
+            while node and c not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(c, 0)
+            if not out[node]:
+                continue
+            after_ok = i + 1 >= end or not _is_word(tl[i + 1])
+            if not after_ok:
+                continue
+            for idx in out[node]:
+                tmpl = terms[idx]
+                s = i + 1 - tmpl.end
+                if s > start and _is_word(tl[s - 1]):
+                    continue
+                hits.append(Hit(s, i + 1, tmpl.kind, tmpl.term))
+        return hits
+
+    def terms(self, text: str, kind: str) -> List[str]:
+        """Sorted, de-duplicated terms of one kind found in text."""
+        return sorted({h.term for h in self.scan(text) if h.kind == kind})
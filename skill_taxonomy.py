@@ -0,0 +1,270 @@
+# skill_taxonomy.py
+# Skill aliases compiled into lookup structures: the Aho-Corasick matcher for
+# scanning prose (canonical names and aliases), an exact map of normalized
+# spellings and a trigram index for typos in explicit skill lists.
+#
+#   python skill_taxonomy.py compile skill_aliases.json -o skill_taxonomy.bin
+#
+# Source format (JSON): {"format": 1, "skills": {"Kubernetes": {"aliases": ["k8s"],
+# "groups": ["DevOps"]}, ...}}. Canonical names must be in CANONICAL_SKILLS and
+# groups must be SKILL_GROUPS keys; "groups" may be omitted to keep SKILL_GROUPS
+# membership. "list_aliases" are spellings too ambiguous for prose ("js" inside
+# "Next.js", "node" as a plain word); they only resolve items of skill lists. Set RESUME_TAXONOMY_PATH to a source or compiled file; it is
+# re-read whenever its mtime changes, so a new file can be dropped in while the
+# server (and every worker process) keeps running.
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import re
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from skill_matcher import TermMatcher
+from skill_sets import CANONICAL_SKILLS, LANGUAGES, SKILL_GROUPS
+
+# Artifact: magic line, one JSON line {"code": _code_digest(), "source": validated
+# source}, then the pickled Taxonomy. The pickle is only trusted when it was built
+# by the same taxonomy code; otherwise the embedded source is compiled again.
+ARTIFACT_MAGIC = b"RESUME-TAXONOMY-2\n"
+_CODE_MODULES = ("skill_taxonomy.py", "skill_matcher.py", "skill_sets.py")
+DEFAULT_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_aliases.json")
+TAXONOMY_PATH = os.getenv("RESUME_TAXONOMY_PATH") or None
+
+_NORM_RE = re.compile(r"[^\w+#]|_")
+FUZZY_MIN_LEN = 5       # shorter spellings are too ambiguous to correct
+FUZZY_MIN_DICE = 0.5
+
+
+class TaxonomyError(ValueError):
+    pass
+
+
+def normalize(name: str) -> str:
+    """Lowercase and drop spacing/punctuation, keeping + and # ("Py Torch" -> "pytorch", "C++" -> "c++")."""
+    return _NORM_RE.sub("", name.lower())
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _within_edits(a: str, b: str, limit: int) -> bool:
+    if abs(len(a) - len(b)) > limit:
+        return False
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+        if min(cur) > limit:
+            return False
+        prev = cur
+    return prev[-1] <= limit
+
+
+class Taxonomy:
+    """Compiled skill taxonomy. Build with compile_taxonomy(); immutable afterwards."""
+
+    def __init__(self, skills: Dict[str, Dict[str, Any]], digest: str):
+        self.digest = digest
+        self.source = {"format": 1, "skills": skills}  # validated; compiles back to this taxonomy
+        self.aliases: Dict[str, List[str]] = {name: list(entry["aliases"]) for name, entry in skills.items()}
+        self.list_aliases: Dict[str, List[str]] = {name: list(entry["list_aliases"]) for name, entry in skills.items()}
+        self.groups: Dict[str, List[str]] = {g: [] for g in SKILL_GROUPS}
+        for name in CANONICAL_SKILLS:
+            for g in skills[name]["groups"]:
+                self.groups[g].append(name)
+        surfaces = [(name, name) for name in CANONICAL_SKILLS]
+        surfaces += [(alias, name) for name in CANONICAL_SKILLS for alias in self.aliases[name]]
+        self.matcher = TermMatcher({"skill": surfaces, "language": LANGUAGES})
+        self._exact: Dict[str, str] = {}
+        listed = [(alias, name) for name in CANONICAL_SKILLS for alias in self.list_aliases[name]]
+        for surface, name in surfaces + listed:
+            self._exact.setdefault(normalize(surface), name)
+        self._keys = sorted(k for k in self._exact if len(k) >= FUZZY_MIN_LEN - 1)
+        self._grams: Dict[str, List[int]] = {}
+        for i, key in enumerate(self._keys):
+            for g in _trigrams(key):
+                self._grams.setdefault(g, []).append(i)
+
+    def lookup(self, name: str, fuzzy: bool = True) -> Optional[str]:
+        """Canonical skill for a spelling, alias or (if `fuzzy`) a near-miss typo; else None."""
+        key = normalize(name)
+        if not key:
+            return None
+        hit = self._exact.get(key)
+        if hit is not None or not fuzzy or len(key) < FUZZY_MIN_LEN:
+            return hit
+        grams = _trigrams(key)
+        shared: Dict[int, int] = {}
+        for g in grams:
+            for i in self._grams.get(g, ()):
+                shared[i] = shared.get(i, 0) + 1
+        best: Optional[Tuple[float, str]] = None
+        limit = 1 if len(key) <= 7 else 2
+        for i, n in shared.items():
+            cand = self._keys[i]
+            dice = 2 * n / (len(grams) + len(_trigrams(cand)))
+            if dice < FUZZY_MIN_DICE or (best is not None and dice <= best[0]):
+                continue
+            if _within_edits(key, cand, limit):
+                best = (dice, cand)
+        return self._exact[best[1]] if best else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "digest": self.digest,
+            "skills": len(self.aliases),
+            "aliases": sum(len(a) for a in self.aliases.values()),
+            "list_aliases": sum(len(a) for a in self.list_aliases.values()),
+            "matcher_terms": len(self.matcher),
+            "path": TAXONOMY_PATH or DEFAULT_SOURCE,
+        }
+
+
+def compile_taxonomy(source: Dict[str, Any]) -> Taxonomy:
+    """Validate a parsed source document and build its lookup structures."""
+    if source.get("format") != 1:
+        raise TaxonomyError(f"Unsupported taxonomy format {source.get('format')!r}.")
+    entries = source.get("skills") or {}
+    unknown = sorted(set(entries) - set(CANONICAL_SKILLS))
+    if unknown:
+        raise TaxonomyError(f"Not in CANONICAL_SKILLS: {', '.join(unknown)}")
+    default_groups = {name: [g for g, items in SKILL_GROUPS.items() if name in items] for name in CANONICAL_SKILLS}
+    skills: Dict[str, Dict[str, Any]] = {}
+    owner: Dict[str, str] = {}
+    for name in CANONICAL_SKILLS:
+        entry = entries.get(name) or {}
+        groups = entry.get("groups", default_groups[name])
+        bad = [g for g in groups if g not in SKILL_GROUPS]
+        if bad:
+            raise TaxonomyError(f"{name}: unknown group(s) {', '.join(bad)}")
+        aliases = [a.strip() for a in entry.get("aliases", []) if a.strip()]
+        list_aliases = [a.strip() for a in entry.get("list_aliases", []) if a.strip()]
+        for a in aliases + list_aliases:
+            prev = owner.setdefault(normalize(a), name)
+            if prev != name:
+                raise TaxonomyError(f"Alias {a!r} is claimed by both {prev} and {name}.")
+        skills[name] = {"aliases": aliases, "list_aliases": list_aliases, "groups": list(groups)}
+    canonical = json.dumps({"skills": skills, "languages": LANGUAGES}, sort_keys=True)
+    return Taxonomy(skills, hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16])
+
+
+def load_source(path: str) -> Taxonomy:
+    with open(path, "r", encoding="utf-8") as f:
+        return compile_taxonomy(json.load(f))
+
+
+_code: Optional[str] = None
+
+
+def _code_digest() -> str:
+    """Hash of the modules that define the pickled classes."""
+    global _code
+    if _code is None:
+        h = hashlib.sha256()
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in _CODE_MODULES:
+            with open(os.path.join(here, name), "rb") as f:
+                h.update(f.read())
+        _code = h.hexdigest()[:16]
+    return _code
+
+
+def save_artifact(taxonomy: Taxonomy, path: str) -> None:
+    tmp = path + ".tmp"
+    header = json.dumps({"code": _code_digest(), "source": taxonomy.source}, sort_keys=True)
+    with open(tmp, "wb") as f:
+        f.write(ARTIFACT_MAGIC)
+        f.write(header.encode("utf-8") + b"\n")
+        pickle.dump(taxonomy, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)  # readers never see a half-written artifact
+
+
+def load(path: str) -> Taxonomy:
+    """Load a compiled artifact, or compile a JSON source."""
+    with open(path, "rb") as f:
+        magic = f.readline()
+        if magic == ARTIFACT_MAGIC:
+            header = json.loads(f.readline())
+            if header.get("code") != _code_digest():
+                # Built by other code: its pickled objects may not match ours
+                return compile_taxonomy(header["source"])
+            taxonomy = pickle.load(f)
+            if not isinstance(taxonomy, Taxonomy):
+                raise TaxonomyError(f"{path} is not a taxonomy artifact.")
+            return taxonomy
+        if magic.startswith(b"RESUME-TAXONOMY-"):
+            raise TaxonomyError(f"{path} is an old artifact format; compile it again from its source.")
+    return load_source(path)
+
+
+_lock = threading.Lock()
+_active: Optional[Taxonomy] = None
+_stamp: Optional[Tuple[int, int]] = None
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def active() -> Taxonomy:
+    """The taxonomy in effect, reloading RESUME_TAXONOMY_PATH if the file changed.
+
+    A file that fails to load leaves the previous taxonomy in place.
+    """
+    global _active, _stamp
+    path = TAXONOMY_PATH or DEFAULT_SOURCE
+    stamp = _file_stamp(path)
+    if _active is not None and stamp == _stamp:
+        return _active
+    with _lock:
+        if _active is None or stamp != _stamp:
+            try:
+                _active = load(path)
+            except Exception as e:
+                if _active is None:
+                    raise
+                print(f"skill taxonomy: keeping {_active.digest}, failed to load {path}: {e}", file=sys.stderr)
+            _stamp = stamp
+    return _active
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Compile or inspect a skill taxonomy.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    comp = sub.add_parser("compile", help="validate a JSON source and write a precompiled artifact")
+    comp.add_argument("source", nargs="?", default=DEFAULT_SOURCE)
+    comp.add_argument("-o", "--output", required=True)
+    look = sub.add_parser("lookup", help="resolve spellings against a source or artifact")
+    look.add_argument("names", nargs="+")
+    look.add_argument("--taxonomy", default=DEFAULT_SOURCE)
+    args = ap.parse_args(argv)
+
+    try:
+        if args.cmd == "compile":
+            taxonomy = load_source(args.source)
+            save_artifact(taxonomy, args.output)
+            print(json.dumps(taxonomy.stats()))
+        else:
+            taxonomy = load(args.taxonomy)
+            for name in args.names:
+                print(f"{name!r} -> {taxonomy.lookup(name)}")
+    except TaxonomyError as e:
+        print(f"invalid taxonomy: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    # Go through the importable module so artifacts pickle skill_taxonomy.Taxonomy, not __main__'s
+    import skill_taxonomy
+    sys.exit(skill_taxonomy.main())
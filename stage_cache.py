@@ -0,0 +1,340 @@
+# stage_cache.py
+# Per-stage parse results keyed by document hash, so editing a heuristic or the
+# skill taxonomy re-runs only the stages that depend on it, and pdfminer only
+# runs again when extraction itself changed.
+#
+#   python ingest.py resumes/ -o out.jsonl --stage-cache stages.db   # fill while ingesting
+#   python stage_cache.py status stages.db                          # stale documents per stage
+#   python stage_cache.py reprocess stages.db -o out2.jsonl -j 8    # recompute stale stages only
+#
+# Stages: text (extraction), then parser_core.STAGES: sections, skills, history
+# (education/experience) and projects (projects/certifications). A stage's
+# fingerprint hashes its code, the text stage's fingerprint, the document
+# builder and, for stages that read vocabulary hits, the active taxonomy plus
+# the matcher sources. "Its code" is the stage's lap functions and listed roots
+# plus every project function, class, pattern and constant they reach through
+# module globals, so editing a helper re-runs exactly the stages that call it. A skills-only taxonomy edit therefore leaves text and
+# sections alone and re-runs the three hit-reading stages from cached text.
+# The parse time budget is not applied here: cached output must not depend on load.
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import docx_text
+import parser_core
+import skill_taxonomy
+from parse_pool import PARSE_LIMITS
+from parser_core import STAGES, build_document, extract_text_from_file, limit_text, run_stage
+
+# Only its version is needed; a different pdfminer can lay text out differently
+try:
+    import pdfminer
+except Exception:
+    pdfminer = None
+
+TEXT = "text"
+STAGE_NAMES = (TEXT,) + tuple(s.name for s in STAGES)
+_VOCABULARY_MODULES = ("skill_matcher.py", "skill_sets.py", "skill_taxonomy.py")
+
+# stage -> (fingerprint, output)
+Cached = Dict[str, Tuple[str, Dict[str, Any]]]
+
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _project_code(obj: Any) -> bool:
+    """A function or class defined in one of this repository's files."""
+    if not (inspect.isroutine(obj) or inspect.isclass(obj)):
+        return False
+    try:
+        path = inspect.getsourcefile(obj)
+    except TypeError:  # builtins and C extensions
+        return False
+    return path is not None and os.path.abspath(path).startswith(_HERE + os.sep)
+
+
+def _code_objects(code) -> Iterator[Any]:
+    yield code
+    for const in code.co_consts:
+        if inspect.iscode(const):  # lambdas, comprehensions, nested functions
+            yield from _code_objects(const)
+
+
+def _references(obj: Any) -> Iterator[Any]:
+    """Module globals a project function (or the methods of a class) refers to."""
+    functions = [obj] if inspect.isroutine(obj) else [v for v in vars(obj).values() if inspect.isfunction(v)]
+    for fn in functions:
+        fn = inspect.unwrap(fn)
+        code, env = getattr(fn, "__code__", None), getattr(fn, "__globals__", None)
+        if code is None or env is None:
+            continue
+        for c in _code_objects(code):
+            for name in c.co_names:
+                if name in env:
+                    yield env[name]
+
+
+def _code_digest(items) -> str:
+    """Hash of `items` and everything they reach: project code by source, patterns and constants by value."""
+    h = hashlib.sha256()
+    seen: set = set()
+
+    def add(item: Any, root: bool) -> None:
+        if inspect.ismodule(item):
+            if root:
+                h.update(inspect.getsource(item).encode())
+            return  # a referenced module is an import, not this stage's code
+        if inspect.isroutine(item) or inspect.isclass(item):
+            if not _project_code(item):
+                h.update(f"{getattr(item, '__module__', '')}.{getattr(item, '__qualname__', '')}".encode())
+            elif id(item) not in seen:
+                seen.add(id(item))
+                h.update(inspect.getsource(item).encode())
+                for ref in _references(item):
+                    add(ref, False)
+        elif hasattr(item, "pattern") and hasattr(item, "flags"):
+            h.update(f"{item.pattern!r}/{item.flags}".encode())
+        elif isinstance(item, (set, frozenset)):
+            h.update(repr(sorted(item, key=repr)).encode())
+        elif isinstance(item, dict):
+            for k, v in item.items():
+                add(k, False)
+                add(v, False)
+        elif isinstance(item, (list, tuple)):
+            for v in item:
+                add(v, False)
+        elif isinstance(item, (str, bytes, int, float, bool, type(None))):
+            h.update(repr(item).encode())
+        else:
+            add(type(item), False)  # an instance: its repr may carry an address, its class source does not
+        h.update(b"\0")
+
+    for item in items:
+        add(item, True)
+    return h.hexdigest()
+
+
+def _vocabulary_digest(taxonomy_digest: str) -> str:
+    h = hashlib.sha256(taxonomy_digest.encode())
+    h.update(_code_digest(parser_core.VOCABULARY_CODE).encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in _VOCABULARY_MODULES:
+        with open(os.path.join(here, name), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+_fingerprints: Dict[str, Dict[str, str]] = {}
+
+
+def fingerprints(taxonomy: Optional[skill_taxonomy.Taxonomy] = None) -> Dict[str, str]:
+    """Current fingerprint of every stage (memoized per taxonomy)."""
+    taxonomy = taxonomy or skill_taxonomy.active()
+    fps = _fingerprints.get(taxonomy.digest)
+    if fps is not None:
+        return fps
+    pdfminer_version = getattr(pdfminer, "__version__", "?") if pdfminer is not None else "-"
+    text_fp = _code_digest(parser_core.EXTRACT_CODE + (docx_text, pdfminer_version))
+    document = _code_digest(parser_core.DOCUMENT_CODE + (limit_text, PARSE_LIMITS.max_chars))
+    vocabulary = _vocabulary_digest(taxonomy.digest)
+    fps = {TEXT: text_fp[:16]}
+    for stage in STAGES:
+        code = _code_digest(tuple(parser_core.stage_functions(stage)) + stage.code)
+        parts = (stage.name, code, text_fp, document, vocabulary if stage.uses_taxonomy else "")
+        fps[stage.name] = hashlib.sha256("\0".join(parts).encode()).hexdigest()[:16]
+    _fingerprints[taxonomy.digest] = fps
+    return fps
+
+
+def run(cached: Cached, load_text: Callable[[], str],
+        fps: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, Any], str, Cached]:
+    """Parse one document from whatever of `cached` is still current.
+
+    `load_text` is only called when the text stage is stale. Returns the
+    parse result, the extracted text and the stages that were recomputed.
+    """
+    fps = fps or fingerprints()
+    fresh: Cached = {}
+    entry = cached.get(TEXT)
+    if entry is not None and entry[0] == fps[TEXT]:
+        text = entry[1]["text"]
+    else:
+        text = load_text()
+        fresh[TEXT] = (fps[TEXT], {"text": text})
+    limited, reason = limit_text(text, PARSE_LIMITS)
+    result = parser_core.blank_result()
+    doc = None
+    for stage in STAGES:
+        entry = cached.get(stage.name)
+        if entry is None or entry[0] != fps[stage.name]:
+            if doc is None:
+                doc = build_document(limited)
+            entry = fresh[stage.name] = (fps[stage.name], run_stage(doc, stage))
+        result.update(entry[1])
+    if reason:
+        result["truncated"] = True
+        result["truncation_reason"] = reason
+    return result, text, fresh
+
+
+def _pack(value: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode(), 1)
+
+
+def _unpack(blob: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob))
+
+
+class StageCache:
+    """SQLite table of (document sha256, stage) -> (fingerprint, zlib'd JSON output)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = sqlite3.connect(path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS stage_documents (doc TEXT PRIMARY KEY, path TEXT)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS stage_results ("
+            " doc TEXT NOT NULL, stage TEXT NOT NULL, fingerprint TEXT NOT NULL, value BLOB NOT NULL,"
+            " PRIMARY KEY (doc, stage)) WITHOUT ROWID"
+        )
+
+    def load(self, doc: str) -> Cached:
+        rows = self._db.execute("SELECT stage, fingerprint, value FROM stage_results WHERE doc = ?", (doc,))
+        return {stage: (fp, _unpack(value)) for stage, fp, value in rows}
+
+    def save_many(self, items: List[Tuple[str, Optional[str], Cached]]) -> None:
+        """Store (doc, path, recomputed stages) in one transaction."""
+        with self._db:
+            self._db.execute("BEGIN")
+            for doc, path, fresh in items:
+                if path is not None:
+                    self._db.execute("INSERT OR REPLACE INTO stage_documents (doc, path) VALUES (?, ?)", (doc, path))
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO stage_results (doc, stage, fingerprint, value) VALUES (?, ?, ?, ?)",
+                    [(doc, stage, fp, _pack(value)) for stage, (fp, value) in fresh.items()],
+                )
+
+    def iter_documents(self, batch: int = 500) -> Iterator[List[Tuple[str, str, Cached]]]:
+        """Batches of (doc, path, cached stages), in doc order; safe to save_many() between batches."""
+        last = ""
+        while True:
+            docs = self._db.execute(
+                "SELECT doc, path FROM stage_documents WHERE doc > ? ORDER BY doc LIMIT ?", (last, batch)
+            ).fetchall()
+            if not docs:
+                return
+            yield [(doc, path, self.load(doc)) for doc, path in docs]
+            last = docs[-1][0]
+
+    def stale_counts(self, fps: Dict[str, str]) -> Dict[str, int]:
+        (total,) = self._db.execute("SELECT COUNT(*) FROM stage_documents").fetchone()
+        out = {}
+        for stage in STAGE_NAMES:
+            (current,) = self._db.execute(
+                "SELECT COUNT(*) FROM stage_results WHERE stage = ? AND fingerprint = ?", (stage, fps[stage])
+            ).fetchone()
+            out[stage] = total - current
+        return out
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def _reprocess_batch(batch: List[Tuple[str, str, Cached]]) -> List[Dict[str, Any]]:
+    # Module-level so it can be pickled into worker processes
+    fps = fingerprints()
+    out = []
+    for doc, path, cached in batch:
+        record: Dict[str, Any] = {"sha256": doc, "path": path}
+
+        def load_text() -> str:
+            with open(path, "rb") as f:
+                return extract_text_from_file(f.read(), path)
+
+        try:
+            record["parsed"], _, record["_stages"] = run(cached, load_text, fps)
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            record["_stages"] = {}
+        out.append(record)
+    return out
+
+
+def reprocess(db_path: str, output: str, workers: int = 1, batch: int = 500) -> Dict[str, Any]:
+    """Write a fresh ingest.py-style JSONL for every cached document, recomputing only stale stages."""
+    cache = StageCache(db_path)
+    stats: Dict[str, Any] = {"documents": 0, "errors": 0, "recomputed": {name: 0 for name in STAGE_NAMES}}
+    started = time.perf_counter()
+
+    def _finish(records: List[Dict[str, Any]], out) -> None:
+        updates = []
+        for record in records:
+            fresh = record.pop("_stages")
+            for stage in fresh:
+                stats["recomputed"][stage] += 1
+            if fresh:
+                updates.append((record["sha256"], None, fresh))
+            stats["documents"] += 1
+            stats["errors"] += "error" in record
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        cache.save_many(updates)
+
+    try:
+        with open(output, "w", encoding="utf-8") as out:
+            if workers <= 1:
+                for docs in cache.iter_documents(batch):
+                    _finish(_reprocess_batch(docs), out)
+            else:
+                # Reading ahead of the workers is bounded by the pool's own queue of batches
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    pending = []
+                    for docs in cache.iter_documents(batch):
+                        pending.append(pool.submit(_reprocess_batch, docs))
+                        if len(pending) >= workers * 2:
+                            _finish(pending.pop(0).result(), out)
+                    for fut in pending:
+                        _finish(fut.result(), out)
+    finally:
+        cache.close()
+    stats["elapsed"] = time.perf_counter() - started
+    return stats
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Inspect or reprocess a stage cache written by ingest.py --stage-cache.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    status = sub.add_parser("status", help="documents whose cached output is stale, per stage")
+    status.add_argument("db")
+    rep = sub.add_parser("reprocess", help="recompute stale stages and write JSONL for every document")
+    rep.add_argument("db")
+    rep.add_argument("-o", "--output", required=True, help="JSONL output (ingest.py record format)")
+    rep.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    rep.add_argument("--batch", type=int, default=500)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "status":
+        cache = StageCache(args.db)
+        try:
+            fps = fingerprints()
+            print(json.dumps({"fingerprints": fps, "stale": cache.stale_counts(fps)}, indent=2))
+        finally:
+            cache.close()
+        return 0
+    stats = reprocess(args.db, args.output, args.workers or os.cpu_count() or 1, args.batch)
+    print(json.dumps(stats), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+# tests/conftest.py
+# The app reads its configuration at import; point every on-disk store at a
+# scratch directory before any test imports it.
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_scratch = tempfile.mkdtemp(prefix="resume-tests-")
+os.environ.setdefault("RESUME_JOBS_PATH", os.path.join(_scratch, "jobs.db"))
+os.environ.setdefault("RESUME_EXEC_MODE", "inline")
+os.environ.setdefault("RESUME_RATE_LIMIT", "0")
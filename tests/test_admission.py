@@ -0,0 +1,73 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import admission
+from admission import Admission, AdmissionMiddleware
+
+
+def _client(adm, limit=100):
+    api = FastAPI()
+
+    @api.post("/echo")
+    async def echo(request: Request):
+        return {"bytes": len(await request.body())}
+
+    api.add_middleware(AdmissionMiddleware, admission=adm,
+                       identify=lambda scope: dict(scope["headers"]).get(b"x-api-key", b"").decode() or None,
+                       body_limit=lambda path: limit)
+    return TestClient(api)
+
+
+def test_declared_oversize_body_is_refused_before_reading():
+    adm = Admission(rate=0, concurrency=0)
+    with _client(adm) as client:
+        assert client.post("/echo", content=b"x" * 100).json() == {"bytes": 100}
+        r = client.post("/echo", content=b"x" * 101)
+    assert r.status_code == 413
+    assert adm.stats()["too_large"] == 1
+
+
+def test_chunked_oversize_body_is_cut_off_while_streaming():
+    adm = Admission(rate=0, concurrency=0)
+
+    def chunks():
+        for _ in range(10):
+            yield b"x" * 30
+
+    with _client(adm) as client:
+        r = client.post("/echo", content=chunks())  # no Content-Length: counted as it arrives
+    assert r.status_code == 413
+    assert adm.stats()["too_large"] == 1
+
+
+def test_rate_limit_returns_429_with_retry_after(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(admission.time, "monotonic", lambda: now[0])
+    adm = Admission(rate=0.5, burst=2, concurrency=0)
+    with _client(adm) as client:
+        codes = [client.post("/echo", headers={"x-api-key": "k"}).status_code for _ in range(3)]
+        r = client.post("/echo", headers={"x-api-key": "k"})
+        other = client.post("/echo", headers={"x-api-key": "other"})
+        now[0] += 2  # one token back at 0.5/s
+        refilled = client.post("/echo", headers={"x-api-key": "k"})
+    assert codes == [200, 200, 429]
+    assert r.status_code == 429 and r.headers["retry-after"] == "2"
+    assert other.status_code == 200  # buckets are per client
+    assert refilled.status_code == 200
+
+
+def test_concurrency_cap_and_release():
+    adm = Admission(rate=0, concurrency=1)
+    assert adm.admit("k") is None
+    assert adm.admit("k") == ("concurrency", 1)
+    adm.release("k")
+    assert adm.admit("k") is None
+
+
+def test_idle_clients_are_forgotten_first():
+    adm = Admission(rate=0, concurrency=5, max_clients=2)
+    adm.admit("busy")
+    adm.admit("idle")
+    adm.release("idle")
+    adm.admit("new")
+    assert adm.stats()["clients"] == 2 and adm.stats()["in_flight"] == 2
@@ -0,0 +1,68 @@
+# tests/test_batch.py
+import asyncio
+import io
+import json
+import threading
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+
+HEADERS = {"x-api-key": "dev"}
+
+
+def _zip(members):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        for name, data in members.items():
+            z.writestr(name, data)
+    return buf.getvalue()
+
+
+def test_batch_streams_zip_members_and_files(monkeypatch):
+    threads = set()
+    real = app._batch_sources
+
+    def recording(uploads):
+        for item in real(uploads):
+            threads.add(threading.get_ident())
+            yield item
+
+    monkeypatch.setattr(app, "_batch_sources", recording)
+    archive = _zip({"a.txt": "Ann Lee\nann@example.com\n", "b.txt": "Bo Kim\nbo@example.com\n"})
+    with TestClient(app.app) as client:
+        loop_thread = client.portal.call(threading.get_ident)
+        r = client.post("/parse/batch", headers=HEADERS, files=[
+            ("files", ("resumes.zip", archive)),
+            ("files", ("c.txt", b"Cy Roe\ncy@example.com\n")),
+        ])
+    assert r.status_code == 200
+    items = sorted((json.loads(line) for line in r.text.splitlines()), key=lambda i: i["index"])
+    assert [i["result"]["email"] for i in items] == ["ann@example.com", "bo@example.com", "cy@example.com"]
+    assert threads and loop_thread not in threads
+
+
+def test_disconnect_during_read_still_closes_uploads(monkeypatch):
+    entered, release = threading.Event(), threading.Event()
+
+    def slow(uploads):
+        entered.set()
+        release.wait(5)
+        yield "a.txt", b"Ann Lee\n", None
+
+    monkeypatch.setattr(app, "_batch_sources", slow)
+    uploads = [("a.txt", io.BytesIO(b"Ann Lee\n")), ("b.txt", io.BytesIO(b"Bo Kim\n"))]
+
+    async def run():
+        stream = app._stream_batch(uploads, False)
+        step = asyncio.ensure_future(stream.__anext__())
+        await asyncio.to_thread(entered.wait, 5)
+        step.cancel()  # the client went away while the read is in flight
+        threading.Timer(0.1, release.set).start()
+        with pytest.raises(asyncio.CancelledError):
+            await step
+
+    asyncio.run(run())
+    assert all(fileobj.closed for _, fileobj in uploads)
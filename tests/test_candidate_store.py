@@ -0,0 +1,97 @@
+# tests/test_candidate_store.py
+import pytest
+from fastapi.testclient import TestClient
+
+from candidate_store import MAX_QUERY_DEPTH, MAX_QUERY_LENGTH, CandidateStore, QuerySyntaxError, parse_query
+
+PY = ("all", ["skill:python"])
+JAVA = ("all", ["skill:java"])
+GO = ("all", ["skill:go"])
+
+
+@pytest.mark.parametrize("query, tree", [
+    ("python", PY),
+    ("python java", ("and", [PY, JAVA])),
+    ("python AND java", ("and", [PY, JAVA])),
+    ("python OR java AND go", ("or", [PY, ("and", [JAVA, GO])])),
+    ("(python OR java) go", ("and", [("or", [PY, JAVA]), GO])),
+    ("NOT (python OR go)", ("not", ("or", [PY, GO]))),
+    ("NOT NOT python", ("not", ("not", PY))),
+    ("skill:k8s", ("all", ["skill:kubernetes"])),
+    ("english", ("all", ["lang:english"])),
+    ('loc:"new york" end>=2022', ("and", [("all", ["loc:new", "loc:york"]), ("range", "end", ">=", 2022)])),
+    ("start<2010", ("range", "start", "<", 2010)),
+    ("end=present", ("range", "end", "=", 9999)),
+    ('"san francisco"', ("all", ["loc:san", "loc:francisco"])),
+])
+def test_grammar(query, tree):
+    assert parse_query(query) == tree
+
+
+@pytest.mark.parametrize("query", [
+    "", "python AND", "OR python", "(python", "python)", "foo:bar", "middle>=2020", "end>=soon", "NOT",
+])
+def test_syntax_errors(query):
+    with pytest.raises(QuerySyntaxError):
+        parse_query(query)
+
+
+def test_nesting_is_bounded():
+    parse_query("(" * MAX_QUERY_DEPTH + "python" + ")" * MAX_QUERY_DEPTH)
+    parse_query("NOT " * MAX_QUERY_DEPTH + "python")
+    for query in ("(" * 2000 + "python" + ")" * 2000, "NOT " * 3000 + "python",
+                  "(" * (MAX_QUERY_DEPTH + 1) + "python" + ")" * (MAX_QUERY_DEPTH + 1)):
+        with pytest.raises(QuerySyntaxError):
+            parse_query(query)
+
+
+def test_length_is_bounded():
+    with pytest.raises(QuerySyntaxError):
+        parse_query("python OR " * (MAX_QUERY_LENGTH // 10) + "java")
+
+
+def test_search_endpoint_rejects_deep_queries(tmp_path, monkeypatch):
+    import app
+    monkeypatch.setattr(app, "CANDIDATE_STORE", CandidateStore(str(tmp_path / "store.db")))
+    client = TestClient(app.app)
+    headers = {"x-api-key": "dev"}
+    for q in ("(" * 400 + "python" + ")" * 400, "NOT " * 400 + "python"):
+        assert client.get("/candidates/search", params={"q": q}, headers=headers).status_code == 400
+    assert client.get("/candidates/search", params={"q": "x" * (MAX_QUERY_LENGTH + 1)},
+                      headers=headers).status_code == 422
+    assert client.get("/candidates/search", params={"q": "python"}, headers=headers).status_code == 200
+
+
+def _parsed(*skills):
+    return {"skills": list(skills), "experience": []}
+
+
+def test_two_writers_keep_each_others_postings(tmp_path):
+    path = str(tmp_path / "store.db")
+    a = CandidateStore(path)
+    b = CandidateStore(path)
+    a.add("a1", _parsed("Python"))
+    b.add("b1", _parsed("Python"))
+    a.add("a2", _parsed("Python", "Go"))
+    b.flush()
+    a.flush()  # used to overwrite b's posting list for skill:python
+    a.close()
+    b.close()
+    reopened = CandidateStore(path)
+    found = {r["id"] for r in reopened.search("python")["results"]}
+    assert found == {"a1", "a2", "b1"}
+    assert {r["id"] for r in reopened.search("go")["results"]} == {"a2"}
+    reopened.close()
+
+
+def test_unflushed_docs_are_reindexed_on_open(tmp_path):
+    path = str(tmp_path / "store.db")
+    a = CandidateStore(path)
+    b = CandidateStore(path)
+    a.add("a1", _parsed("Java"))   # never flushed: a "crashes"
+    b.add("b1", _parsed("Java"))
+    b.flush()
+    b.close()
+    reopened = CandidateStore(path)
+    assert {r["id"] for r in reopened.search("java")["results"]} == {"a1", "b1"}
+    reopened.close()
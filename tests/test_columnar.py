@@ -0,0 +1,76 @@
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import columnar
+from parser_core import parse_resume
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq  # noqa: E402
+
+RESUMES = {
+    "h1": "Ann Lee\nann@example.com\nSkills: Python, Docker\nExperience\nAcme - Engineer 2019 - 2022\n"
+          "- Built services in Python\nInitech - Intern 2018 - 2019\n- Tested things\n",
+    "h2": "Bo Kim\nbo@example.com\nSkills: Go\nEducation\nBSc in Physics, MIT 2014 - 2018\n",
+}
+PARSED = {h: parse_resume(t) for h, t in RESUMES.items()}
+
+
+@pytest.mark.parametrize("fmt", columnar.FORMATS)
+def test_exporter_round_trip(tmp_path, fmt):
+    exporter = columnar.ColumnarExporter(str(tmp_path), fmt, row_group_size=1)
+    assert exporter.add_many(PARSED.items()) == 2
+    rows = exporter.close()
+    assert rows["documents"] == 2
+    assert rows["experience"] == len(PARSED["h1"]["experience"]) + len(PARSED["h2"]["experience"])
+
+    path = exporter.paths["documents"]
+    if fmt == "parquet":
+        assert pq.ParquetFile(path).num_row_groups == 2  # one per row_group_size rows
+        docs = pq.read_table(path)
+    else:
+        with pa.OSFile(path, "rb") as f:
+            docs = pa.ipc.open_stream(f).read_all()
+    assert docs.schema == columnar.schema("documents")
+    out = docs.to_pylist()
+    assert [d["doc_hash"] for d in out] == ["h1", "h2"]
+    assert [d["email"] for d in out] == ["ann@example.com", "bo@example.com"]
+    assert out[0]["skills"] == PARSED["h1"]["skills"]
+    assert out[0]["experience_count"] == len(PARSED["h1"]["experience"])
+    assert pa.types.is_dictionary(docs.schema.field("skills").type.value_type)
+
+
+def test_child_rows_keep_document_order(tmp_path):
+    exporter = columnar.ColumnarExporter(str(tmp_path))
+    exporter.add_many(PARSED.items())
+    exporter.close()
+    rows = pq.read_table(exporter.paths["experience"]).to_pylist()
+    expected = PARSED["h1"]["experience"]
+    assert [(r["doc_hash"], r["position"]) for r in rows] == [("h1", i) for i in range(len(expected))]
+    assert [r["company"] for r in rows] == [e.get("company") for e in expected]
+
+
+@pytest.mark.parametrize("fmt", columnar.FORMATS)
+def test_iter_table_bytes_matches_the_file_export(fmt):
+    body = b"".join(columnar.iter_table_bytes(PARSED.items(), "documents", fmt, row_group_size=1))
+    if fmt == "parquet":
+        table = pq.read_table(io.BytesIO(body))
+    else:
+        table = pa.ipc.open_stream(body).read_all()
+    assert table.column("doc_hash").to_pylist() == ["h1", "h2"]
+
+
+def test_export_endpoint_streams_the_corpus(tmp_path, monkeypatch):
+    import app
+
+    source = tmp_path / "out.jsonl"
+    source.write_text("".join(json.dumps({"sha256": h, "parsed": p}) + "\n" for h, p in PARSED.items()))
+    monkeypatch.setattr(app, "EXPORT_SOURCES", [str(source)])
+    with TestClient(app.app) as client:
+        r = client.get("/export/documents", headers={"x-api-key": "dev"})
+        missing = client.get("/export/nope", headers={"x-api-key": "dev"})
+    assert r.status_code == 200
+    assert pq.read_table(io.BytesIO(r.content)).column("email").to_pylist() == ["ann@example.com", "bo@example.com"]
+    assert missing.status_code == 404
@@ -0,0 +1,36 @@
+# tests/test_dedup.py
+from dedup import DedupIndex, cluster, fingerprint
+
+
+def _text(n: int) -> str:
+    return " ".join(f"word{n}x{i}" for i in range(40))
+
+
+def test_index_is_capped_and_evicts_least_recently_used():
+    index = DedupIndex(max_docs=3)
+    for n in range(3):
+        assert index.check(f"d{n}", _text(n)) is None
+    assert index.check("again", _text(0)) == ("d0", 1.0)  # d0 is now the most recently used
+    index.check("d3", _text(3))
+    assert len(index) == 3
+    assert index.check("probe1", _text(1)) is None  # d1 was evicted
+    assert index.check("probe0", _text(0)) == ("d0", 1.0)
+    assert index.stats()["evicted"] == 2  # d1, then d2 to make room for probe1
+    buckets = sum(len(ids) for band in index._buckets for ids in band.values())
+    assert buckets == len(index) * 16
+    assert len(index._exact) == len(index)
+
+
+def test_persisted_index_honours_the_cap(tmp_path):
+    path = str(tmp_path / "dedup.db")
+    index = DedupIndex(path=path, max_docs=2)
+    for n in range(4):
+        index.check(f"d{n}", _text(n))
+    reopened = DedupIndex(path=path, max_docs=2)
+    assert sorted(reopened._docs) == ["d2", "d3"]
+    assert reopened.check("probe", _text(3)) == ("d3", 1.0)
+
+
+def test_cluster_is_unbounded():
+    items = [(f"d{n}", fingerprint(_text(n % 2))) for n in range(6)]
+    assert cluster(items) == [["d0", "d2", "d4"], ["d1", "d3", "d5"]]
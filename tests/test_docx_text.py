@@ -0,0 +1,84 @@
+import io
+
+import pytest
+
+from docx_text import extract_docx_text
+
+docx = pytest.importorskip("docx")
+from docx.oxml import parse_xml  # noqa: E402
+from docx.shared import Inches  # noqa: E402
+
+MC = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+WPS = "http://schemas.microsoft.com/office/word/2010/wordprocessingShape"
+V = "urn:schemas-microsoft-com:vml"
+
+# A DrawingML text box plus the VML copy Word writes for older readers
+TEXT_BOX = f"""
+<w:r xmlns:w="{W}" xmlns:mc="{MC}" xmlns:wps="{WPS}" xmlns:v="{V}">
+  <mc:AlternateContent>
+    <mc:Choice Requires="wps"><w:drawing><wps:txbx><w:txbxContent>
+      <w:p><w:r><w:t>Languages: Python</w:t></w:r></w:p>
+    </w:txbxContent></wps:txbx></w:drawing></mc:Choice>
+    <mc:Fallback><w:pict><v:textbox><w:txbxContent>
+      <w:p><w:r><w:t>Languages: Python</w:t></w:r></w:p>
+    </w:txbxContent></v:textbox></w:pict></mc:Fallback>
+  </mc:AlternateContent>
+</w:r>"""
+
+
+def _build():
+    doc = docx.Document()
+    doc.sections[0].header.paragraphs[0].text = "Jane Doe | jane@example.com"
+    p = doc.add_paragraph("Acme Corp")
+    p.paragraph_format.tab_stops.add_tab_stop(Inches(3))
+    p.paragraph_format.tab_stops.add_tab_stop(Inches(5))
+    run = doc.add_paragraph().add_run("Engineer")
+    run.add_tab()
+    run.add_text("2020 - 2022")
+    doc.add_paragraph().add_run("line one").add_break()
+    table = doc.add_table(rows=2, cols=2)
+    for r, row in enumerate((("Company", "Title"), ("Initech", "Developer"))):
+        for c, text in enumerate(row):
+            table.cell(r, c).text = text
+    box = doc.add_paragraph()
+    box._p.append(parse_xml(TEXT_BOX))
+    doc.add_paragraph("Skills")
+    buf = io.BytesIO()
+    doc.save(buf)
+    return doc, buf.getvalue()
+
+
+def test_matches_python_docx():
+    doc, content = _build()
+    expected = [doc.sections[0].header.paragraphs[0].text]
+    for block in doc.iter_inner_content():
+        if isinstance(block, docx.table.Table):
+            expected += [" | ".join(c.text for c in row.cells) for row in block.rows]
+        else:
+            if block._p.xpath(".//w:txbxContent"):
+                expected.append("Languages: Python")  # python-docx doesn't read text boxes
+            expected.append(block.text)
+    assert extract_docx_text(content) == "\n".join(expected)
+    assert "Acme Corp\nEngineer\t2020 - 2022\nline one\n\n" in extract_docx_text(content)
+
+
+def test_headers_tables_and_text_boxes():
+    doc, content = _build()
+    lines = extract_docx_text(content).split("\n")
+    assert lines[0] == doc.sections[0].header.paragraphs[0].text
+    rows = [" | ".join(c.text for c in row.cells) for row in doc.tables[0].rows]
+    assert rows == ["Company | Title", "Initech | Developer"]
+    assert all(r in lines for r in rows)
+    assert lines.count("Languages: Python") == 1  # the VML fallback is not repeated
+    assert lines.index("Languages: Python") < lines.index("Skills")
+
+
+def test_tab_stop_definitions_emit_nothing():
+    doc = docx.Document()
+    p = doc.add_paragraph("Acme Corp")
+    p.paragraph_format.tab_stops.add_tab_stop(Inches(3))
+    p.paragraph_format.tab_stops.add_tab_stop(Inches(5))
+    buf = io.BytesIO()
+    doc.save(buf)
+    assert extract_docx_text(buf.getvalue()) == doc.paragraphs[0].text == "Acme Corp"
@@ -0,0 +1,29 @@
+import ingest
+from ingest import OFFLINE_LIMITS, load_checkpoint, process_file
+
+
+def test_offline_parse_has_no_time_budget(tmp_path, monkeypatch):
+    path = tmp_path / "a.txt"
+    path.write_text("Jane Doe\njane@example.com\n")
+    seen = []
+    monkeypatch.setattr(ingest, "parse_resume", lambda text, limits: seen.append(limits) or {})
+    record = process_file(str(path), "digest")
+    assert "error" not in record
+    assert seen == [OFFLINE_LIMITS]
+    assert OFFLINE_LIMITS.time_budget == 0
+    assert OFFLINE_LIMITS.max_chars == ingest.PARSE_LIMITS.max_chars
+
+
+def test_errors_are_not_checkpointed_and_retry_on_resume(tmp_path):
+    root = tmp_path / "in"
+    root.mkdir()
+    (root / "good.txt").write_text("Jane Doe\njane@example.com\n")
+    (root / "bad.pdf").write_bytes(b"%PDF-1.4 not really a pdf")
+    out, ckpt = str(tmp_path / "out.jsonl"), str(tmp_path / "done.txt")
+
+    first = ingest.ingest(str(root), out, workers=1, checkpoint=ckpt)
+    assert (first["documents"], first["errors"]) == (2, 1)
+    assert load_checkpoint(ckpt) == {ingest.file_sha256(str(root / "good.txt"))}
+
+    second = ingest.ingest(str(root), out, workers=1, checkpoint=ckpt)
+    assert (second["resumed"], second["documents"], second["errors"]) == (1, 1, 1)
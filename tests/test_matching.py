@@ -0,0 +1,57 @@
+
+import matching
+import skill_taxonomy
+from matching import CandidateIndex, JobSpec
+
+
+def _index(candidates):
+    index = CandidateIndex(capacity=2)
+    index.add_many(candidates.items())
+    return index
+
+
+def test_top_k_scores_exact_and_related_skills():
+    index = _index({
+        "full": ["Python", "Docker"],
+        "related": ["Java", "Kubernetes"],   # same groups as Python / Docker, not the skills
+        "partial": ["Python"],
+        "none": ["Figma"],
+    })
+    results = index.top_k(JobSpec(["Python", "Docker"]), k=10, related_credit=0.25)
+    assert [r["id"] for r in results] == ["full", "partial", "related", "none"]
+    scores = {r["id"]: r["score"] for r in results}
+    assert scores == {"full": 1.0, "partial": 0.5, "related": 0.25, "none": 0.0}
+    assert results[1]["missing_required"] == ["Docker"]
+
+
+def test_top_k_filters_and_preferred_weight():
+    index = _index({"a": ["Python"], "b": ["Python", "Go"], "c": ["Go"]})
+    job = JobSpec(["Python"], preferred=["Go"], preferred_weight=0.5)
+    results = index.top_k(job, k=2)
+    assert [r["id"] for r in results] == ["b", "a"]
+    assert results[0]["matched_preferred"] == ["Go"]
+    assert [r["id"] for r in index.top_k(job, require_all=True)] == ["b", "a"]
+    assert [r["id"] for r in index.top_k(job, min_score=0.9)] == ["b"]
+
+
+def test_aliases_are_resolved_once_per_skill(monkeypatch):
+    calls = []
+    real = matching.canonical_skill
+    monkeypatch.setattr(matching, "canonical_skill", lambda name, fuzzy=False: calls.append(name) or real(name, fuzzy))
+    index = _index({"a": ["k8s", "Python", "not a skill"]})
+    assert sorted(calls) == ["k8s", "not a skill"]
+    assert index.top_k(JobSpec(["Kubernetes"]))[0]["score"] == 1.0
+
+
+def test_related_credit_follows_taxonomy_groups(monkeypatch, tmp_path):
+    index = _index({"figma": ["Figma"]})
+    job = JobSpec(["React"])
+    assert index.top_k(job, related_credit=0.5)[0]["score"] == 0.0
+
+    # A taxonomy that also puts Figma in Frontend (and keeps it in Design)
+    source = {"format": 1, "skills": {"Figma": {"groups": ["Design", "Frontend"]}}}
+    regrouped = skill_taxonomy.compile_taxonomy(source)
+    monkeypatch.setattr(skill_taxonomy, "active", lambda: regrouped)
+    job = JobSpec(["React"])
+    assert index.top_k(job, related_credit=0.5)[0]["score"] == 0.5
+    assert index.top_k(JobSpec(["Figma"]))[0]["score"] == 1.0
@@ -0,0 +1,71 @@
+import parse_cache
+from parse_cache import ParseCache
+
+
+def test_hit_returns_a_fresh_copy():
+    cache = ParseCache(max_entries=4)
+    key = cache.key(b"resume", "txt")
+    assert cache.get(key) is None
+    cache.put(key, {"skills": ["Python"]})
+    first = cache.get(key)
+    first["skills"].append("mutated")
+    assert cache.get(key) == {"skills": ["Python"]}
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (2, 1)
+
+
+def test_key_depends_on_content_kind_and_version():
+    cache = ParseCache()
+    assert cache.key(b"a", "pdf") != cache.key(b"b", "pdf")
+    assert cache.key(b"a", "pdf") != cache.key(b"a", "txt")
+    assert cache.key(b"a", "pdf", "tax1") != cache.key(b"a", "pdf", "tax2")
+    assert cache.key(b"a", "PDF") == cache.key(b"a", "pdf")
+
+
+def test_lru_evicts_least_recently_used_by_count_and_bytes():
+    cache = ParseCache(max_entries=2)
+    for k in ("a", "b"):
+        cache.put(k, {"k": k})
+    cache.get("a")                 # "b" is now the oldest
+    cache.put("c", {"k": "c"})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"k": "a"} and cache.get("c") == {"k": "c"}
+    assert cache.stats()["evictions"] == 1
+
+    small = ParseCache(max_entries=100, max_bytes=40)
+    small.put("x", {"v": "x" * 20})
+    small.put("y", {"v": "y" * 20})
+    assert small.get("x") is None and small.get("y") is not None
+    small.put("huge", {"v": "z" * 100})  # larger than the whole tier: not kept in memory
+    assert small.stats()["entries"] == 1
+
+
+def test_ttl_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(parse_cache.time, "time", lambda: now[0])
+    cache = ParseCache(ttl=10)
+    cache.put("k", {"v": 1})
+    now[0] += 11
+    assert cache.get("k") is None
+
+
+def test_sqlite_tier_round_trip(tmp_path):
+    path = str(tmp_path / "cache.db")
+    writer = ParseCache(path=path)
+    key = writer.key(b"resume", "pdf")
+    writer.put(key, {"email": "ann@example.com", "skills": ["Go"]})
+
+    reader = ParseCache(path=path)  # a restart or another worker: empty memory tier
+    assert reader.get(key) == {"email": "ann@example.com", "skills": ["Go"]}
+    stats = reader.stats()
+    assert (stats["disk_hits"], stats["entries"], stats["disk_entries"]) == (1, 1, 1)
+    assert reader.get(key) is not None and reader.stats()["hits"] == 1
+
+
+def test_fingerprint_change_misses_old_entries(tmp_path):
+    path = str(tmp_path / "cache.db")
+    old = ParseCache(path=path)
+    key = old.key(b"resume", "pdf")
+    old.put(key, {"v": 1})
+    new = ParseCache(path=path, salt="parser-v2")
+    assert new.key(b"resume", "pdf") != key
+    assert new.get(new.key(b"resume", "pdf")) is None
@@ -0,0 +1,124 @@
+# tests/test_parse_jobs.py
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from parse_jobs import JobQueue, post_callback
+
+from conftest import ROOT
+
+
+def _queue(path, lease=60.0) -> JobQueue:
+    q = JobQueue(str(path), lease=lease)
+    q.open()
+    return q
+
+
+def test_opening_a_second_queue_leaves_running_jobs_alone(tmp_path):
+    a = _queue(tmp_path / "jobs.db")
+    job_id = a.enqueue("r.txt", None, "hello", {})
+    assert a.claim()["id"] == job_id
+    b = _queue(tmp_path / "jobs.db")  # e.g. another uvicorn worker starting up
+    assert b.claim() is None
+    assert b.get(job_id)["status"] == "running"
+    assert a.complete(job_id, {"ok": True})
+    assert b.get(job_id)["status"] == "done"
+
+
+def test_expired_lease_is_reclaimed_and_old_owner_loses_it(tmp_path):
+    a = _queue(tmp_path / "jobs.db", lease=0.05)
+    b = _queue(tmp_path / "jobs.db")
+    job_id = a.enqueue("r.txt", None, "hello", {})
+    assert a.claim()["id"] == job_id
+    time.sleep(0.1)
+    assert b.claim()["id"] == job_id
+    assert not a.renew(job_id)
+    assert not a.complete(job_id, {"from": "a"})
+    assert b.complete(job_id, {"from": "b"})
+    assert b.get(job_id)["result"] == {"from": "b"}
+    assert b.get(job_id)["attempts"] == 2
+
+
+def test_renew_keeps_the_job(tmp_path):
+    a = _queue(tmp_path / "jobs.db", lease=0.2)
+    b = _queue(tmp_path / "jobs.db")
+    job_id = a.enqueue("r.txt", None, "hello", {})
+    a.claim()
+    for _ in range(3):
+        time.sleep(0.1)
+        assert a.renew(job_id)
+    assert b.claim() is None
+
+
+def test_requeue_only_applies_to_the_owner(tmp_path):
+    a = _queue(tmp_path / "jobs.db")
+    b = _queue(tmp_path / "jobs.db")
+    job_id = a.enqueue("r.txt", None, "hello", {})
+    a.claim()
+    b.requeue(job_id)
+    assert a.get(job_id)["status"] == "running"
+    a.requeue(job_id)
+    assert b.claim()["id"] == job_id
+
+
+def test_importing_app_does_not_create_the_jobs_file(tmp_path):
+    env = dict(os.environ, RESUME_JOBS_PATH=str(tmp_path / "jobs.db"))
+    subprocess.run([sys.executable, "-c", "import app"], cwd=ROOT, env=env, check=True, capture_output=True)
+    assert not (tmp_path / "jobs.db").exists()
+
+
+def test_callback_does_not_follow_redirects():
+    hits = []
+
+    class Target(BaseHTTPRequestHandler):
+        def do_POST(self):
+            hits.append(self.path)
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    target = HTTPServer(("127.0.0.1", 0), Target)
+
+    class Redirect(Target):
+        def do_POST(self):
+            self.send_response(307)
+            self.send_header("Location", f"http://127.0.0.1:{target.server_port}/elsewhere")
+            self.end_headers()
+
+    redirect = HTTPServer(("127.0.0.1", 0), Redirect)
+    for server in (target, redirect):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        status = post_callback(f"http://127.0.0.1:{redirect.server_port}/hook", {"id": "x"}, attempts=1)
+    finally:
+        target.shutdown()
+        redirect.shutdown()
+    assert status == "HTTP 307: redirect refused"
+    assert hits == []
+
+
+def test_callback_payload_matches_job_status(monkeypatch):
+    import app
+    import parse_jobs
+    from fastapi.testclient import TestClient
+
+    sent = []
+    monkeypatch.setattr(parse_jobs, "post_callback", lambda url, payload: sent.append(payload) or "ok")
+    with TestClient(app.app) as client:
+        r = client.post("/parse/jobs", headers={"x-api-key": "dev"},
+                        data={"text": "Ann Lee\nann@example.com\n", "callback_url": "http://localhost/hook"})
+        job_id = r.json()["id"]
+        for _ in range(200):
+            if sent:
+                break
+            time.sleep(0.02)
+        status = client.get(f"/parse/jobs/{job_id}", headers={"x-api-key": "dev"}).json()
+    assert sent, "callback was not sent"
+    status.pop("callback_status", None)
+    assert sent[0] == status
+    assert status["result"]["email"] == "ann@example.com"
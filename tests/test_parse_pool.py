@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+from parse_pool import ParsePool, PoolSaturated
+
+HEADERS = {"x-api-key": "dev"}
+
+
+def test_pool_rejects_beyond_workers_plus_queue():
+    release = threading.Event()
+    pool = ParsePool("thread", workers=1, queue_size=1)
+
+    async def run():
+        busy = [asyncio.ensure_future(pool.run(release.wait, 5)) for _ in range(pool.capacity)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(PoolSaturated):
+            await pool.run(time.sleep, 0)
+        release.set()
+        assert await asyncio.gather(*busy) == [True, True]
+        assert await pool.run(sum, [1, 2]) == 3  # slots are free again
+
+    asyncio.run(run())
+    stats = pool.stats()
+    assert (stats["rejected"], stats["completed"], stats["in_flight"]) == (1, 3, 0)
+
+
+def test_timeout_keeps_the_slot_until_the_worker_finishes():
+    release = threading.Event()
+    pool = ParsePool("thread", workers=1, queue_size=0, timeout=0.05)
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(release.wait, 5)
+        assert pool.stats()["in_flight"] == 1
+        with pytest.raises(PoolSaturated):
+            await pool.run(time.sleep, 0)
+        release.set()
+        for _ in range(100):
+            if pool.stats()["in_flight"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert await pool.run(sum, [1]) == 1
+
+    asyncio.run(run())
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_iterate_streams_items_and_times_out():
+    pool = ParsePool("thread", workers=1, queue_size=0, timeout=0.2)
+
+    def slow():
+        yield 1
+        time.sleep(1)
+        yield 2
+
+    async def run():
+        got = []
+        with pytest.raises(asyncio.TimeoutError):
+            async for item in pool.iterate(slow):
+                got.append(item)
+        return got
+
+    assert asyncio.run(run()) == [1]
+
+
+def test_saturated_pool_returns_503_with_retry_after(monkeypatch):
+    pool = ParsePool("thread", workers=1, queue_size=0)
+    monkeypatch.setattr(app, "PARSE_POOL", pool)
+    pool._acquire()  # another request holds the only slot
+    with TestClient(app.app) as client:
+        r = client.post("/parse", headers=HEADERS, data={"text": "Saturated Sam\nsam@example.com\n"})
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == "1"
+
+
+def test_parse_timeout_returns_504(monkeypatch):
+    pool = ParsePool("thread", workers=1, queue_size=0, timeout=0.05)
+    monkeypatch.setattr(app, "PARSE_POOL", pool)
+    monkeypatch.setattr(app, "run_parse", lambda *args: time.sleep(0.5))
+    with TestClient(app.app) as client:
+        r = client.post("/parse", headers=HEADERS, data={"text": "Slow Sue\nsue@example.com\n"})
+    assert r.status_code == 504
@@ -0,0 +1,53 @@
+# tests/test_parse_stream.py
+from typing import List, Tuple
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+
+HEADERS = {"x-api-key": "dev"}
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app.app) as c:
+        yield c
+
+
+def _events(body: str) -> List[Tuple[str, dict]]:
+    out = []
+    for frame in body.split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines() if ": " in line)
+        if "event" in lines:
+            out.append((lines["event"], json.loads(lines["data"])))
+    return out
+
+
+def test_stream_sends_stages_then_complete(client):
+    text = b"Jane Doe\njane@example.com\nSkills: Python, SQL\n"
+    r = client.post("/parse/stream", headers=HEADERS, files={"file": ("r.txt", text)})
+    assert r.status_code == 200
+    events = _events(r.text)
+    names = [name for name, _ in events]
+    assert names[0] == "extracted" and names[-1] == "complete"
+    assert events[-1][1]["email"] == "jane@example.com"
+
+
+@pytest.mark.parametrize("filename", ["bad.pdf", "bad.docx"])
+def test_stream_reports_corrupt_upload_as_error_event(client, filename):
+    r = client.post("/parse/stream", headers=HEADERS, files={"file": (filename, b"%PDF-1.4 not really" * 10)})
+    assert r.status_code == 200
+    events = _events(r.text)
+    assert events, "stream ended without any event"
+    name, data = events[-1]
+    assert name == "error"
+    assert data["status"] == 500
+    assert data["detail"].startswith("Failed to parse:")
+
+
+def test_stream_rejects_unsupported_type(client):
+    r = client.post("/parse/stream", headers=HEADERS, files={"file": ("r.xyz", b"abc")})
+    assert _events(r.text) == [("error", {"status": 415, "detail": "Unsupported file type. Use PDF, DOCX, or TXT."})]
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pytest
+
+import parser_core
+from parser_core import ExtractLimits, extract_document
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+from synth import to_pdf  # noqa: E402
+
+pytest.importorskip("pdfminer")
+
+RESUME = ["Jane Doe", "jane@example.com", "Experience", "Acme - Engineer 2019 - 2022", "Education",
+          "BSc Computer Science 2015 - 2019"]
+FILLER = [f"Appendix line {i}" for i in range(20)]
+
+
+def _pdf(pages):
+    # One page per list of lines
+    return to_pdf([line for page in pages for line in page], lines_per_page=max(len(p) for p in pages))
+
+
+FIVE_PAGES = _pdf([RESUME + [""] * 14] + [FILLER] * 4)
+
+
+def test_unlimited_reads_every_page():
+    result = extract_document(FIVE_PAGES, "cv.pdf")
+    assert (result.pages, result.truncated, result.reason) == (5, False, None)
+    assert "Appendix line 19" in result.text
+
+
+@pytest.mark.parametrize("limits, pages, reason", [
+    (ExtractLimits(max_pages=2), 2, "max_pages"),
+    (ExtractLimits(max_chars=10), 1, "max_chars"),
+    (ExtractLimits(time_budget=1e-9), 1, "time_budget"),
+    (ExtractLimits(early_stop=True), 2, "early_stop"),   # one page past the complete resume
+    (ExtractLimits(max_pages=5), 5, None),               # the last page is not a truncation
+])
+def test_limits_stop_extraction(limits, pages, reason):
+    result = extract_document(FIVE_PAGES, "cv.pdf", limits)
+    assert (result.pages, result.reason, result.truncated) == (pages, reason, reason is not None)
+    assert "jane@example.com" in result.text
+
+
+def test_early_stop_waits_for_every_section():
+    pdf = _pdf([["Jane Doe", "jane@example.com"] + FILLER[:4], ["Experience"] + FILLER[:5],
+                ["Education"] + FILLER[:5], FILLER[:6], FILLER[:6]])
+    result = extract_document(pdf, "cv.pdf", ExtractLimits(early_stop=True))
+    assert (result.pages, result.reason) == (4, "early_stop")
+
+
+def test_pages_after_the_cut_are_not_laid_out(monkeypatch):
+    laid_out = []
+    real = parser_core.iter_pdf_pages
+
+    def counting(content):
+        for item in real(content):
+            laid_out.append(1)
+            yield item
+
+    monkeypatch.setattr(parser_core, "iter_pdf_pages", counting)
+    extract_document(FIVE_PAGES, "cv.pdf", ExtractLimits(max_pages=2))
+    assert len(laid_out) == 2
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+
+import pytest
+
+import parser_core
+from parser_core import EMAIL_RE, ParseLimits, URL_RE, parse_resume
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+from bench_adversarial import CASES  # noqa: E402
+
+SIZE = 40_000  # the old patterns needed 30-45 s here
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_adversarial_input_parses_quickly(name):
+    text = CASES[name](SIZE)
+    started = time.perf_counter()
+    parse_resume(text)
+    assert time.perf_counter() - started < 2.0
+
+
+@pytest.mark.parametrize("name", ["digits", "letters", "email_local", "month_years", "comma_letters"])
+def test_growth_is_linear(name):
+    def timed(n):
+        text = CASES[name](n)
+        best = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            parse_resume(text)
+            best = min(best, time.perf_counter() - started)
+        return best
+
+    small, big = timed(SIZE // 4), timed(SIZE)
+    assert big < max(small, 1e-3) * 10  # quadratic would be ~16x
+
+
+def test_bounded_patterns_still_match_real_text():
+    assert EMAIL_RE.search("mail jane.doe+cv@mail.example.com now").group(0) == "jane.doe+cv@mail.example.com"
+    assert EMAIL_RE.search("x" * 5000 + "@") is None
+    assert URL_RE.search("see https://github.com/jane)").group(1) == "https://github.com/jane"
+    parsed = parse_resume("Jane Doe\njane@example.com\nBerlin, Germany\nEducation\n"
+                          "BSc in Computer Science, TU Berlin 2015 - 2019 GPA: 3.8/4.0\n")
+    assert parsed["email"] == "jane@example.com"
+    assert parsed["education"][0]["gpa"] == "3.8/4.0"
+
+
+def test_parse_limits_truncate_and_say_why(monkeypatch):
+    text = "Jane Doe\njane@example.com\n" + "filler line\n" * 1000
+    cut = parse_resume(text, limits=ParseLimits(max_chars=100))
+    assert (cut["truncated"], cut["truncation_reason"], cut["email"]) == (True, "parse_max_chars", "jane@example.com")
+
+    ticks = iter(range(1000))
+    monkeypatch.setattr(parser_core.time, "perf_counter", lambda: next(ticks))
+    partial = parse_resume(text, limits=ParseLimits(time_budget=3))
+    assert (partial["truncated"], partial["truncation_reason"]) == (True, "parse_time_budget")
+    assert set(partial) == set(parser_core.blank_result())  # skipped stages keep their empty defaults
@@ -0,0 +1,41 @@
+import pytest
+
+import serialize
+from serialize import JSON, NDJSON, negotiate
+
+MSGPACK = "application/msgpack"
+needs_msgpack = pytest.mark.skipif(serialize.msgpack is None, reason="msgpack not installed")
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, JSON),
+    ("", JSON),
+    ("application/json", JSON),
+    ("*/*", JSON),
+    ("application/*;q=0.3", JSON),
+    ("text/html", None),
+    ("application/json;q=0", None),
+    ("application/json;q=0, */*;q=0.5", None),
+    ("application/json;q=0, application/*", None),
+    ("*/*;q=0", None),
+])
+def test_negotiate_json(accept, expected):
+    assert negotiate(accept) == expected
+
+
+def test_negotiate_refused_default_is_not_picked_by_wildcard():
+    assert negotiate("application/x-ndjson;q=0, */*", NDJSON) is None
+    assert negotiate("application/json;q=0, */*", NDJSON) == NDJSON
+
+
+@needs_msgpack
+@pytest.mark.parametrize("accept, expected", [
+    ("application/msgpack", MSGPACK),
+    ("application/msgpack, application/json", MSGPACK),
+    ("application/json, application/msgpack", JSON),
+    ("application/json;q=0.5, application/msgpack", MSGPACK),
+    ("application/json;q=0, */*;q=0.5, application/msgpack;q=0.1", MSGPACK),
+    ("application/msgpack;q=0, */*", JSON),
+])
+def test_negotiate_msgpack(accept, expected):
+    assert negotiate(accept) == expected
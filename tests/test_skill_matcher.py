@@ -0,0 +1,36 @@
+import pytest
+
+from parser_core import parse_resume
+from skill_matcher import TermMatcher
+
+MATCHER = TermMatcher({"skill": ["C++", "C#", "Go", "Node.js", "CI/CD"], "language": ["English"]})
+
+
+def _terms(text):
+    return [(h.start, h.end, h.term) for h in MATCHER.scan(text)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("C++ and C#", [(0, 3, "C++"), (8, 10, "C#")]),
+    ("used C++, C#.", [(5, 8, "C++"), (10, 12, "C#")]),
+    ("(C#/.NET)", [(1, 3, "C#")]),
+    ("c++ c#", [(0, 3, "C++"), (4, 6, "C#")]),
+    ("ABC++ and F#", []),          # glued to a word character on the left
+    ("C++17 or C#9", []),           # ... or on the right
+    ("Golang, Gopher", []),
+    ("Go-to CI/CD", [(0, 2, "Go"), (6, 11, "CI/CD")]),
+    ("Node.jsx", []),
+])
+def test_symbol_terms_need_word_boundaries(text, expected):
+    assert _terms(text) == expected
+
+
+def test_scan_window_keeps_absolute_offsets():
+    text = "xx C++ yy C#"
+    assert [(h.start, h.term) for h in MATCHER.scan(text, 3, 9)] == [(3, "C++")]
+    assert MATCHER.terms(text, "skill") == ["C#", "C++"]
+
+
+def test_parser_keeps_cpp_and_csharp_apart_from_neighbours():
+    assert parse_resume("Wrote C++ and C# services in Go")["skills"] == ["C#", "C++", "Go"]
+    assert parse_resume("Built ABC++ tools in F# and Objective-C")["skills"] == []
@@ -0,0 +1,66 @@
+import pickle
+
+import pytest
+
+import skill_taxonomy
+from skill_taxonomy import TaxonomyError, compile_taxonomy, load, save_artifact
+
+SOURCE = {"format": 1, "skills": {"Kubernetes": {"aliases": ["k8s"]}}}
+
+
+def test_artifact_round_trip(tmp_path):
+    path = str(tmp_path / "taxonomy.bin")
+    taxonomy = compile_taxonomy(SOURCE)
+    save_artifact(taxonomy, path)
+    loaded = load(path)
+    assert loaded.digest == taxonomy.digest
+    assert loaded.aliases["Kubernetes"] == ["k8s"]
+
+
+def test_artifact_from_other_code_is_rebuilt_from_source(tmp_path, monkeypatch):
+    path = str(tmp_path / "taxonomy.bin")
+    taxonomy = compile_taxonomy(SOURCE)
+    save_artifact(taxonomy, path)
+    monkeypatch.setattr(skill_taxonomy, "_code", "0" * 16)
+
+    def refuse(*args, **kwargs):
+        raise AssertionError("pickle from other code must not be loaded")
+
+    monkeypatch.setattr(pickle, "load", refuse)
+    loaded = load(path)
+    assert loaded.digest == taxonomy.digest
+    assert loaded.aliases["Kubernetes"] == ["k8s"]
+
+
+def test_old_artifact_format_is_rejected(tmp_path):
+    path = tmp_path / "taxonomy.bin"
+    path.write_bytes(b"RESUME-TAXONOMY-1\n" + pickle.dumps(compile_taxonomy(SOURCE)))
+    with pytest.raises(TaxonomyError):
+        load(str(path))
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Built APIs with Next.js", ["Next.js"]),
+    ("Deployed Node.js services", ["Node.js"]),
+    ("Used Vue.js", []),
+    ("the node is down", []),
+    ("TS and JS builds", []),
+])
+def test_ambiguous_aliases_stay_out_of_prose(text, expected):
+    from parser_core import parse_resume
+
+    assert parse_resume(text)["skills"] == expected
+
+
+def test_list_aliases_resolve_skill_list_items():
+    from parser_core import parse_resume
+
+    skills = parse_resume("Skills: JS, Node, TS, ML, Kube")["skills"]
+    assert skills == ["JavaScript", "Kubernetes", "Machine Learning", "Node.js", "TypeScript"]
+
+
+def test_list_aliases_claimed_twice_are_rejected():
+    source = {"format": 1, "skills": {"Node.js": {"list_aliases": ["node"]},
+                                      "JavaScript": {"aliases": ["node"]}}}
+    with pytest.raises(TaxonomyError):
+        compile_taxonomy(source)
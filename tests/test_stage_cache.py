@@ -0,0 +1,74 @@
+import re
+
+import parser_core
+import stage_cache
+
+TEXT = """Jane Doe
+jane@example.com
+Skills: Python, Docker
+Experience
+Acme - Engineer 2019 - 2022
+- Built pipelines in Python
+Projects
+Crawler - 2021
+- Scraped listings
+Education
+BSc in Computer Science, TU Berlin 2015 - 2019 GPA: 3.8
+"""
+
+
+def _fresh_fingerprints(monkeypatch):
+    monkeypatch.setattr(stage_cache, "_fingerprints", {})
+    return stage_cache.fingerprints()
+
+
+def _changed(before, after):
+    return sorted(k for k in before if before[k] != after[k])
+
+
+def test_helper_edit_reruns_the_stages_that_call_it(monkeypatch):
+    before = _fresh_fingerprints(monkeypatch)
+    real = parser_core._parse_bullets
+
+    def _parse_bullets(doc, ids, start_idx):  # an "edited" helper
+        return real(doc, ids, start_idx)
+
+    # The stage lists still hold the old function; the edit is found through the callers' globals
+    monkeypatch.setattr(parser_core, "_parse_bullets", _parse_bullets)
+    assert _changed(before, _fresh_fingerprints(monkeypatch)) == ["history", "projects"]
+
+
+def test_pattern_edit_reruns_only_its_stage(monkeypatch):
+    before = _fresh_fingerprints(monkeypatch)
+    monkeypatch.setattr(parser_core, "_GPA_RE", re.compile(r"GPA[:\s]+([0-9.]+)", re.IGNORECASE))
+    assert _changed(before, _fresh_fingerprints(monkeypatch)) == ["history"]
+
+
+def test_fingerprints_do_not_depend_on_object_addresses(monkeypatch):
+    first = _fresh_fingerprints(monkeypatch)
+    assert _fresh_fingerprints(monkeypatch) == first
+    assert stage_cache._code_digest((parser_core.build_document,)) == stage_cache._code_digest(
+        (parser_core.build_document,))
+
+
+def test_run_recomputes_only_stale_stages(monkeypatch):
+    fps = _fresh_fingerprints(monkeypatch)
+    loads = []
+
+    def load_text():
+        loads.append(1)
+        return TEXT
+
+    result, _, cached = stage_cache.run({}, load_text, fps)
+    assert result == parser_core.parse_resume(TEXT, limits=parser_core.ParseLimits(
+        max_chars=stage_cache.PARSE_LIMITS.max_chars))
+    assert sorted(cached) == sorted(stage_cache.STAGE_NAMES)
+
+    again, _, fresh = stage_cache.run(cached, load_text, fps)
+    assert (again, fresh, len(loads)) == (result, {}, 1)
+
+    monkeypatch.setattr(parser_core, "_GPA_RE", re.compile(r"GPA[:\s]+([0-9.]+)", re.IGNORECASE))
+    stale = _fresh_fingerprints(monkeypatch)
+    _, _, fresh = stage_cache.run(cached, load_text, stale)
+    assert list(fresh) == ["history"]
+    assert len(loads) == 1  # extraction was still current
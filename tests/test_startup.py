@@ -0,0 +1,74 @@
+import asyncio
+import multiprocessing
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+import parser_core
+from parse_pool import ParsePool, run_parse
+
+from conftest import ROOT
+
+HEAVY = ("pdfminer", "docx", "pyarrow", "uvicorn")
+
+
+def test_importing_app_leaves_heavy_packages_unloaded():
+    code = ("import sys, app; "
+            f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+def test_warm_up_loads_only_the_requested_extractors():
+    code = ("import sys, parser_core; spent = parser_core.warm_up(('docx',)); "
+            "print(sorted(spent), 'docx' in sys.modules, 'pdfminer' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "['docx', 'parse', 'taxonomy'] True False"
+
+
+def test_warm_up_rejects_unknown_formats():
+    with pytest.raises(ValueError):
+        parser_core.warm_up(("rtf",))
+
+
+def test_process_pool_preloads_parser_and_warm_up_extractors(monkeypatch):
+    preloaded = []
+
+    class Context:
+        def set_forkserver_preload(self, modules):
+            preloaded.extend(modules)
+
+    monkeypatch.setattr(multiprocessing, "get_all_start_methods", lambda: ["fork", "spawn", "forkserver"])
+    monkeypatch.setattr(multiprocessing, "get_context", lambda method: Context())
+    ParsePool("process", workers=1, warm_up=("pdf",))._mp_context()
+    assert preloaded[0] == "parse_pool"
+    assert "pdfminer.pdfpage" in preloaded and "docx" not in preloaded
+
+
+def test_process_pool_warm_up_then_parse():
+    pool = ParsePool("process", workers=1, warm_up=("pdf",), timeout=60)
+
+    async def run():
+        spent = await pool.warm_up()
+        _, parsed, _ = await pool.run(run_parse, None, None, "Ann Lee\nann@example.com\n")
+        return spent, parsed
+
+    try:
+        spent, parsed = asyncio.run(run())
+    finally:
+        if pool._executor is not None:
+            pool._executor.shutdown()
+    assert {"pdf", "taxonomy", "parse", "total"} <= set(spent)
+    assert parsed["email"] == "ann@example.com"
+
+
+def test_startup_hook_records_warm_up_timings(monkeypatch):
+    import app
+
+    monkeypatch.setattr(app, "PARSE_POOL", ParsePool("inline", warm_up=()))
+    monkeypatch.setattr(app, "STARTUP", {})
+    with TestClient(app.app):
+        pass
+    assert {"warm_up_taxonomy_seconds", "warm_up_parse_seconds", "warm_up_total_seconds"} <= set(app.STARTUP)
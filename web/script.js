@@ -105,7 +105,8 @@ document.addEventListener('DOMContentLoaded', () => {
       
       formData.append('include_raw_text', includeRaw);
       
-      const response = await fetch(`${baseUrl}/parse`, {
+      // Streaming variant: each parser stage's fields arrive as a Server-Sent Event
+      const response = await fetch(`${baseUrl}/parse/stream`, {
         method: 'POST',
         headers: {
           'X-API-Key': apiKey
@@ -118,8 +119,25 @@ document.addEventListener('DOMContentLoaded', () => {
         throw new Error(`API Error (${response.status}): ${errorText}`);
       }
       
-      const result = await response.json();
-      outputEl.textContent = JSON.stringify(result, null, 2);
+      const partial = {};
+      let complete = false;
+      await readEvents(response, (event, data) => {
+        if (event === 'error') {
+          throw new Error(`API Error (${data.status}): ${data.detail}`);
+        }
+        if (event === 'complete') {
+          complete = true;
+          outputEl.textContent = JSON.stringify(data, null, 2);
+          return;
+        }
+        Object.assign(partial, data);
+        outputEl.textContent = JSON.stringify(partial, null, 2);
+        showStatus(`Parsing... (${event} done)`, '');
+      });
+      
+      if (!complete) {
+        throw new Error('Connection closed before parsing finished.');
+      }
       showStatus('Resume parsed successfully!', 'success');
       
       copyBtn.disabled = false;
@@ -134,6 +152,30 @@ document.addEventListener('DOMContentLoaded', () => {
     }
   }
   
+  // Calls onEvent(event, data) for each "event: ...\ndata: ..." frame of an SSE response body
+  async function readEvents(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let end;
+      while ((end = buffer.indexOf('\n\n')) !== -1) {
+        const frame = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        let event = 'message';
+        let data = '';
+        frame.split('\n').forEach(line => {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        });
+        if (data) onEvent(event, JSON.parse(data));
+      }
+    }
+  }
+  
   // Copy and download functions
   copyBtn.addEventListener('click', () => {
     navigator.clipboard.writeText(outputEl.textContent)